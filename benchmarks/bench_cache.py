@@ -0,0 +1,54 @@
+"""bench_cache.py
+
+Compare opening libraries by parsing the OLE file against restoring them from a
+`SnapshotCache`. Each file is opened fully loaded, so the snapshot has every
+record in it.
+
+Usage: python benchmarks/bench_cache.py [file.SchLib|file.PcbLib ...]
+"""
+import sys
+import tempfile
+import timeit
+
+from pyaltium import PcbLib, SchLib
+from pyaltium._cache import SnapshotCache
+
+DEFAULT_FILES = [
+    "tests/files/sch/SchLib1.SchLib",
+    "tests/files/sch/SchGraphic.SchLib",
+    "tests/files/pcb/PcbLib1.PcbLib",
+]
+REPEAT = 20
+
+
+def lib_type(file_name: str):
+    return PcbLib if file_name.lower().endswith(".pcblib") else SchLib
+
+
+def main() -> None:
+    files = sys.argv[1:] or DEFAULT_FILES
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = SnapshotCache(cache_dir)
+
+        for file_name in files:
+            cls = lib_type(file_name)
+            cls(file_name, cache=cache)
+
+            cold = min(timeit.repeat(lambda: cls(file_name), number=REPEAT, repeat=3))
+            warm = min(
+                timeit.repeat(
+                    lambda: cls(file_name, cache=cache), number=REPEAT, repeat=3
+                )
+            )
+            print(
+                f"{file_name:<36} parse {cold / REPEAT * 1000:>7.2f} ms"
+                f"  snapshot {warm / REPEAT * 1000:>7.2f} ms"
+                f"  ({cold / warm:.1f}x)"
+            )
+
+        print(f"cache size: {cache.size()} bytes")
+
+
+if __name__ == "__main__":
+    main()
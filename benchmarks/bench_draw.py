@@ -0,0 +1,69 @@
+"""bench_draw.py
+
+Time drawing a big connector symbol with matplotlib, one artist per record
+(as records draw on their own) against ``draw_records``, which batches pins into
+one collection. Each run draws onto a fresh figure and renders it.
+
+Usage: python benchmarks/bench_draw.py [--pins N] [--repeat N]
+"""
+import argparse
+import io
+import timeit
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+
+from pyaltium.sch._record import SLIRPin, draw_records  # noqa: E402
+
+
+def connector(count: int) -> list:
+    return [
+        SLIRPin(
+            {
+                "RECORD": "2",
+                "Location.X": str((idx % 2) * 800),
+                "Location.Y": str((idx // 2) * 10),
+                "Rotation": str((idx % 2) * 180),
+                "PinLength": 300,
+                "Name": f"IO{idx}",
+                "Designator": str(idx + 1),
+            }
+        )
+        for idx in range(count)
+    ]
+
+
+def one_by_one(ax: plt.Axes, records: list) -> None:
+    for record in records:
+        record.draw(ax)
+
+
+def render(draw, records: list) -> None:
+    fig, ax = plt.subplots()
+    draw(ax, records)
+    ax.autoscale(tight=True)
+    fig.savefig(io.BytesIO(), format="png", dpi=100)
+    plt.close(fig)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pins", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    records = connector(args.pins)
+    print(f"{args.pins} pins")
+
+    for label, fn in (("one by one", one_by_one), ("batched", draw_records)):
+        elapsed = min(
+            timeit.repeat(lambda: render(fn, records), number=1, repeat=args.repeat)
+        )
+        print(f"  {label:<10} {elapsed * 1000:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""bench_duplicates.py
+
+Group a synthetic vault of 20k small components by canonical fingerprint, where
+one in ten is a reordered copy of another with new unique IDs. Compares that to
+checking pairs the slow way, which is extrapolated from the first 500 items since
+doing all of them would take far too long.
+
+Usage: python benchmarks/bench_duplicates.py
+"""
+import random
+import time
+
+from bench_tokenizer import frame
+
+from pyaltium.base import stream_fingerprint
+from pyaltium.sch._item import canonical_fingerprint
+from pyaltium.sch._tokenizer import split_records
+
+COMPONENTS = 20_000
+RECORDS = 40
+
+
+def component(idx: int, rng: random.Random, order=None) -> bytes:
+    records = [
+        frame(
+            b"|RECORD=14|OwnerPartId=1|Location.X=%d|Location.Y=%d"
+            b"|Corner.X=50|Corner.Y=20|UniqueID=%08X\x00"
+            % (idx, n, rng.getrandbits(32))
+        )
+        for n in range(RECORDS)
+    ]
+    if order is not None:
+        records = [records[n] for n in order]
+
+    header = frame(b"|RECORD=1|LibReference=Part%d|UniqueID=%08X\x00" % (idx, idx))
+    return header + b"".join(records)
+
+
+def synthetic_vault(seed: int = 0) -> list:
+    rng = random.Random(seed)
+    streams = []
+
+    for idx in range(COMPONENTS):
+        if idx % 10 == 9:
+            # A copy of some earlier component
+            src = rng.randrange(idx)
+            order = rng.sample(range(RECORDS), RECORDS)
+            streams.append(component(src - src % 10 + src % 9, rng, order))
+        else:
+            streams.append(component(idx, rng))
+
+    return streams
+
+
+def group(streams: list, fingerprint) -> int:
+    groups = {}
+    for idx, data in enumerate(streams):
+        groups.setdefault(fingerprint(data), []).append(idx)
+    return sum(1 for g in groups.values() if len(g) > 1)
+
+
+def same(a: bytes, b: bytes) -> bool:
+    """Compare two streams' records directly, the way you would without hashing."""
+
+    def records(data):
+        return sorted(
+            sorted((k, bytes(v)) for k, v in rec.items() if k != b"UniqueID")
+            for rec in split_records(data)
+        )
+
+    return records(a) == records(b)
+
+
+def main() -> None:
+    streams = synthetic_vault()
+
+    for label, fingerprint in (
+        ("raw Data", stream_fingerprint),
+        ("canonical", canonical_fingerprint),
+    ):
+        start = time.perf_counter()
+        found = group(streams, fingerprint)
+        elapsed = time.perf_counter() - start
+        print(f"{label:<10} {found:>6} groups {elapsed * 1000:>9.1f} ms")
+
+    sample = streams[:500]
+    start = time.perf_counter()
+    for i, a in enumerate(sample):
+        for b in sample[i + 1 :]:
+            same(a, b)
+    elapsed = time.perf_counter() - start
+    scale = (COMPONENTS / len(sample)) ** 2
+    print(f"{'pairwise':<10} {'':>13} {elapsed * scale:>9.0f} s (extrapolated)")
+
+
+if __name__ == "__main__":
+    main()
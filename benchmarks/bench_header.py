@@ -0,0 +1,59 @@
+"""bench_header.py
+
+Time listing a schematic library's components from its file header, the old way
+(one linear scan of the split header per key) against the indexed `FileHeader`.
+The old way is quadratic so it only gets run on the smaller headers.
+
+Usage: python benchmarks/bench_header.py
+"""
+import timeit
+
+from pyaltium._header import FileHeader
+
+SIZES = (100, 1_000, 5_000, 20_000)
+LEGACY_MAX = 5_000
+
+
+def synthetic_header(count: int) -> str:
+    parts = [
+        "|HEADER=Protel for Windows - Schematic Library Editor Binary File Version 5.0",
+        "|Weight=%d|FontIdCount=1|Size1=10|FontName1=Times New Roman" % count,
+        "|UseMBCS=T|IsBOC=T|CompCount=%d" % count,
+    ]
+    for i in range(count):
+        parts.append(f"|LibRef{i}=Part {i}|CompDescr{i}=Description {i}|PartCount{i}=2")
+    return "".join(parts)
+
+
+def legacy_components(fh_str: str) -> list:
+    """How `SchLib._update_item_list` used to look things up."""
+    d = [x for x in fh_str.split("|") if x]
+
+    def value(key):
+        for item in d:
+            k, _, v = item.partition("=")
+            if k == key:
+                return v
+        return ""
+
+    return [
+        (value(f"LibRef{i}"), value(f"CompDescr{i}"), int(value(f"PartCount{i}")))
+        for i in range(int(value("CompCount")))
+    ]
+
+
+def main() -> None:
+    for count in SIZES:
+        fh_str = synthetic_header(count)
+        new = min(timeit.repeat(lambda: FileHeader(fh_str).components(), number=3))
+        line = f"{count:>7} components   indexed {new / 3 * 1000:>9.2f} ms"
+
+        if count <= LEGACY_MAX:
+            legacy = min(timeit.repeat(lambda: legacy_components(fh_str), number=1))
+            line += f"   legacy {legacy * 1000:>10.2f} ms   ({legacy / new * 3:.0f}x)"
+
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""bench_lazy_records.py
+
+Time loading a synthetic 100k record stream into records eagerly and with
+``lazy=True``, next to the cost of just tokenizing it. "lazy + pins" also reads
+the name and designator of every pin, the way a pin lister would.
+
+Usage: python benchmarks/bench_lazy_records.py
+"""
+import timeit
+
+from bench_tokenizer import SYNTHETIC_RECORDS, synthetic_stream
+
+from pyaltium.sch._item import decode_records
+from pyaltium.sch._record import SLIRPin
+from pyaltium.sch._tokenizer import split_records
+
+
+def lazy_with_pins(data: bytes) -> list:
+    records = decode_records(data, lazy=True)
+    return [(r.name, r.designator) for r in records if type(r) is SLIRPin]
+
+
+def main() -> None:
+    data = synthetic_stream(SYNTHETIC_RECORDS)
+
+    for label, fn in (
+        ("tokenize only", split_records),
+        ("eager", decode_records),
+        ("lazy", lambda d: decode_records(d, lazy=True)),
+        ("lazy + pins", lazy_with_pins),
+    ):
+        elapsed = min(timeit.repeat(lambda: fn(data), number=1, repeat=3))
+        print(f"{label:<14} {elapsed * 1000:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""bench_models.py
+
+Extract every embedded model of a PcbLib, reading and decompressing each whole
+stream at once against streaming it to disk in chunks, and again from a warm
+ModelCache. Peak Python memory is from tracemalloc.
+
+Usage: python benchmarks/bench_models.py [file.PcbLib ...] [--chunk-size N]
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+import zlib
+
+from pyaltium import PcbLib
+from pyaltium._cache import ModelCache
+
+DEFAULT_FILES = ["tests/files/pcb/PcbLib1.PcbLib"]
+
+
+def whole(lib: PcbLib, out_dir: str, chunk_size: int, cache) -> None:
+    for model in lib.models():
+        data = zlib.decompress(lib._read_decode_stream(model.stream, decode=False))
+        with open(os.path.join(out_dir, f"{model.index}.step"), "wb") as f:
+            f.write(data)
+
+
+def streamed(lib: PcbLib, out_dir: str, chunk_size: int, cache) -> None:
+    for model in lib.models():
+        dest = os.path.join(out_dir, f"{model.index}.step")
+        lib.extract_model(model, dest, chunk_size=chunk_size, cache=cache)
+
+
+def measure(fn, *args) -> tuple:
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("files", nargs="*", default=DEFAULT_FILES)
+    parser.add_argument("--chunk-size", type=int, default=256 << 10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ModelCache(os.path.join(tmp, "cache"))
+
+        for file_name in args.files:
+            with PcbLib.open(file_name) as lib:
+                models = lib.models()
+                size = sum(m.compressed_size for m in models)
+                print(f"{file_name} ({len(models)} models, {size >> 10} KiB)")
+
+                runs = (
+                    ("whole stream", whole, None),
+                    ("streamed", streamed, None),
+                    ("cache, cold", streamed, cache),
+                    ("cache, warm", streamed, cache),
+                )
+                for label, fn, run_cache in runs:
+                    elapsed, peak = measure(fn, lib, tmp, args.chunk_size, run_cache)
+                    print(
+                        f"  {label:<13} {elapsed * 1000:>8.1f} ms"
+                        f"  peak {peak >> 10:>7} KiB"
+                    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""bench_parallel.py
+
+Load every item of a set of libraries serially, with `workers` threads and on a
+process pool through `load_all`. The process pool only pays off once libraries
+have enough items to cover sending records back between processes, the test
+fixtures are on the small side so pass bigger libraries if you have them.
+
+Usage: python benchmarks/bench_parallel.py [file.SchLib ...]
+"""
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from pyaltium import SchLib
+
+WORKERS = os.cpu_count() or 1
+REPEAT = 10
+
+
+def run(label: str, files: list, load) -> None:
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        for file_name in files:
+            load(file_name)
+    elapsed = (time.perf_counter() - start) / REPEAT
+    print(f"{label:<22} {elapsed * 1000:>9.2f} ms per pass")
+
+
+def main() -> None:
+    files = sys.argv[1:] or glob.glob("tests/files/sch/*.SchLib")
+    print(f"{len(files)} libraries, {WORKERS} workers")
+
+    run("serial", files, lambda f: SchLib(f))
+    run("threads", files, lambda f: SchLib(f, workers=WORKERS))
+
+    with ProcessPoolExecutor(WORKERS) as executor:
+
+        def load_processes(file_name):
+            with SchLib.open(file_name, lazyload=True) as sl:
+                sl.load_all(executor)
+
+        run("processes", files, load_processes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""bench_pcb_listing.py
+
+Time listing a PcbLib's footprints by name, which only walks the storage
+directory, against listing them with descriptions and heights too, which reads
+the start of every footprint's Parameters stream.
+
+Usage: python benchmarks/bench_pcb_listing.py [file.PcbLib ...]
+"""
+import sys
+import timeit
+
+from pyaltium import PcbLib
+
+DEFAULT_FILES = ["tests/files/pcb/PcbLib1.PcbLib"]
+REPEAT = 50
+
+
+def names(file_name: str) -> list:
+    with PcbLib.open(file_name) as lib:
+        return [item.footprintref for item in lib.items_list]
+
+
+def listing(file_name: str) -> list:
+    with PcbLib.open(file_name) as lib:
+        return lib.list_items()
+
+
+def main() -> None:
+    for file_name in sys.argv[1:] or DEFAULT_FILES:
+        print(f"{file_name} ({len(names(file_name))} footprints)")
+        for label, fn in (("names", names), ("list_items", listing)):
+            elapsed = min(timeit.repeat(lambda: fn(file_name), number=REPEAT, repeat=3))
+            print(f"  {label:<11} {elapsed / REPEAT * 1000:>7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""bench_pintable.py
+
+Time a "every pin on a 100 mil grid" audit over the synthetic stream from
+`bench_tokenizer`, once by looping over `SLIRPin` records and once with the pin
+table. Both include decoding the stream.
+
+Usage: python benchmarks/bench_pintable.py
+"""
+import timeit
+
+from bench_tokenizer import SYNTHETIC_RECORDS, synthetic_stream
+
+from pyaltium.sch._item import decode_records
+from pyaltium.sch._pintable import pin_table
+from pyaltium.sch._record import SLIRPin
+
+
+def audit_records(data: bytes) -> int:
+    pins = [r for r in decode_records(data) if isinstance(r, SLIRPin)]
+    return sum(
+        1
+        for p in pins
+        if p.param_dict["Location.X"] % 10 or p.param_dict["Location.Y"] % 10
+    )
+
+
+def audit_table(data: bytes) -> int:
+    pins = pin_table([data])
+    return int(((pins["x"] % 10 != 0) | (pins["y"] % 10 != 0)).sum())
+
+
+def main() -> None:
+    data = synthetic_stream(SYNTHETIC_RECORDS)
+    assert audit_records(data) == audit_table(data)
+
+    print(f"{len(pin_table([data]))} pins")
+    for label, fn in (("records", audit_records), ("pin table", audit_table)):
+        elapsed = min(timeit.repeat(lambda: fn(data), number=1, repeat=3))
+        print(f"{label:<10} {elapsed * 1000:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""bench_primitives.py
+
+Time decoding every footprint's primitives into objects against building the
+per-type NumPy tables from the same streams. Streams are read once up front, so
+this only measures decoding.
+
+Usage: python benchmarks/bench_primitives.py [file.PcbLib ...] [--copies N]
+"""
+import argparse
+import timeit
+
+from pyaltium import PcbLib
+from pyaltium.pcb._record import decode_primitives
+from pyaltium.pcb._tables import primitive_tables
+
+DEFAULT_FILES = ["tests/files/pcb/PcbLib1.PcbLib"]
+
+
+def read_streams(file_names: list, copies: int) -> list:
+    streams = []
+    for file_name in file_names:
+        with PcbLib.open(file_name) as lib:
+            streams += [bytes(item._read_data()) for item in lib.items_list]
+    return streams * copies
+
+
+def objects(streams: list) -> int:
+    return sum(len(decode_primitives(data)) for data in streams)
+
+
+def tables(streams: list) -> int:
+    return sum(len(table) for table in primitive_tables(streams).values())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("files", nargs="*", default=DEFAULT_FILES)
+    parser.add_argument("--copies", type=int, default=200)
+    args = parser.parse_args()
+
+    streams = read_streams(args.files, args.copies)
+    print(f"{len(streams)} footprints, {objects(streams)} primitives")
+
+    for label, fn in (("objects", objects), ("tables", tables)):
+        elapsed = min(timeit.repeat(lambda: fn(streams), number=1, repeat=5))
+        print(f"  {label:<8} {elapsed * 1000:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
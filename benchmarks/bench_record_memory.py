@@ -0,0 +1,62 @@
+"""bench_record_memory.py
+
+Bytes per record for the slotted `SchLibItemRecord` classes against the old layout
+(a normalized `param_dict` plus an instance `__dict__` of derived attributes),
+measured with tracemalloc over the records of the synthetic stream from
+`bench_tokenizer`. Only what the records keep alive counts, the tokenizer output
+is thrown away like it is in `decode_records`.
+
+Usage: python benchmarks/bench_record_memory.py
+"""
+import gc
+import tracemalloc
+
+from bench_tokenizer import synthetic_stream
+
+from pyaltium._helpers import eval_color, normalize_dict
+from pyaltium.sch._record import get_sch_lib_item_record, handle_pin_records
+from pyaltium.sch._tokenizer import split_records
+
+RECORDS = 100_000
+
+
+class LegacyRecord:
+    """How every record used to store its data."""
+
+    def __init__(self, parameters: dict) -> None:
+        self.param_dict = normalize_dict(parameters)
+        self.loc_x = self.param_dict.get("Location.X", 0) * 10
+        self.loc_y = self.param_dict.get("Location.Y", 0) * 10
+        self.rotation = self.param_dict.get("Rotation", 0)
+        self.linewidth = self.param_dict.get("LineWidth", 0.4) * 10
+        self.color = eval_color(self.param_dict.get("Color", 0x000000))
+        self.display_mode = int(self.param_dict.get("OwnerPartDisplayMode", 1))
+        self.part_id = self.param_dict.get("OwnerPartID", 1)
+        # Roughly what the subclasses add on top
+        self.name = self.param_dict.get("Name")
+        self.text = self.param_dict.get("Text")
+
+
+def measure(build, data: bytes) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    records = [build(p) for p in handle_pin_records(split_records(data))]
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / len(records)
+
+
+def main() -> None:
+    data = synthetic_stream(RECORDS)
+
+    legacy = measure(LegacyRecord, data)
+    slotted = measure(get_sch_lib_item_record, data)
+    print(f"{RECORDS} records")
+    print(f"legacy  {legacy:>8.0f} bytes/record")
+    print(f"slotted {slotted:>8.0f} bytes/record   ({legacy / slotted:.1f}x smaller)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""bench_render.py
+
+Time rendering every symbol in some libraries to PNG: a new pyplot figure per
+symbol, one reused figure in this process, a process pool, and a second run where
+everything is already rendered. Pools only pay off once there are more than a
+handful of symbols, so pass a big library or several.
+
+Usage: python benchmarks/bench_render.py [file.SchLib ...] [--jobs N]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+
+from pyaltium import SchLib  # noqa: E402
+from pyaltium.sch._item import decode_records  # noqa: E402
+from pyaltium.sch._record import draw_records  # noqa: E402
+from pyaltium.sch._render import DEFAULT_DPI, render_all  # noqa: E402
+
+DEFAULT_FILES = ["tests/files/sch/SchLib1.SchLib"]
+
+
+def read_items(file_names: list) -> list:
+    items = []
+    for file_name in file_names:
+        with SchLib.open(file_name, lazyload=True) as lib:
+            items += [(i.libref, bytes(i._read_data())) for i in lib.items_list]
+    return items
+
+
+def new_figures(items: list, out_dir: str) -> None:
+    for idx, (_, data) in enumerate(items):
+        fig, ax = plt.subplots()
+        ax.set_aspect("equal")
+        draw_records(ax, decode_records(data))
+        ax.axis("off")
+        ax.autoscale(tight=True)
+        with open(os.path.join(out_dir, f"{idx}.png"), "wb") as f:
+            fig.savefig(
+                f,
+                format="png",
+                dpi=DEFAULT_DPI,
+                transparent=True,
+                bbox_inches="tight",
+                pad_inches=0,
+            )
+        plt.close(fig)
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("files", nargs="*", default=DEFAULT_FILES)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    items = read_items(args.files)
+    print(f"{len(items)} symbols")
+
+    # Fonts get loaded on first use, keep that out of the timings
+    new_figures(items[:1], tempfile.mkdtemp())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        runs = (
+            ("new figure each", lambda: new_figures(items, tmp)),
+            ("reused figure", lambda: render_all(items, f"{tmp}/one", jobs=1)),
+            (
+                f"{args.jobs} jobs",
+                lambda: render_all(items, f"{tmp}/pool", jobs=args.jobs),
+            ),
+            (
+                "nothing changed",
+                lambda: render_all(items, f"{tmp}/pool", jobs=args.jobs),
+            ),
+        )
+        for label, fn in runs:
+            print(f"  {label:<16} {timed(fn) * 1000:>8.1f} ms")
+
+        manifest = render_all(items, f"{tmp}/pool", jobs=args.jobs)
+        assert all(r.skipped for r in manifest)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""bench_search.py
+
+Build a `SearchIndex` over a synthetic corpus of about 100k components, spread
+across 100 libraries, then time some queries against a plain scan over the same
+components. Also times swapping one library out and back in.
+
+Usage: python benchmarks/bench_search.py
+"""
+import random
+import time
+import timeit
+
+from pyaltium._search import Component, Contains, Prefix, Range, SearchIndex
+
+LIBRARIES = 100
+PER_LIBRARY = 1000
+
+_FAMILIES = ["LM", "TPS", "STM32F", "ATMEGA", "MAX", "AD", "NE", "BQ", "USB", "CH"]
+_PACKAGES = ["QFN", "SOIC", "SOT23", "TSSOP", "BGA", "DFN", "LQFP", "SOD"]
+_PIN_NAMES = ["VCC", "GND", "VBUS", "D+", "D-", "SDA", "SCL", "EN", "NC", "OUT"]
+
+
+def synthetic_corpus(seed: int = 0):
+    """``{path: [Component]}`` for a made up set of libraries."""
+    rng = random.Random(seed)
+    corpus = {}
+
+    for lib_idx in range(LIBRARIES):
+        sch = lib_idx % 2 == 0
+        path = f"lib{lib_idx}.{'SchLib' if sch else 'PcbLib'}"
+        comps = []
+
+        for idx in range(PER_LIBRARY):
+            family = rng.choice(_FAMILIES)
+            package = rng.choice(_PACKAGES)
+            pins = rng.randint(2, 24)
+
+            if sch:
+                pin_names = tuple(
+                    rng.choice(_PIN_NAMES + [f"IO{n}" for n in range(pins)])
+                    for _ in range(pins)
+                )
+                comps.append(
+                    Component(
+                        path,
+                        "SchLib",
+                        idx,
+                        f"{family}{rng.randint(100, 99999)}",
+                        f"{family} part in {package}-{pins}",
+                        partcount=rng.choice([1, 1, 1, 2, 4]),
+                        pin_names=pin_names,
+                        pin_designators=tuple(str(n + 1) for n in range(pins)),
+                        parameters=(f"{package}-{pins}",),
+                    )
+                )
+            else:
+                comps.append(
+                    Component(
+                        path,
+                        "PcbLib",
+                        idx,
+                        f"{package}{pins}P{rng.randint(40, 127)}X{rng.randint(100, 999)}",
+                        f"{package}, {pins} leads",
+                        height=rng.randint(5, 300) / 100,
+                    )
+                )
+
+        corpus[path] = comps
+
+    return corpus
+
+
+def scan(corpus, pred):
+    return [c for comps in corpus.values() for c in comps if pred(c)]
+
+
+def main() -> None:
+    corpus = synthetic_corpus()
+
+    start = time.perf_counter()
+    index = SearchIndex()
+    for path, comps in corpus.items():
+        index.add_components(path, comps)
+    print(f"indexed {len(index)} components in {time.perf_counter() - start:.2f} s")
+
+    queries = [
+        (
+            "pin_name = VBUS",
+            dict(pin_name="VBUS"),
+            lambda c: "VBUS" in c.pin_names,
+        ),
+        (
+            "footprint ~ 'QFN24'",
+            dict(footprintref=Contains("QFN24")),
+            lambda c: c.kind == "PcbLib" and "qfn24" in c.name.lower(),
+        ),
+        (
+            "libref ^ 'TPS12'",
+            dict(libref=Prefix("TPS12")),
+            lambda c: c.kind == "SchLib" and c.name.lower().startswith("tps12"),
+        ),
+        (
+            "partcount >= 2",
+            dict(partcount=Range(min=2)),
+            lambda c: c.partcount is not None and c.partcount >= 2,
+        ),
+        (
+            "height <= 0.5, 'SOT'",
+            dict(height=Range(max=0.5), footprintref=Prefix("sot")),
+            lambda c: c.height is not None
+            and c.height <= 0.5
+            and c.name.lower().startswith("sot"),
+        ),
+    ]
+
+    print(f"{'query':<22} {'hits':>6} {'index ms':>9} {'scan ms':>9}")
+    for label, criteria, pred in queries:
+        hits = index.search(**criteria)
+        assert len(hits) == len(scan(corpus, pred)), label
+
+        indexed = min(
+            timeit.repeat(lambda: index.search(**criteria), number=1, repeat=5)
+        )
+        scanned = min(timeit.repeat(lambda: scan(corpus, pred), number=1, repeat=3))
+        print(
+            f"{label:<22} {len(hits):>6} {indexed * 1000:>9.2f} {scanned * 1000:>9.1f}"
+        )
+
+    path = "lib42.SchLib"
+    start = time.perf_counter()
+    index.remove_library(path)
+    index.add_components(path, corpus[path])
+    print(f"re-indexed {path} in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""bench_session.py
+
+Compare loading a library with one shared OLE handle against opening the file for
+every stream read (how things worked before `OleSession`).
+
+Usage: python benchmarks/bench_session.py [file.SchLib ...]
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from contextlib import contextmanager
+from unittest import mock
+
+import olefile
+
+from pyaltium import SchLib
+from pyaltium.base import OleSession
+
+DEFAULT_FILES = [
+    "tests/files/sch/SchLib1.SchLib",
+    "tests/files/sch/SchGraphic.SchLib",
+]
+REPEAT = 20
+
+
+class CountingOleFileIO(olefile.OleFileIO):
+    opens = 0
+
+    def __init__(self, *args, **kwargs):
+        type(self).opens += 1
+        super().__init__(*args, **kwargs)
+
+
+def load_all(file_name: str) -> None:
+    with SchLib.open(file_name) as sl:
+        for item in sl.items_list:
+            item.records
+
+
+@contextmanager
+def per_stream_reads():
+    """Never keep a handle around, so every read opens the file again."""
+
+    def enter(self):
+        self._depth += 1
+        return self
+
+    with mock.patch.object(OleSession, "__enter__", enter):
+        yield
+
+
+def run(file_name: str, per_stream: bool) -> tuple[int, float]:
+    CountingOleFileIO.opens = 0
+    start = time.perf_counter()
+
+    with mock.patch.object(olefile, "OleFileIO", CountingOleFileIO):
+        for _ in range(REPEAT):
+            if per_stream:
+                with per_stream_reads():
+                    load_all(file_name)
+            else:
+                load_all(file_name)
+
+    elapsed = (time.perf_counter() - start) / REPEAT
+    return CountingOleFileIO.opens // REPEAT, elapsed
+
+
+def main() -> None:
+    files = sys.argv[1:] or DEFAULT_FILES
+    print(f"{'file':<40} {'mode':<12} {'opens':>6} {'ms/load':>10}")
+
+    for file_name in files:
+        for per_stream in (True, False):
+            opens, elapsed = run(file_name, per_stream)
+            mode = "per-stream" if per_stream else "shared"
+            print(f"{file_name:<40} {mode:<12} {opens:>6} {elapsed * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
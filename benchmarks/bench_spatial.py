@@ -0,0 +1,103 @@
+"""bench_spatial.py
+
+Time the spatial index against brute force on large BGA footprints: pads closer
+than a clearance, and the pads near a set of points. The footprints are
+generated, a square grid of round pads with a few shifted to cause violations.
+
+Usage: python benchmarks/bench_spatial.py [--pitch-balls N] [--footprints N]
+"""
+import argparse
+import timeit
+
+import numpy as np
+
+from pyaltium.pcb._record import UNITS_PER_MM, PcbLayer, PcbPadShape
+from pyaltium.pcb._spatial import SpatialIndex, pad_boxes
+from pyaltium.pcb._tables import PAD_DTYPE
+
+PITCH = 0.8 * UNITS_PER_MM
+PAD = 0.4 * UNITS_PER_MM
+CLEARANCE = 0.2 * UNITS_PER_MM
+
+
+def bga(balls: int, footprints: int) -> np.ndarray:
+    """``footprints`` BGAs of ``balls`` x ``balls`` pads, as one pads table."""
+    rng = np.random.default_rng(0)
+    grid = np.stack(np.meshgrid(np.arange(balls), np.arange(balls)), -1).reshape(-1, 2)
+    count = len(grid)
+
+    pads = np.zeros(count * footprints, dtype=PAD_DTYPE)
+    pads["item"] = np.repeat(np.arange(footprints), count)
+    pads["layer"] = PcbLayer.TOP
+    pads["shape"] = PcbPadShape.ROUND
+    pads["size_x"] = pads["size_y"] = PAD
+    xy = np.tile(grid * PITCH, (footprints, 1))
+    # Nudge 1% of pads towards a neighbour
+    xy[rng.random(len(xy)) < 0.01] += 0.3 * UNITS_PER_MM
+    pads["x"], pads["y"] = xy[:, 0], xy[:, 1]
+    return pads
+
+
+def brute_pairs(boxes: np.ndarray, groups: np.ndarray) -> int:
+    found = 0
+    for i in range(len(boxes) - 1):
+        rest = boxes[i + 1 :]
+        gap_x = np.maximum(rest[:, 0], boxes[i, 0]) - np.minimum(
+            rest[:, 2], boxes[i, 2]
+        )
+        gap_y = np.maximum(rest[:, 1], boxes[i, 1]) - np.minimum(
+            rest[:, 3], boxes[i, 3]
+        )
+        dist = np.hypot(np.maximum(gap_x, 0), np.maximum(gap_y, 0))
+        close = ((gap_x < 0) & (gap_y < 0)) | (dist < CLEARANCE)
+        found += np.count_nonzero(close & (groups[i + 1 :] == groups[i]))
+    return found
+
+
+def brute_within(boxes: np.ndarray, points: np.ndarray) -> int:
+    found = 0
+    for x, y in points:
+        dx = np.maximum(np.maximum(boxes[:, 0] - x, x - boxes[:, 2]), 0)
+        dy = np.maximum(np.maximum(boxes[:, 1] - y, y - boxes[:, 3]), 0)
+        found += np.count_nonzero(np.hypot(dx, dy) <= PITCH)
+    return found
+
+
+def index_within(index: SpatialIndex, points: np.ndarray) -> int:
+    return sum(len(index.within(x, y, PITCH)) for x, y in points)
+
+
+def run(label: str, pads: np.ndarray) -> None:
+    boxes = pad_boxes(pads)
+    points = np.random.default_rng(1).uniform(0, boxes[:, 2].max(), (1000, 2))
+
+    build = min(timeit.repeat(lambda: SpatialIndex.from_pads(pads), number=1, repeat=3))
+    index = SpatialIndex.from_pads(pads)
+    assert len(index.pairs(CLEARANCE)) == brute_pairs(boxes, pads["item"])
+    assert index_within(index, points) == brute_within(boxes, points)
+
+    timings = (
+        ("pairs, index", lambda: index.pairs(CLEARANCE)),
+        ("pairs, brute", lambda: brute_pairs(boxes, pads["item"])),
+        ("1000 within, index", lambda: index_within(index, points)),
+        ("1000 within, brute", lambda: brute_within(boxes, points)),
+    )
+
+    print(f"{label} ({len(pads)} pads), index built in {build * 1000:.1f} ms")
+    for name, fn in timings:
+        elapsed = min(timeit.repeat(fn, number=1, repeat=3))
+        print(f"  {name:<19} {elapsed * 1000:>9.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--balls", type=int, default=50)
+    parser.add_argument("--footprints", type=int, default=4)
+    args = parser.parse_args()
+
+    run(f"One {args.balls}x{args.balls} BGA", bga(args.balls, 1))
+    run(f"Library of {args.footprints} BGAs", bga(args.balls, args.footprints))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""bench_svg.py
+
+Time drawing every symbol in a library to SVG with the native renderer against
+going through matplotlib. Records are loaded up front, so this only measures
+drawing.
+
+Usage: python benchmarks/bench_svg.py [file.SchLib ...] [--repeat N]
+"""
+import argparse
+import contextlib
+import io
+import timeit
+
+from pyaltium import SchLib
+from pyaltium.base import AltiumLibItemMixin
+
+DEFAULT_FILES = ["tests/files/sch/SchLib1.SchLib"]
+
+
+def load_items(file_names: list) -> list:
+    items = []
+    for file_name in file_names:
+        items += SchLib(file_name).items_list
+    return items
+
+
+def native(items: list) -> int:
+    return sum(len(item.get_svg()) for item in items)
+
+
+def matplotlib(items: list) -> int:
+    # Pins still print while they get drawn
+    with contextlib.redirect_stdout(io.StringIO()):
+        return sum(len(AltiumLibItemMixin.get_svg(item)) for item in items)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("files", nargs="*", default=DEFAULT_FILES)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    items = load_items(args.files)
+    print(f"{len(items)} symbols")
+
+    times = {}
+    for label, fn in (("native", native), ("matplotlib", matplotlib)):
+        times[label] = min(
+            timeit.repeat(lambda: fn(items), number=1, repeat=args.repeat)
+        )
+        print(f"  {label:<10} {times[label] * 1000:>8.1f} ms")
+
+    print(f"  speedup    {times['matplotlib'] / times['native']:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""bench_tokenizer.py
+
+Time the single pass tokenizer against the old split/replace parsing, over the
+schematic fixtures and a synthetic 100k record stream. "split" is just turning the
+stream into parameter dicts, "+pins" also runs `handle_pin_records` since the old
+split left pins stuck to other records' values.
+
+Usage: python benchmarks/bench_tokenizer.py
+"""
+import glob
+import timeit
+
+import olefile
+
+from pyaltium.sch._record import handle_pin_records
+from pyaltium.sch._tokenizer import split_records
+
+SYNTHETIC_RECORDS = 100_000
+
+
+def legacy_split(data: bytes) -> list:
+    """How `SchLibItem._load_data` used to split records up."""
+    while not data.startswith(b"|RECORD"):
+        data = data[1:]
+
+    records = [b"|RECORD" + d for d in data.split(b"|RECORD")[1:]]
+
+    return [
+        dict(
+            split
+            for s in rec.replace(b"|&|", b"&&&&").split(b"|")[1:]
+            if len(split := s.replace(b"&&&&", b"|&|").split(b"=", 1)) == 2
+        )
+        for rec in records
+    ]
+
+
+def fixture_streams() -> list:
+    streams = []
+    for file_name in glob.glob("tests/files/sch/*.SchLib"):
+        with olefile.OleFileIO(file_name) as ole:
+            for stream in ole.listdir():
+                if stream[-1] == "Data":
+                    streams.append(ole.openstream(stream).read())
+    return streams
+
+
+def frame(payload: bytes, rtype: int = 0) -> bytes:
+    return len(payload).to_bytes(3, "little") + bytes([rtype]) + payload
+
+
+def synthetic_stream(count: int) -> bytes:
+    """A mix of rectangles, labels and pins that looks like a real Data stream."""
+    pin = (
+        bytes.fromhex("020000000001000000000000000001073a0a000a00000000000004")
+        + b"Pin1\x011\x00\x03|&|"
+    )
+    parts = [frame(b"|RECORD=1|LibReference=Synthetic|PartCount=2\x00")]
+
+    for i in range(count):
+        if i % 3 == 0:
+            parts.append(frame(pin, rtype=1))
+        elif i % 3 == 1:
+            parts.append(
+                frame(
+                    b"|RECORD=14|OwnerPartId=1|Location.X=%d|Location.Y=-10"
+                    b"|Corner.X=50|Corner.Y=20|Color=128|AreaColor=11599871"
+                    b"|IsSolid=T|UniqueID=ABCDEFGH\x00" % i
+                )
+            )
+        else:
+            parts.append(
+                frame(
+                    b"|RECORD=4|OwnerPartId=1|Location.X=%d|Location.Y=5"
+                    b"|Color=8388608|FontID=2|Text=Label %d\x00" % (i, i)
+                )
+            )
+
+    return b"".join(parts)
+
+
+def bench(name: str, streams: list, number: int) -> None:
+    for label, legacy_fn, new_fn in (
+        ("split", legacy_split, split_records),
+        (
+            "+pins",
+            lambda s: handle_pin_records(legacy_split(s)),
+            lambda s: handle_pin_records(split_records(s)),
+        ),
+    ):
+        legacy = min(
+            timeit.repeat(lambda: [legacy_fn(s) for s in streams], number=number)
+        )
+        new = min(timeit.repeat(lambda: [new_fn(s) for s in streams], number=number))
+        print(
+            f"{name:<18} {label:<6} legacy {legacy / number * 1000:>9.2f} ms   "
+            f"tokenizer {new / number * 1000:>9.2f} ms   ({legacy / new:.1f}x)"
+        )
+
+
+def main() -> None:
+    bench("fixtures", fixture_streams(), number=200)
+    bench(f"synthetic {SYNTHETIC_RECORDS}", [synthetic_stream(SYNTHETIC_RECORDS)], 3)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,17 @@
 """__init__.py"""
 
+from pyaltium._cache import ModelCache as ModelCache
+from pyaltium._cache import SnapshotCache as SnapshotCache
+from pyaltium._duplicates import find_duplicates as find_duplicates
+from pyaltium._index import LibraryIndex as LibraryIndex
+from pyaltium._scan import ScanResult as ScanResult
+from pyaltium._scan import scan as scan
+from pyaltium._search import SearchIndex as SearchIndex
 from pyaltium.matlib import MaterialsLibrary as MaterialsLibrary
 from pyaltium.pcb import PcbLib as PcbLib
 from pyaltium.pcb import PcbLibItem as PcbLibItem
 from pyaltium.sch import SchLib as SchLib
 from pyaltium.sch import SchLibItem as SchLibItem
+from pyaltium.sch._render import RenderResult as RenderResult
 
 __version__ = "0.4.0"
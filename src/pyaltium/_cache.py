@@ -0,0 +1,266 @@
+"""_cache.py
+
+Snapshots of parsed libraries on disk, so opening the same file again doesn't
+need to parse any OLE. Decompressed 3D models get kept in the same kind of
+directory, named by a hash of their content.
+
+A snapshot is named after the file's path and the options it was opened with,
+plus a hash of its size, mtime and our version, so any change just misses.
+Storing a new snapshot drops older ones for the same path and options, and the
+least recently used snapshots get evicted once the directory is over its size
+limit.
+
+Snapshots are pickles, so only point this at a directory you trust.
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+import pickle
+import tempfile
+import zlib
+from typing import Iterable, Optional
+
+DEFAULT_MAX_BYTES = 256 << 20
+DEFAULT_MODEL_MAX_BYTES = 1 << 30
+
+# Bump whenever what goes into a snapshot changes
+SNAPSHOT_VERSION = 2
+
+_MAGIC = b"PYALTSNP"
+
+
+def default_cache_dir() -> str:
+    """``$PYALTIUM_CACHE_DIR``, or ``pyaltium`` in the user's cache directory."""
+    if path := os.environ.get("PYALTIUM_CACHE_DIR"):
+        return path
+
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "pyaltium")
+
+
+class _CacheDirectory:
+    """Files in a directory, limited to ``max_bytes`` in total. The least
+    recently used ones go first."""
+
+    directory: str
+    max_bytes: int
+
+    # Only files with this suffix are ours
+    _suffix = ""
+
+    def __init__(self, directory: str, max_bytes: int) -> None:
+        self.directory = os.path.expanduser(directory)
+        self.max_bytes = max_bytes
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {self.directory}>"
+
+    def evict(self) -> int:
+        """Drop least recently used files until we fit, returning bytes freed."""
+        entries = []
+        total = 0
+
+        for entry in self._iter_entries():
+            st = entry.stat()
+            entries.append((st.st_mtime_ns, st.st_size, entry.path))
+            total += st.st_size
+
+        freed = 0
+        for _, size, path in sorted(entries):
+            if total - freed <= self.max_bytes:
+                break
+            self._remove(path)
+            freed += size
+
+        return freed
+
+    def clear(self) -> None:
+        """Remove everything."""
+        for entry in self._iter_entries():
+            self._remove(entry.path)
+
+    def size(self) -> int:
+        """Total size of everything cached, in bytes."""
+        return sum(entry.stat().st_size for entry in self._iter_entries())
+
+    def _iter_entries(self):
+        try:
+            entries = list(os.scandir(self.directory))
+        except FileNotFoundError:
+            return
+        for entry in entries:
+            if entry.name.endswith(self._suffix):
+                yield entry
+
+    def _write(self, path: str, chunks: Iterable[bytes]) -> None:
+        """Write to a temporary file then move it into place, so a reader never
+        sees half a file."""
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+            os.replace(tmp_path, path)
+        except BaseException:
+            self._remove(tmp_path)
+            raise
+
+    @staticmethod
+    def _touch(path: str) -> None:
+        # Mark it as recently used, eviction goes by mtime
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class _SnapshotPickler(pickle.Pickler):
+    """Leaves the library's file name out of snapshots. Every item has a copy,
+    which made a snapshot's size depend on where its file is. Loading gives
+    items whatever name the library was opened with."""
+
+    def __init__(self, f, file_name: str) -> None:
+        super().__init__(f, pickle.HIGHEST_PROTOCOL)
+        self.file_name = file_name
+
+    def persistent_id(self, obj):
+        if type(obj) is str and obj == self.file_name:
+            return "file_name"
+        return None
+
+
+class _SnapshotUnpickler(pickle.Unpickler):
+    """Puts back the file name that ``_SnapshotPickler`` left out."""
+
+    def __init__(self, f, file_name: str) -> None:
+        super().__init__(f)
+        self.file_name = file_name
+
+    def persistent_load(self, pid):
+        if pid != "file_name":
+            raise pickle.UnpicklingError(f"Unknown persistent id {pid!r}")
+        return self.file_name
+
+
+class SnapshotCache(_CacheDirectory):
+    """A directory of library snapshots, limited to ``max_bytes`` in total.
+
+    .. code-block:: python
+
+        cache = SnapshotCache("~/.cache/pyaltium")
+        lib = SchLib("myfile.SchLib", cache=cache)
+    """
+
+    _suffix = ".snap"
+
+    def __init__(
+        self, directory: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES
+    ) -> None:
+        super().__init__(directory or default_cache_dir(), max_bytes)
+
+    def load(self, lib) -> bool:
+        """Restore ``lib`` from its snapshot. Gives ``False`` if there isn't one."""
+        path = self._snapshot_path(lib)
+
+        try:
+            with open(path, "rb") as f:
+                blob = f.read()
+        except OSError:
+            return False
+
+        try:
+            if not blob.startswith(_MAGIC):
+                raise ValueError("Not a snapshot")
+            raw = zlib.decompress(memoryview(blob)[len(_MAGIC) :])
+            state = _SnapshotUnpickler(io.BytesIO(raw), lib.file_name).load()
+        except Exception:
+            # Corrupt, or written by something we can't read anymore
+            self._remove(path)
+            return False
+
+        lib._restore_snapshot(state)
+        self._touch(path)
+        return True
+
+    def store(self, lib) -> None:
+        """Save a snapshot of ``lib``, replacing any older ones for its file and
+        options."""
+        path = self._snapshot_path(lib)
+        raw = io.BytesIO()
+        _SnapshotPickler(raw, lib.file_name).dump(lib._snapshot_state())
+
+        self._write(path, [_MAGIC, zlib.compress(raw.getbuffer(), 1)])
+
+        # Snapshots of earlier versions of the same file can't be hit anymore
+        prefix = os.path.basename(path).split("-", 1)[0] + "-"
+        for entry in os.scandir(self.directory):
+            if entry.name.startswith(prefix) and entry.path != path:
+                self._remove(entry.path)
+
+        self.evict()
+
+    def _snapshot_path(self, lib) -> str:
+        from pyaltium import __version__
+
+        file_name = os.path.abspath(lib.file_name)
+        st = os.stat(file_name)
+
+        # Opening the same file with other options gets its own prefix, so the
+        # sweep in ``store`` leaves those snapshots alone
+        path = (file_name, type(lib).__name__, lib._snapshot_options())
+        state = (st.st_size, st.st_mtime_ns, __version__, SNAPSHOT_VERSION)
+        path_key = hashlib.blake2b(repr(path).encode("utf8"), digest_size=8)
+        state_key = hashlib.blake2b(repr(state).encode("utf8"), digest_size=8)
+
+        return os.path.join(
+            self.directory,
+            f"{path_key.hexdigest()}-{state_key.hexdigest()}{self._suffix}",
+        )
+
+
+class ModelCache(_CacheDirectory):
+    """Decompressed 3D models, named by a hash of their compressed data so the
+    same model in any number of libraries only gets decompressed once.
+
+    .. code-block:: python
+
+        cache = ModelCache("~/.cache/pyaltium/models")
+        lib.extract_model(0, "body.step", cache=cache)
+    """
+
+    _suffix = ".model"
+
+    def __init__(
+        self, directory: Optional[str] = None, max_bytes: int = DEFAULT_MODEL_MAX_BYTES
+    ) -> None:
+        super().__init__(
+            directory or os.path.join(default_cache_dir(), "models"), max_bytes
+        )
+
+    def get(self, key: str) -> Optional[str]:
+        """Path to the model cached under ``key``, if there is one."""
+        path = os.path.join(self.directory, key + self._suffix)
+        if not os.path.exists(path):
+            return None
+
+        self._touch(path)
+        return path
+
+    def store(self, key: str, chunks: Iterable[bytes]) -> str:
+        """Write a model a chunk at a time, returning its path."""
+        path = os.path.join(self.directory, key + self._suffix)
+        self._write(path, chunks)
+        self.evict()
+        return path
@@ -0,0 +1,105 @@
+"""_duplicates.py
+
+Find copies of the same component across libraries. Every item gets hashed once
+and grouped by its hash, so this is linear in the number of items rather than
+comparing them in pairs.
+"""
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from pyaltium._scan import _open_library
+from pyaltium.base import AltiumLibMixin, OleSession
+from pyaltium.exceptions import FileError
+
+
+@dataclass
+class DuplicateEntry:
+    """Where one copy lives. ``index`` is its position in the library."""
+
+    path: str
+    index: int
+    name: str
+
+
+@dataclass
+class DuplicateGroup:
+    """Items of the same kind that hash the same."""
+
+    kind: str
+    fingerprint: bytes
+    items: List[DuplicateEntry] = field(default_factory=list)
+
+
+# What comes back for each library: its kind and (index, name, hash) per item
+_LibFingerprints = Tuple[str, str, List[Tuple[int, str, bytes]]]
+
+
+def find_duplicates(
+    libs: Iterable[Union[str, AltiumLibMixin]], canonical: bool = True, jobs: int = 1
+) -> List[DuplicateGroup]:
+    """Group items that show up more than once across ``libs``.
+
+    SchLib and PcbLib items are never grouped together. Groups come back in the
+    order their first item was seen.
+
+    :param libs: Library paths or open libraries
+    :param canonical: Compare what items decode to, so copies that only differ
+        in record order or unique IDs still match. ``False`` only matches byte
+        identical ``Data`` streams, which is quicker
+    :param jobs: Worker processes for hashing libraries given by path, defaults
+        to 1 (hash in this process)
+    """
+    libs = list(libs)
+    results: List[Optional[_LibFingerprints]] = [None] * len(libs)
+    paths: Dict[int, str] = {}
+
+    for pos, lib in enumerate(libs):
+        if isinstance(lib, str):
+            paths[pos] = lib
+        else:
+            results[pos] = _lib_fingerprints(lib, canonical)
+
+    worker = partial(_file_fingerprints, canonical=canonical)
+    if jobs == 1 or len(paths) < 2:
+        hashed = map(worker, paths.values())
+    else:
+        with ProcessPoolExecutor(jobs) as executor:
+            hashed = list(executor.map(worker, paths.values(), chunksize=16))
+
+    for pos, result in zip(paths, hashed):
+        results[pos] = result
+
+    groups: Dict[Tuple[str, bytes], DuplicateGroup] = {}
+    for path, kind, items in results:
+        for idx, name, digest in items:
+            group = groups.get((kind, digest))
+            if group is None:
+                group = groups[(kind, digest)] = DuplicateGroup(kind, digest)
+            group.items.append(DuplicateEntry(path, idx, name))
+
+    return [group for group in groups.values() if len(group.items) > 1]
+
+
+def _file_fingerprints(path: str, canonical: bool) -> _LibFingerprints:
+    with OleSession(path) as session:
+        lib = _open_library(path, session)
+        if lib is None:
+            raise FileError(f"{path} isn't a library we can read.")
+        return _lib_fingerprints(lib, canonical)
+
+
+def _lib_fingerprints(lib: AltiumLibMixin, canonical: bool) -> _LibFingerprints:
+    items = []
+
+    for idx, item in enumerate(lib.iter_items()):
+        if canonical:
+            digest = item.canonical_fingerprint()
+        else:
+            digest = item.data_fingerprint()
+        items.append((idx, item.name, digest))
+
+    return lib.file_name, type(lib).__name__, items
@@ -0,0 +1,120 @@
+"""_header.py
+
+Parsed ``|KEY=VALUE|...`` streams like ``FileHeader``, ``SectionKeys`` and PcbLib
+``Parameters``. Everything gets indexed once so lookups don't need to scan.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterator, List
+
+
+@dataclass
+class HeaderComponent:
+    """One entry of a schematic library's component table."""
+
+    libref: str
+    description: str
+    partcount: int
+
+
+@dataclass
+class HeaderFont:
+    """One entry of a file's font table."""
+
+    font_id: int
+    name: str
+    size: int
+    rotation: int = 0
+    bold: bool = False
+    italic: bool = False
+    underline: bool = False
+    strikeout: bool = False
+
+
+class FileHeader:
+    """Index of a ``|``-separated key/value stream.
+
+    If a key shows up more than once, the first value wins.
+    """
+
+    _index: Dict[str, str]
+
+    def __init__(self, text: str = "") -> None:
+        self._index = {}
+        for item in text.split("|"):
+            key, sep, value = item.partition("=")
+            if sep and key not in self._index:
+                self._index[key] = value
+
+    def __repr__(self) -> str:
+        return f"<FileHeader ({len(self)} keys)>"
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def __getitem__(self, key: str) -> str:
+        return self._index[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def get(self, key: str, default: str = "") -> str:
+        return self._index.get(key, default)
+
+    def get_int(self, key: str, default: int = 0) -> int:
+        """Get a value as an int, using the default if it's missing or not a number."""
+        try:
+            return int(self._index[key])
+        except (KeyError, ValueError):
+            return default
+
+    def get_bool(self, key: str, default: bool = False) -> bool:
+        """Altium writes true as ``T``, and usually leaves false out completely."""
+        value = self._index.get(key)
+        if value is None:
+            return default
+        return value.upper() in ("T", "TRUE")
+
+    @property
+    def comp_count(self) -> int:
+        return self.get_int("CompCount")
+
+    def components(self) -> List[HeaderComponent]:
+        """The component table of a schematic library, in header order."""
+        return list(self.iter_components())
+
+    def iter_components(self) -> Iterator[HeaderComponent]:
+        for i in range(self.comp_count):
+            yield HeaderComponent(
+                libref=self.get(f"LibRef{i}"),
+                description=self.get(f"CompDescr{i}"),
+                partcount=self.get_int(f"PartCount{i}"),
+            )
+
+    def fonts(self) -> List[HeaderFont]:
+        """The font table. Font IDs start at 1."""
+        return [
+            HeaderFont(
+                font_id=i,
+                name=self.get(f"FontName{i}"),
+                size=self.get_int(f"Size{i}"),
+                rotation=self.get_int(f"Rotation{i}"),
+                bold=self.get_bool(f"Bold{i}"),
+                italic=self.get_bool(f"Italic{i}"),
+                underline=self.get_bool(f"Underline{i}"),
+                strikeout=self.get_bool(f"StrikeOut{i}"),
+            )
+            for i in range(1, self.get_int("FontIdCount") + 1)
+        ]
+
+    def section_keys(self) -> Dict[str, str]:
+        """Map of LibRef to storage name, for a ``SectionKeys`` stream."""
+        return {
+            self.get(f"LibRef{i}"): self.get(f"SectionKey{i}")
+            for i in range(self.get_int("KeyCount"))
+            if f"LibRef{i}" in self
+        }
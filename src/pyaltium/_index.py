@@ -0,0 +1,278 @@
+"""_index.py
+
+An on-disk index (SQLite) of what's in a set of libraries, so lookups don't need
+to open any of them. Files are fingerprinted by size, mtime and a content hash and
+only get parsed again when that changes.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Tuple, Union
+
+from pyaltium._scan import DEFAULT_EXTENSIONS, ScanResult, _iter_paths, scan_file
+
+_HASH_CHUNK_SIZE = 1 << 20
+
+# (path, stat, hash, whether it was already indexed)
+_ParseJob = Tuple[str, os.stat_result, str, bool]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    kind TEXT,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS items (
+    path TEXT NOT NULL REFERENCES files(path) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    description TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS items_name ON items(name);
+CREATE INDEX IF NOT EXISTS items_path ON items(path);
+"""
+
+
+@dataclass
+class IndexedItem:
+    """One row of the index, ``data`` is the item's ``as_dict()``."""
+
+    path: str
+    kind: str
+    name: str
+    description: str
+    data: dict
+
+
+@dataclass
+class RefreshStats:
+    added: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    removed: int = 0
+
+
+class LibraryIndex:
+    """Index of library items, stored in a SQLite database.
+
+    .. code-block:: python
+
+        with LibraryIndex("vault.db") as index:
+            index.refresh("path/to/vault")
+            for item in index.find("LM358"):
+                print(item.path)
+    """
+
+    def __init__(self, db_path: str = ":memory:") -> None:
+        self.db_path = db_path
+        self._conn = sqlite3.connect(db_path)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._conn.executescript(_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def refresh(
+        self,
+        paths: Union[str, Iterable[str]],
+        jobs: int = 1,
+        extensions: Optional[Iterable[str]] = DEFAULT_EXTENSIONS,
+    ) -> RefreshStats:
+        """Bring the index up to date for some files or directories.
+
+        Files whose size and mtime haven't changed are skipped without being read.
+        Otherwise they get hashed, and only parsed if the hash changed too. Indexed
+        files under a given directory that no longer exist are dropped, and so are
+        given files that no longer exist.
+
+        :param paths: Files or directories to walk
+        :param jobs: Worker processes for parsing changed files, defaults to 1
+            (parse in this process)
+        :param extensions: Passed through to ``scan`` when walking directories
+        """
+        if isinstance(paths, str):
+            paths = [paths]
+
+        stats = RefreshStats()
+        seen = set()
+        to_parse: List[_ParseJob] = []
+
+        for root in paths:
+            if os.path.isdir(root):
+                found = list(_iter_paths(root, extensions))
+                stats.removed += self._remove_missing(root, found)
+            else:
+                found = [root]
+
+            for path in found:
+                if path in seen:
+                    continue
+                seen.add(path)
+
+                status, job = self._check_file(path)
+                if status == "missing":
+                    stats.removed += self._remove_files([path])
+                elif status == "parse":
+                    to_parse.append(job)
+                else:
+                    stats.unchanged += 1
+
+        for (path, st, digest, existed), result in zip(
+            to_parse, self._parse([p[0] for p in to_parse], jobs)
+        ):
+            self._store(result, st, digest)
+            if existed:
+                stats.updated += 1
+            else:
+                stats.added += 1
+
+        return stats
+
+    def find(self, name: str) -> List[IndexedItem]:
+        """Items with exactly this LibRef or footprint name."""
+        return self._query("items.name = ?", (name,))
+
+    def search(self, text: str) -> List[IndexedItem]:
+        """Items whose name or description contains ``text`` (case insensitive)."""
+        # So ``%`` and ``_`` in the text only match themselves
+        escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        pattern = f"%{escaped}%"
+        return self._query(
+            "items.name LIKE ? ESCAPE '\\' OR items.description LIKE ? ESCAPE '\\'",
+            (pattern, pattern),
+        )
+
+    def items(self, path: str) -> List[IndexedItem]:
+        """Everything indexed for one file, in library order."""
+        return self._query("items.path = ?", (path,))
+
+    def files(self) -> List[str]:
+        return [
+            row[0] for row in self._conn.execute("SELECT path FROM files ORDER BY path")
+        ]
+
+    def errors(self) -> List[Tuple[str, str]]:
+        """Files that couldn't be parsed the last time they changed."""
+        return self._conn.execute(
+            "SELECT path, error FROM files WHERE error IS NOT NULL ORDER BY path"
+        ).fetchall()
+
+    def _query(self, where: str, params: tuple) -> List[IndexedItem]:
+        rows = self._conn.execute(
+            "SELECT items.path, files.kind, items.name, items.description, items.data "
+            "FROM items JOIN files ON files.path = items.path "
+            f"WHERE {where} ORDER BY items.path, items.position",
+            params,
+        )
+        return [
+            IndexedItem(path, kind, name, description, json.loads(data))
+            for path, kind, name, description, data in rows
+        ]
+
+    def _parse(self, paths: List[str], jobs: int) -> Iterable[ScanResult]:
+        if jobs == 1 or len(paths) < 2:
+            return map(scan_file, paths)
+
+        with ProcessPoolExecutor(jobs) as executor:
+            return list(executor.map(scan_file, paths, chunksize=16))
+
+    def _store(self, result: ScanResult, st: os.stat_result, digest: str) -> None:
+        with self._conn:
+            self._conn.execute("DELETE FROM files WHERE path = ?", (result.path,))
+            self._conn.execute(
+                "INSERT INTO files VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    result.path,
+                    result.kind,
+                    st.st_size,
+                    st.st_mtime_ns,
+                    digest,
+                    result.error,
+                ),
+            )
+            self._conn.executemany(
+                "INSERT INTO items VALUES (?, ?, ?, ?, ?)",
+                (
+                    (
+                        result.path,
+                        position,
+                        item.get("libref", item.get("footprintref", "")),
+                        item.get("description", ""),
+                        json.dumps(item),
+                    )
+                    for position, item in enumerate(result.items)
+                ),
+            )
+
+    def _check_file(self, path: str) -> Tuple[str, Optional[_ParseJob]]:
+        """Compare a file against the index. Gives ``"missing"``, ``"unchanged"``,
+        ``"touched"`` (same contents, so only its mtime got updated) or
+        ``"parse"`` along with what parsing it needs."""
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return "missing", None
+
+        row = self._conn.execute(
+            "SELECT size, mtime_ns, hash FROM files WHERE path = ?", (path,)
+        ).fetchone()
+
+        if row is not None and row[:2] == (st.st_size, st.st_mtime_ns):
+            return "unchanged", None
+
+        digest = file_hash(path)
+
+        if row is not None and row[2] == digest:
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE files SET size = ?, mtime_ns = ? WHERE path = ?",
+                    (st.st_size, st.st_mtime_ns, path),
+                )
+            return "touched", None
+
+        return "parse", (path, st, digest, row is not None)
+
+    def _remove_missing(self, root: str, found: List[str]) -> int:
+        """Drop indexed files under ``root`` that weren't found there."""
+        prefix = os.path.join(root, "")
+        found_set = set(found)
+        missing = [
+            path
+            for path in self.files()
+            if path.startswith(prefix) and path not in found_set
+        ]
+
+        return self._remove_files(missing)
+
+    def _remove_files(self, paths: List[str]) -> int:
+        """Drop files from the index, returning how many were in it."""
+        with self._conn:
+            cursor = self._conn.executemany(
+                "DELETE FROM files WHERE path = ?", ((path,) for path in paths)
+            )
+
+        return cursor.rowcount
+
+
+def file_hash(path: str) -> str:
+    """blake2b of a file's contents."""
+    h = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        while chunk := f.read(_HASH_CHUNK_SIZE):
+            h.update(chunk)
+    return h.hexdigest()
@@ -0,0 +1,187 @@
+"""_olemap.py
+
+Zero-copy access to OLE streams through a memory map of the whole file.
+
+olefile reads every stream sector by sector into a fresh ``bytes`` object. Here we
+walk the same FAT/MiniFAT chains ourselves and hand out ``memoryview`` slices of
+an ``mmap`` instead, so nothing gets copied unless a stream's sectors are not
+next to each other in the file. Without a map, big streams can still be read
+a piece at a time with ``OleStreamRuns.iter_chunks``.
+"""
+
+from __future__ import annotations
+
+import mmap
+from typing import Iterable, Iterator, List, Tuple, Union
+
+import olefile
+
+from pyaltium.exceptions import FileError
+
+# (file offset, length) of a contiguous piece of a stream
+_Run = Tuple[int, int]
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+class OleStreamRuns:
+    """Find where the pieces of each stream are in an opened ``OleFileIO``."""
+
+    def __init__(self, ole: olefile.OleFileIO) -> None:
+        self._ole = ole
+        self._ministream_sects: List[int] = None
+
+    def iter_chunks(
+        self, streamname: Union[str, Iterable], chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[bytes]:
+        """Yield a stream in pieces of at most ``chunk_size``, reading from the
+        file as we go so only one piece is ever in memory."""
+        fp = self._ole.fp
+        for offset, length in self._stream_runs(streamname, -1):
+            for start in range(offset, offset + length, chunk_size):
+                fp.seek(start)
+                yield fp.read(min(chunk_size, offset + length - start))
+
+    def _stream_runs(
+        self, streamname: Union[str, Iterable], readbytes: int
+    ) -> Iterator[_Run]:
+        """Find a stream's entry and yield the file regions that make it up."""
+        ole = self._ole
+        entry = ole.direntries[ole._find(streamname)]
+
+        if entry.entry_type != olefile.STGTY_STREAM:
+            raise OSError("this file is not a stream")
+
+        size = entry.size if readbytes < 0 else min(entry.size, readbytes)
+
+        if entry.size < ole.minisectorcutoff:
+            runs = self._mini_runs(entry.isectStart, size)
+        else:
+            runs = self._fat_runs(entry.isectStart, size)
+
+        return _coalesce(runs)
+
+    def _fat_runs(self, start: int, size: int) -> Iterator[_Run]:
+        sectorsize = self._ole.sectorsize
+        for sect, length in _walk_chain(self._ole.fat, start, size, sectorsize):
+            yield ((sect + 1) * sectorsize, length)
+
+    def _mini_runs(self, start: int, size: int) -> Iterator[_Run]:
+        ole = self._ole
+        sectorsize = ole.sectorsize
+        minisectorsize = ole.minisectorsize
+
+        if self._ministream_sects is None:
+            if ole.minifat is None:
+                ole.loadminifat()
+            # The ministream itself lives in regular sectors
+            self._ministream_sects = [
+                sect
+                for sect, _ in _walk_chain(
+                    ole.fat, ole.root.isectStart, ole.root.size, sectorsize
+                )
+            ]
+
+        for minisect, length in _walk_chain(ole.minifat, start, size, minisectorsize):
+            # Mini sectors never straddle a regular sector
+            ms_offset = minisect * minisectorsize
+            idx, rem = divmod(ms_offset, sectorsize)
+
+            if idx >= len(self._ministream_sects):
+                raise FileError("Malformed OLE file, mini sector out of range.")
+
+            yield ((self._ministream_sects[idx] + 1) * sectorsize + rem, length)
+
+
+class MappedOleReader(OleStreamRuns):
+    """Read streams of an already opened ``OleFileIO`` as memoryviews."""
+
+    def __init__(self, ole: olefile.OleFileIO) -> None:
+        super().__init__(ole)
+        self._mm = mmap.mmap(ole.fp.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mm)
+
+    def close(self) -> None:
+        """Release our map.
+
+        Views that were handed out stay valid for as long as somebody holds them,
+        the map only goes away once the last one is gone.
+        """
+        if self._mm is None:
+            return
+
+        self._view.release()
+        try:
+            self._mm.close()
+        except BufferError:
+            # Somebody still has a view, let garbage collection handle it
+            pass
+        self._mm = None
+
+    def read(self, streamname: Union[str, Iterable], readbytes: int = -1) -> memoryview:
+        """Return (up to ``readbytes`` of) a stream.
+
+        The result is a slice of the map if the stream is contiguous, otherwise
+        the pieces get joined into a new buffer.
+        """
+        runs = list(self._stream_runs(streamname, readbytes))
+
+        if len(runs) == 1:
+            offset, length = runs[0]
+            return self._view[offset : offset + length]
+
+        return memoryview(
+            b"".join(self._view[offset : offset + length] for offset, length in runs)
+        )
+
+    def iter_chunks(
+        self, streamname: Union[str, Iterable], chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[memoryview]:
+        """Yield a stream as views of the map, without joining or copying them."""
+        for offset, length in self._stream_runs(streamname, -1):
+            for start in range(offset, offset + length, chunk_size):
+                yield self._view[start : min(start + chunk_size, offset + length)]
+
+
+def _walk_chain(
+    fat: List[int], start: int, size: int, sectorsize: int
+) -> Iterator[Tuple[int, int]]:
+    """Follow a sector chain, yielding each sector and how much of it to use.
+
+    This only ever takes as many steps as the size calls for, and a chain that
+    comes back to a sector it already used is an error, like in olefile.
+    """
+    sect = start
+    remaining = size
+    seen = set()
+
+    for _ in range((size + sectorsize - 1) // sectorsize):
+        if not 0 <= sect < len(fat):
+            raise FileError("Malformed OLE file, sector chain is out of range.")
+        if sect in seen:
+            raise FileError("Malformed OLE file, sector chain loops.")
+
+        seen.add(sect)
+        yield sect, min(sectorsize, remaining)
+        remaining -= sectorsize
+        sect = fat[sect]
+
+
+def _coalesce(runs: Iterable[_Run]) -> Iterator[_Run]:
+    """Merge runs that directly follow each other in the file."""
+    cur_offset, cur_length = None, 0
+
+    for offset, length in runs:
+        if cur_offset is not None and cur_offset + cur_length == offset:
+            cur_length += length
+            continue
+
+        if cur_offset is not None:
+            yield cur_offset, cur_length
+        cur_offset, cur_length = offset, length
+
+    if cur_offset is not None:
+        yield cur_offset, cur_length
+    else:
+        # Empty stream, still give back one (empty) run
+        yield 0, 0
@@ -0,0 +1,216 @@
+"""_scan.py
+
+Scan whole directory trees of libraries, listing each one on a process pool.
+"""
+
+from __future__ import annotations
+
+import itertools
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Dict, Generator, Iterable, Iterator, List, Optional, Tuple
+
+import olefile
+
+from pyaltium.base import OleSession
+from pyaltium.pcb import PcbLib
+from pyaltium.sch import SchLib
+
+DEFAULT_EXTENSIONS = (".schlib", ".pcblib")
+
+# Tried in order when classifying a file
+_LIBRARY_TYPES = (SchLib, PcbLib)
+
+
+@dataclass
+class ScanResult:
+    """Summary of one file. ``kind`` is ``None`` if it isn't a library we know."""
+
+    path: str
+    kind: Optional[str] = None
+    items: List[dict] = field(default_factory=list)
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def scan(
+    root: str,
+    jobs: int = None,
+    chunksize: int = 16,
+    extensions: Optional[Iterable[str]] = DEFAULT_EXTENSIONS,
+) -> Iterator[ScanResult]:
+    """List every library under ``root``.
+
+    Files get classified by their contents and listed in worker processes, with
+    results yielded as chunks finish (so not in any particular order). Only a few
+    chunks are ever in flight at once, so memory doesn't grow with the size of the
+    tree. Errors get reported on that file's result rather than raised.
+
+    :param root: Directory to walk
+    :param jobs: Number of worker processes. ``1`` scans in this process, defaults
+        to the number of CPUs
+    :param chunksize: Files sent to a worker at a time, defaults to 16
+    :param extensions: Only look at files ending in one of these (case
+        insensitive). ``None`` checks every file, defaults to SchLib and PcbLib
+    """
+    paths = _iter_paths(root, extensions)
+
+    if jobs == 1:
+        for path in paths:
+            yield scan_file(path)
+        return
+
+    jobs = jobs or os.cpu_count() or 1
+    executor = ProcessPoolExecutor(jobs)
+    chunks = _iter_chunks(paths, chunksize)
+    # Enough queued work to keep every worker busy, and no more
+    max_in_flight = 2 * jobs
+    in_flight: Dict[Future, Tuple[str, ...]] = {}
+    # Files that were in flight when a worker died. Any of them might be the one
+    # that killed it, so they get scanned again one at a time
+    suspects: List[str] = []
+
+    try:
+        more = True
+        while more:
+            try:
+                if suspects:
+                    yield from _scan_suspect(executor, suspects.pop(0))
+                else:
+                    more = yield from _scan_round(
+                        executor, chunks, in_flight, max_in_flight, suspects
+                    )
+            except BrokenProcessPool:
+                executor = _restart(executor, jobs)
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def _scan_suspect(
+    executor: ProcessPoolExecutor, path: str
+) -> Generator[ScanResult, None, None]:
+    """Scan a file on its own. If the pool breaks, it was this file that broke it,
+    so it gets the error before ``BrokenProcessPool`` is raised again."""
+    try:
+        yield from _chunk_results(executor.submit(_scan_chunk, (path,)), (path,))
+    except BrokenProcessPool as e:
+        yield ScanResult(path, error=_describe(e))
+        raise
+
+
+def _scan_round(
+    executor: ProcessPoolExecutor,
+    chunks: Iterator[Tuple[str, ...]],
+    in_flight: Dict[Future, Tuple[str, ...]],
+    max_in_flight: int,
+    suspects: List[str],
+) -> Generator[ScanResult, None, bool]:
+    """Top up the chunks in flight, then yield the results of whichever finish
+    first. Gives ``False`` once there's nothing left to do.
+
+    If the pool breaks, every file it had is added to ``suspects`` before
+    ``BrokenProcessPool`` is raised again.
+    """
+    unsent: Tuple[str, ...] = ()
+    try:
+        for chunk in itertools.islice(chunks, max_in_flight - len(in_flight)):
+            unsent = chunk
+            in_flight[executor.submit(_scan_chunk, chunk)] = chunk
+        unsent = ()
+
+        if not in_flight:
+            return False
+
+        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+        for future in done:
+            results = _chunk_results(future, in_flight[future])
+            del in_flight[future]
+            yield from results
+    except BrokenProcessPool:
+        # Everything in flight is lost with the pool
+        suspects.extend(unsent)
+        for chunk in in_flight.values():
+            suspects.extend(chunk)
+        in_flight.clear()
+        raise
+
+    return True
+
+
+def _restart(executor: ProcessPoolExecutor, jobs: int) -> ProcessPoolExecutor:
+    """Replace a pool that lost a worker, which can't take any more work."""
+    executor.shutdown(wait=False)
+    return ProcessPoolExecutor(jobs)
+
+
+def scan_file(path: str) -> ScanResult:
+    """Classify and list a single file."""
+    result = ScanResult(path)
+    start = time.perf_counter()
+
+    try:
+        if olefile.isOleFile(path):
+            with OleSession(path) as session:
+                lib = _open_library(path, session)
+                if lib is not None:
+                    result.kind = type(lib).__name__
+                    result.items = lib.list_items()
+    except Exception as e:
+        result.error = _describe(e)
+
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def _open_library(path: str, session: OleSession):
+    """Open a file as whichever library type recognizes it, if any."""
+    for lib_type in _LIBRARY_TYPES:
+        lib = lib_type(lazyload=True)
+        lib._session = session
+
+        if lib._verify_file_type(path):
+            lib.setfile_name(path)
+            return lib
+
+    return None
+
+
+def _chunk_results(future: Future, chunk: Tuple[str, ...]) -> List[ScanResult]:
+    """A chunk's results, or an error on each file if the chunk failed. A dead
+    worker still raises ``BrokenProcessPool``, the pool has to be replaced."""
+    try:
+        return future.result()
+    except BrokenProcessPool:
+        raise
+    except Exception as e:
+        return [ScanResult(path, error=_describe(e)) for path in chunk]
+
+
+def _scan_chunk(paths: Tuple[str, ...]) -> List[ScanResult]:
+    return [scan_file(path) for path in paths]
+
+
+def _iter_paths(root: str, extensions: Optional[Iterable[str]]) -> Iterator[str]:
+    if extensions is not None:
+        extensions = tuple(ext.lower() for ext in extensions)
+
+    for dirpath, _, filenames in os.walk(root):
+        for name in sorted(filenames):
+            if extensions is None or name.lower().endswith(extensions):
+                yield os.path.join(dirpath, name)
+
+
+def _iter_chunks(paths: Iterator[str], chunksize: int) -> Iterator[Tuple[str, ...]]:
+    while chunk := tuple(itertools.islice(paths, chunksize)):
+        yield chunk
+
+
+def _describe(e: Exception) -> str:
+    return f"{type(e).__name__}: {e}"
@@ -0,0 +1,332 @@
+"""_search.py
+
+Search components across many libraries through inverted indexes.
+
+Text fields index each distinct (lowercased) value once, with a sorted list of
+values for prefix queries and a trigram index over values for substring queries.
+Numeric fields keep a sorted list for range queries. Libraries can be added and
+removed at any time.
+"""
+from __future__ import annotations
+
+import bisect
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from pyaltium._scan import _open_library
+from pyaltium.base import AltiumLibMixin, OleSession
+from pyaltium.exceptions import FileError
+from pyaltium.sch import SchLib
+from pyaltium.sch._pintable import pin_table
+from pyaltium.sch._tokenizer import TEXT_RECORD, frame_spans, parse_record
+
+TEXT_FIELDS = (
+    "libref",
+    "footprintref",
+    "description",
+    "pin_name",
+    "pin_designator",
+    "parameter",
+)
+NUMERIC_FIELDS = ("partcount", "height")
+
+_PARAMETER_RECORD = b"|RECORD=41|"
+
+Number = Union[int, float]
+
+
+@dataclass
+class Component:
+    """What gets indexed for one item of a library."""
+
+    path: str
+    kind: str
+    index: int
+    name: str
+    description: str = ""
+    partcount: Optional[int] = None
+    height: Optional[float] = None
+    pin_names: Tuple[str, ...] = ()
+    pin_designators: Tuple[str, ...] = ()
+    parameters: Tuple[str, ...] = ()
+
+    def field_values(self) -> Iterator[Tuple[str, str]]:
+        """Every ``(field, value)`` to index for this component."""
+        yield ("libref" if self.kind == "SchLib" else "footprintref"), self.name
+        yield "description", self.description
+        for name in self.pin_names:
+            yield "pin_name", name
+        for designator in self.pin_designators:
+            yield "pin_designator", designator
+        for text in self.parameters:
+            yield "parameter", text
+
+
+class Prefix(str):
+    """Match values starting with this (case insensitive)."""
+
+
+class Contains(str):
+    """Match values containing this (case insensitive)."""
+
+
+@dataclass
+class Range:
+    """Match numbers between ``min`` and ``max``, both inclusive."""
+
+    min: Optional[Number] = None
+    max: Optional[Number] = None
+
+
+class SearchIndex:
+    """Inverted index over the components of any number of libraries.
+
+    .. code-block:: python
+
+        index = SearchIndex()
+        index.add_library("power.SchLib")
+        index.search(pin_name="VBUS")
+        index.search(footprintref=Contains("QFN"), height=Range(max=1.0))
+
+    Plain strings match whole values, and plain numbers match exactly. Criteria
+    for different fields all have to match.
+    """
+
+    def __init__(self) -> None:
+        self._docs: Dict[int, Component] = {}
+        self._by_path: Dict[str, List[int]] = {}
+        self._next_id = 0
+        self._text = {field: _TextField() for field in TEXT_FIELDS}
+        self._numeric = {field: _NumericField() for field in NUMERIC_FIELDS}
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    @property
+    def paths(self) -> List[str]:
+        return sorted(self._by_path)
+
+    def add_library(self, lib: Union[str, AltiumLibMixin]) -> int:
+        """Index (or re-index) a library, by path or an already open one.
+
+        Returns the number of components added.
+        """
+        if isinstance(lib, str):
+            with OleSession(lib) as session:
+                opened = _open_library(lib, session)
+                if opened is None:
+                    raise FileError(f"{lib} isn't a library we can read.")
+                return self.add_components(opened.file_name, components(opened))
+
+        return self.add_components(lib.file_name, components(lib))
+
+    def add_components(self, path: str, comps: Iterable[Component]) -> int:
+        """Index components that belong to ``path``, replacing what it had."""
+        self.remove_library(path)
+        ids = self._by_path[path] = []
+
+        for comp in comps:
+            doc_id = self._next_id
+            self._next_id += 1
+            self._docs[doc_id] = comp
+            ids.append(doc_id)
+
+            for field, value in comp.field_values():
+                if value:
+                    self._text[field].add(value, doc_id)
+            for field in NUMERIC_FIELDS:
+                value = getattr(comp, field)
+                if value is not None:
+                    self._numeric[field].add(value, doc_id)
+
+        return len(ids)
+
+    def remove_library(self, path: str) -> None:
+        """Drop everything indexed for ``path``, if anything."""
+        for doc_id in self._by_path.pop(path, []):
+            comp = self._docs.pop(doc_id)
+
+            for field, value in comp.field_values():
+                if value:
+                    self._text[field].remove(value, doc_id)
+            for field in NUMERIC_FIELDS:
+                value = getattr(comp, field)
+                if value is not None:
+                    self._numeric[field].remove(value, doc_id)
+
+    def search(self, **criteria) -> List[Component]:
+        """Components matching every one of ``criteria``, in library order."""
+        if not criteria:
+            raise ValueError("Give at least one field to search on")
+
+        result: Optional[Set[int]] = None
+
+        for field, query in criteria.items():
+            found = self._match(field, query)
+            result = found if result is None else result & found
+            if not result:
+                return []
+
+        return sorted(
+            (self._docs[doc_id] for doc_id in result),
+            key=lambda c: (c.path, c.index),
+        )
+
+    def _match(self, field: str, query) -> Set[int]:
+        if field in self._text:
+            index = self._text[field]
+            if isinstance(query, Prefix):
+                return index.prefix(query)
+            if isinstance(query, Contains):
+                return index.contains(query)
+            return index.exact(query)
+
+        if field in self._numeric:
+            index = self._numeric[field]
+            if isinstance(query, Range):
+                return index.range(query.min, query.max)
+            return index.range(query, query)
+
+        raise ValueError(f"Can't search on '{field}'")
+
+
+class _TextField:
+    """Postings for one text field, keyed by lowercased value."""
+
+    def __init__(self) -> None:
+        self.postings: Dict[str, Set[int]] = {}
+        # Distinct values, kept sorted for prefix lookups
+        self.terms: List[str] = []
+        # Trigram -> values containing it
+        self.trigrams: Dict[str, Set[str]] = {}
+
+    def add(self, value: str, doc_id: int) -> None:
+        term = value.lower()
+        docs = self.postings.get(term)
+
+        if docs is None:
+            docs = self.postings[term] = set()
+            bisect.insort(self.terms, term)
+            for gram in _trigrams(term):
+                self.trigrams.setdefault(gram, set()).add(term)
+
+        docs.add(doc_id)
+
+    def remove(self, value: str, doc_id: int) -> None:
+        term = value.lower()
+        docs = self.postings.get(term)
+        if docs is None:
+            return
+
+        docs.discard(doc_id)
+        if docs:
+            return
+
+        del self.postings[term]
+        del self.terms[bisect.bisect_left(self.terms, term)]
+        for gram in _trigrams(term):
+            terms = self.trigrams[gram]
+            terms.discard(term)
+            if not terms:
+                del self.trigrams[gram]
+
+    def exact(self, value: str) -> Set[int]:
+        return set(self.postings.get(value.lower(), ()))
+
+    def prefix(self, value: str) -> Set[int]:
+        value = value.lower()
+        found: Set[int] = set()
+
+        for idx in range(bisect.bisect_left(self.terms, value), len(self.terms)):
+            term = self.terms[idx]
+            if not term.startswith(value):
+                break
+            found |= self.postings[term]
+
+        return found
+
+    def contains(self, value: str) -> Set[int]:
+        value = value.lower()
+
+        if len(value) < 3:
+            # Too short for trigrams, just check every distinct value
+            terms: Iterable[str] = self.terms
+        else:
+            grams = sorted(
+                (self.trigrams.get(g, set()) for g in _trigrams(value)), key=len
+            )
+            terms = set.intersection(*grams) if grams else set()
+
+        found: Set[int] = set()
+        for term in terms:
+            if value in term:
+                found |= self.postings[term]
+        return found
+
+
+class _NumericField:
+    def __init__(self) -> None:
+        self.entries: List[Tuple[Number, int]] = []
+
+    def add(self, value: Number, doc_id: int) -> None:
+        bisect.insort(self.entries, (value, doc_id))
+
+    def remove(self, value: Number, doc_id: int) -> None:
+        idx = bisect.bisect_left(self.entries, (value, doc_id))
+        if idx < len(self.entries) and self.entries[idx] == (value, doc_id):
+            del self.entries[idx]
+
+    def range(self, low: Optional[Number], high: Optional[Number]) -> Set[int]:
+        start = 0 if low is None else bisect.bisect_left(self.entries, (low, -1))
+        if high is None:
+            stop = len(self.entries)
+        else:
+            stop = bisect.bisect_right(self.entries, (high, float("inf")))
+        return {doc_id for _, doc_id in self.entries[start:stop]}
+
+
+def components(lib: AltiumLibMixin) -> Iterator[Component]:
+    """What to index for each item of an open library.
+
+    Schematic pins and parameters come straight from each item's ``Data``
+    stream, without making records.
+    """
+    kind = type(lib).__name__
+
+    for idx, item in enumerate(lib.iter_items()):
+        if isinstance(lib, SchLib):
+            data = bytes(item._read_data())
+            pins = pin_table([data])
+            yield Component(
+                path=lib.file_name,
+                kind=kind,
+                index=idx,
+                name=item.libref,
+                description=item.description,
+                partcount=item.partcount,
+                pin_names=tuple(pins["name"]),
+                pin_designators=tuple(pins["designator"]),
+                parameters=tuple(_parameter_text(data)),
+            )
+        else:
+            yield Component(
+                path=lib.file_name,
+                kind=kind,
+                index=idx,
+                name=item.footprintref,
+                description=item.description,
+                height=item.height,
+            )
+
+
+def _parameter_text(data: bytes) -> Iterator[str]:
+    """``Text`` of every parameter record, only parsing those records."""
+    for rtype, start, stop in frame_spans(data) or []:
+        if rtype == TEXT_RECORD and data.startswith(_PARAMETER_RECORD, start):
+            text = parse_record(data, start, stop).get(b"Text")
+            if text:
+                yield text.decode("utf8", "ignore")
+
+
+def _trigrams(term: str) -> Set[str]:
+    return {term[i : i + 3] for i in range(len(term) - 2)}
@@ -2,14 +2,32 @@
 
 Baase classes for everything we do
 """
+
 from __future__ import annotations
 
-from typing import AnyStr, Generic, Iterable, List, TypeVar, Union
+import hashlib
+import io
+from contextlib import contextmanager, nullcontext
+from typing import (
+    IO,
+    AnyStr,
+    Dict,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TypeVar,
+    Union,
+)
 
 import matplotlib.pyplot as plt
 import olefile
 
+from pyaltium._cache import SnapshotCache
+from pyaltium._header import FileHeader
 from pyaltium._helpers import MAX_READ_SIZE_BYTES
+from pyaltium._olemap import DEFAULT_CHUNK_SIZE, MappedOleReader, OleStreamRuns
 from pyaltium.exceptions import FileError
 
 
@@ -20,17 +38,129 @@ class Magic:
     )
     PCBLIB_HEADER = "PCB 6.0 Binary Library File"
 
+class OleSession:
+    """A single OLE file handle, shared between a library and all of its items.
+
+    The handle is opened when the session is entered and closed when the outermost
+    ``with`` block exits, so nesting is fine. Reads outside of any open session
+    fall back to opening the file just for that read.
+
+    With ``use_mmap``, the file also gets memory mapped while the session is open
+    and stream reads return ``memoryview`` objects over that map.
+    """
+
+    file_name: str
+    use_mmap: bool
+
+    def __init__(self, file_name: str, use_mmap: bool = False) -> None:
+        self.file_name = file_name
+        self.use_mmap = use_mmap
+        self._ole: Optional[olefile.OleFileIO] = None
+        self._mapped: Optional[MappedOleReader] = None
+        self._depth = 0
+
+    def __enter__(self) -> OleSession:
+        if self._ole is None:
+            self._ole = olefile.OleFileIO(self.file_name)
+            if self.use_mmap:
+                self._mapped = MappedOleReader(self._ole)
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._depth -= 1
+        if self._depth <= 0:
+            self.close()
+
+    def __repr__(self) -> str:
+        state = "open" if self.is_open else "closed"
+        return f"<OleSession {self.file_name} ({state})>"
+
+    @property
+    def is_open(self) -> bool:
+        return self._ole is not None
+
+    def close(self) -> None:
+        """Close the handle now, regardless of how many times we were entered."""
+        self._depth = 0
+        if self._mapped is not None:
+            self._mapped.close()
+            self._mapped = None
+        if self._ole is not None:
+            self._ole.close()
+            self._ole = None
+
+    def reopen(self) -> None:
+        """Open the file again to pick up changes. A closed session stays closed."""
+        if self._ole is None:
+            return
+
+        depth = self._depth
+        self.close()
+        self.__enter__()
+        self._depth = depth
+
+    @contextmanager
+    def handle(self) -> Iterator[olefile.OleFileIO]:
+        """Yield the shared handle if we have one, otherwise a temporary one."""
+        if self._ole is not None:
+            yield self._ole
+            return
+
+        with olefile.OleFileIO(self.file_name) as ole:
+            yield ole
+
+    def read(
+        self, streamname: Union[str, Iterable], readbytes: int = MAX_READ_SIZE_BYTES
+    ) -> Union[bytes, memoryview]:
+        """Read a stream. This is a view over the map if we have one."""
+        if self._mapped is not None:
+            return self._mapped.read(streamname, readbytes)
+
+        with self.handle() as ole:
+            return ole.openstream(streamname).read(readbytes)
+
+    def iter_chunks(
+        self, streamname: Union[str, Iterable], chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[Union[bytes, memoryview]]:
+        """Read a stream a piece at a time, for streams too big to read at once."""
+        if self._mapped is not None:
+            yield from self._mapped.iter_chunks(streamname, chunk_size)
+            return
+
+        with self.handle() as ole:
+            yield from OleStreamRuns(ole).iter_chunks(streamname, chunk_size)
+
+
 class OleMixin:
     """Helper functions for anything with an ole file_name object."""
 
     file_name: str
+    _session: Optional[OleSession]
 
     def __init__(self) -> None:
         self.file_name = ""
+        self._session = None
+
+    def _keep_open(self):
+        """Our session, to keep the file open over several reads. Libraries made
+        without a file don't have one, so this does nothing for them."""
+        return self._session if self._session is not None else nullcontext()
+
+    @contextmanager
+    def _ole_handle(self) -> Iterator[olefile.OleFileIO]:
+        """Use our session's handle if there is one, otherwise open the file."""
+        if self._session is not None:
+            with self._session.handle() as ole:
+                yield ole
+            return
+
+        with olefile.OleFileIO(self.file_name) as ole:
+            yield ole
 
     def _list_storages(self):
         """List all storages (directories) in the olefile"""
-        with olefile.OleFileIO(self.file_name) as ole:
+        with self._ole_handle() as ole:
             return ole.listdir()
 
     def _read_decode_stream(
@@ -39,16 +169,35 @@ class OleMixin:
         readbytes: int = MAX_READ_SIZE_BYTES,
         decode: Union[str, bool] = "utf8",
     ) -> AnyStr:
-        """Read a stream (in one go) and decode it. Maybe add yield in the future."""
-        with olefile.OleFileIO(self.file_name) as ole:
-            try:
-                str_read = ole.openstream(streamname).read(readbytes)
-                if decode:
-                    return str_read.decode(decode, "ignore").removesuffix("\x00")
-                return str_read
-            except OSError:
-                # Can't find stream
-                return "" if decode else b""
+        """Read a stream (in one go) and decode it. Maybe add yield in the future.
+
+        If our session is memory mapped, undecoded reads give a ``memoryview``
+        rather than ``bytes``.
+        """
+        try:
+            if self._session is not None:
+                str_read = self._session.read(streamname, readbytes)
+            else:
+                with self._ole_handle() as ole:
+                    str_read = ole.openstream(streamname).read(readbytes)
+        except OSError:
+            # Can't find stream
+            return "" if decode else b""
+
+        if decode:
+            return str(str_read, decode, "ignore").removesuffix("\x00")
+        return str_read
+
+    def _iter_stream_chunks(
+        self, streamname: Union[str, Iterable], chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[Union[bytes, memoryview]]:
+        """Read a stream a piece at a time, through our session if we have one."""
+        if self._session is not None:
+            yield from self._session.iter_chunks(streamname, chunk_size)
+            return
+
+        with self._ole_handle() as ole:
+            yield from OleStreamRuns(ole).iter_chunks(streamname, chunk_size)
 
 
 class AltiumFileMixin(OleMixin):
@@ -56,16 +205,27 @@ class AltiumFileMixin(OleMixin):
     Just intended to set up children
     """
 
-    _header_keys_list: List[bytes]
-    _section_keys_list: List[bytes]
+    header: FileHeader
+    section_keys: FileHeader
     lazyload: bool
+    use_mmap: bool
+    cache: Optional[SnapshotCache]
 
-    def __init__(self, file_name: str = None, lazyload: bool = False) -> None:
+    def __init__(
+        self,
+        file_name: str = None,
+        lazyload: bool = False,
+        use_mmap: bool = False,
+        cache: Union[str, SnapshotCache] = None,
+    ) -> None:
         """Initialize variables to be used later"""
         self.file_name = ""
-        self._header_keys_list = []
-        self._section_keys_list = []
+        self._session = None
+        self.header = FileHeader()
+        self.section_keys = FileHeader()
         self.lazyload = lazyload
+        self.use_mmap = use_mmap
+        self.cache = SnapshotCache(cache) if isinstance(cache, str) else cache
 
         if file_name is not None:
             self.setfile_name(file_name)
@@ -73,6 +233,46 @@ class AltiumFileMixin(OleMixin):
     def __repr__(self):
         return f"AltiumFileMixin({self.file_name})"
 
+    def __enter__(self):
+        if self._session is not None:
+            self._session.__enter__()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @classmethod
+    def open(cls, file_name: str, **kwargs):
+        """Open a library and keep its file handle open until it is closed.
+
+        The library and all of its items share that one handle, so lazy loads
+        don't need to parse the OLE file again. Best used as a context manager:
+
+        .. code-block:: python
+
+            with SchLib.open("myfile_name.SchLib") as lib:
+                records = lib.items_list[0].records
+        """
+        lib = cls(**kwargs)
+        session = OleSession(file_name, use_mmap=lib.use_mmap)
+        lib._session = session.__enter__()
+
+        try:
+            lib.setfile_name(file_name)
+        except BaseException:
+            lib.close()
+            raise
+
+        return lib
+
+    def close(self) -> None:
+        """Close the shared file handle, if it is open.
+
+        Items can still load afterwards, they will just open the file themselves.
+        """
+        if self._session is not None:
+            self._session.close()
+
     def setfile_name(self, file_name: str) -> None:
         """Check if file is valid (to the best of our ability) then update
         generic information.
@@ -82,14 +282,44 @@ class AltiumFileMixin(OleMixin):
         if not olefile.isOleFile(file_name):
             raise FileError("Unable to open file. Is it actually an Altium binary?")
 
-        if not self._verify_file_type(file_name):
-            raise FileError("Appears to be the wrong file type.")
+        if self._session is None or self._session.file_name != file_name:
+            self._session = OleSession(file_name, use_mmap=self.use_mmap)
+
+        if self.cache is not None and self.cache.load(self):
+            return
+
+        # Everything below shares a single handle
+        with self._session:
+            if not self._verify_file_type(file_name):
+                raise FileError("Appears to be the wrong file type.")
+
+            self._update_header_and_section_keys()
+            self._update_item_list()
+
+            if self.cache is not None:
+                try:
+                    self.cache.store(self)
+                except OSError:
+                    # The cache is only there to speed things up
+                    pass
+
+    def _snapshot_options(self) -> tuple:
+        """Options that change what gets parsed, so snapshots need to match them."""
+        return (self.lazyload,)
+
+    def _snapshot_state(self) -> dict:
+        """Everything parsed from the file, for ``SnapshotCache``."""
+        return {"header": self.header, "section_keys": self.section_keys}
 
-        self._update_header_and_section_keys()
-        self._update_item_list()
+    def _restore_snapshot(self, state: dict) -> None:
+        self.header = state["header"]
+        self.section_keys = state["section_keys"]
+
+    def _load_pending(self) -> None:
+        """Load whatever wasn't loaded while listing items, if anything."""
 
     def _update_header_and_section_keys(self) -> None:
-        """Just update class's _header_keys_list object."""
+        """Just update class's header and section_keys objects."""
         raise NotImplementedError()
 
     def _update_item_list(self) -> None:
@@ -101,6 +331,11 @@ class AltiumFileMixin(OleMixin):
         raise NotImplementedError()
 
 
+def stream_fingerprint(data: Union[bytes, memoryview]) -> bytes:
+    """Fast hash of a stream, for telling whether it changed."""
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
 LibItemType = TypeVar("LibItemType")
 
 
@@ -109,11 +344,35 @@ class AltiumLibMixin(AltiumFileMixin, Generic[LibItemType]):
 
     Library items should be able to load themselves from a file."""
 
-    items_list: List[LibItemType]
+    _items: Optional[List[LibItemType]]
+
+    def __init__(
+        self,
+        file_name: str = None,
+        lazyload: bool = False,
+        use_mmap: bool = False,
+        cache: Union[str, SnapshotCache] = None,
+    ) -> None:
+        self._items = []
+        super().__init__(
+            file_name=file_name, lazyload=lazyload, use_mmap=use_mmap, cache=cache
+        )
+
+    @property
+    def items_list(self) -> List[LibItemType]:
+        """Every item in the library.
+
+        Lazy libraries only build this the first time it is used, see
+        ``iter_items`` to go through items without keeping them all.
+        """
+        if self._items is None:
+            with self._keep_open():
+                self._items = list(self._iter_new_items())
+        return self._items
 
-    def __init__(self, file_name: str = None, lazyload: bool = False) -> None:
-        self.items_list = []
-        super().__init__(file_name=file_name, lazyload=lazyload)
+    @items_list.setter
+    def items_list(self, items: List[LibItemType]) -> None:
+        self._items = items
 
     def list_items(self, as_dict=True) -> list[LibItemType]:
         """Return a list of all the items.
@@ -123,7 +382,103 @@ class AltiumLibMixin(AltiumFileMixin, Generic[LibItemType]):
         if not as_dict:
             return self.items_list
 
-        return [item.as_dict() for item in self.items_list]
+        return list(self.iter_dicts())
+
+    def iter_items(
+        self, load: bool = False, release: bool = False
+    ) -> Iterator[LibItemType]:
+        """Yield items one at a time.
+
+        If ``items_list`` hasn't been built, items get made as they are needed
+        and nothing holds on to them, so only one is ever in memory. The file
+        stays open until the generator is done.
+
+        :param load: Load each item's records before yielding it
+        :param release: Drop each item's records once the next one is asked for
+        """
+        if self._items is not None:
+            items = iter(self._items)
+        else:
+            items = self._iter_new_items()
+
+        with self._keep_open():
+            for item in items:
+                if load:
+                    item.records
+                yield item
+                if release:
+                    item._release()
+
+    def iter_dicts(self) -> Iterator[dict]:
+        """Yield ``as_dict()`` of each item, without making a list of them."""
+        for item in self.iter_items():
+            yield item.as_dict()
+
+    def _update_item_list(self) -> None:
+        """Make the item list now, unless we're lazy."""
+        if self.lazyload:
+            self._items = None
+        else:
+            self._items = list(self._iter_new_items())
+
+    def _iter_new_items(self) -> Iterator[LibItemType]:
+        """Create items from the file. This will happen in the inherited class."""
+        raise NotImplementedError()
+
+    def _snapshot_state(self) -> dict:
+        state = super()._snapshot_state()
+        state["items"] = self.items_list
+        return state
+
+    def _restore_snapshot(self, state: dict) -> None:
+        super()._restore_snapshot(state)
+        self._items = state["items"]
+        for item in self._items:
+            item._session = self._session
+
+    def reload(self) -> List[LibItemType]:
+        """Read the file again after it changed on disk.
+
+        Items are only rebuilt if their listing or their streams changed. Anything
+        else keeps its existing object, along with whatever it already parsed.
+        """
+        if self._session is None:
+            raise FileError("No file to reload.")
+
+        previous: Dict[tuple, List[LibItemType]] = {}
+        for item in self._items or []:
+            previous.setdefault(tuple(item.as_dict().items()), []).append(item)
+
+        self._session.reopen()
+
+        with self._session:
+            # List without loading, so unchanged items don't get parsed again
+            lazyload, self.lazyload = self.lazyload, True
+            try:
+                self._update_header_and_section_keys()
+                # Listed here, a lazy _update_item_list would leave it to
+                # items_list, after lazyload is back
+                self._items = list(self._iter_new_items())
+            finally:
+                self.lazyload = lazyload
+
+            for idx, item in enumerate(self.items_list):
+                candidates = previous.get(tuple(item.as_dict().items()))
+                if not candidates:
+                    continue
+
+                old_fp = candidates[0]._fingerprint
+                # Items that never loaded have nothing to lose by being kept
+                if old_fp is None or old_fp == (
+                    item._fingerprint or item.fingerprint()
+                ):
+                    self.items_list[idx] = candidates.pop(0)
+                    self.items_list[idx]._reloaded()
+
+            if not self.lazyload:
+                self._load_pending()
+
+        return self.items_list
 
 
 RecordType = TypeVar("RecordType")
@@ -132,10 +487,44 @@ RecordType = TypeVar("RecordType")
 class AltiumLibItemMixin(OleMixin, Generic[RecordType]):
     """Single item in a library."""
 
-    _records: List[RecordType]
+    _records: Optional[List[RecordType]]
+    _fingerprint: Optional[bytes]
 
-    def __init__(self) -> None:
-        self._records = []
+    def __init__(self, session: OleSession = None) -> None:
+        # None until loaded
+        self._records = None
+        # Hash of the streams this item was built from, if any were read
+        self._fingerprint = None
+        self._session = session
+
+    def fingerprint(self) -> bytes:
+        """Hash of this item's streams as they are in the file right now."""
+        raise NotImplementedError
+
+    def data_fingerprint(self) -> bytes:
+        """Hash of this item's raw ``Data`` stream, the same for identical copies."""
+        raise NotImplementedError
+
+    def canonical_fingerprint(self) -> bytes:
+        """Hash of what this item decodes to, the same for equivalent copies.
+
+        This ignores things that differ between copies of the same thing, like
+        record order and unique IDs.
+        """
+        raise NotImplementedError
+
+    def _reloaded(self) -> None:
+        """Called when the file was reloaded, but this item was kept."""
+
+    def __getstate__(self) -> dict:
+        # Sessions are tied to an open file, the library hands us its own again
+        state = self.__dict__.copy()
+        state["_session"] = None
+        return state
+
+    def _release(self) -> None:
+        """Forget loaded records. They get loaded again if they are needed."""
+        self._records = None
 
     def as_dict(self) -> dict:
         raise NotImplementedError
@@ -159,23 +548,24 @@ class AltiumLibItemMixin(OleMixin, Generic[RecordType]):
         """Draw self on a canvas."""
         raise NotImplementedError
 
-    def get_svg(self):
+    def get_svg(self, out: Optional[IO] = None) -> Optional[bytes]:
+        """Draw self with matplotlib and save it as an SVG.
+
+        :param out: Binary stream to write to. If not given, the SVG gets
+            returned as bytes instead
+        """
         fig, ax = plt.subplots()
-        ax.set_aspect("equal")
-        self.draw(ax)
-        ax.axis("off")
-        ax.autoscale(tight=True)
-        # fig.savefig(
-        #     f"testout/{self.name}.svg",
-        #     dpi=1200,
-        #     transparant=True,
-        #     bbox_inches="tight",
-        #     pad_inches=0,
-        # )
-        fig.savefig(
-            f"testout/{self.name}.png",
-            dpi=1200,
-            transparant=True,
-            bbox_inches="tight",
-            pad_inches=0,
-        )
+        try:
+            ax.set_aspect("equal")
+            self.draw(ax)
+            ax.axis("off")
+            ax.autoscale(tight=True)
+
+            dest = io.BytesIO() if out is None else out
+            fig.savefig(
+                dest, format="svg", transparent=True, bbox_inches="tight", pad_inches=0
+            )
+        finally:
+            plt.close(fig)
+
+        return dest.getvalue() if out is None else None
@@ -5,3 +5,13 @@
 class FileError(Exception):
     """An error that occurs when a file cannot be operated.
     """
+
+
+class PinDecodeError(FileError):
+    """A binary pin record is truncated or otherwise can't be decoded.
+    """
+
+
+class PrimitiveDecodeError(FileError):
+    """A footprint's primitives are truncated or of a type we don't know.
+    """
@@ -1,29 +1,157 @@
+import hashlib
+import os
+import shutil
+import struct
+from contextlib import contextmanager
+from typing import IO, Dict, Iterator, List, Optional, Union
+
+import numpy as np
 import olefile
 
-from pyaltium._helpers import (
-    MAX_READ_SIZE_BYTES,
-    altium_string_split,
-    altium_value_from_key,
+from pyaltium._cache import ModelCache
+from pyaltium._header import FileHeader
+from pyaltium.base import (
+    AltiumLibItemMixin,
+    AltiumLibMixin,
+    Magic,
+    OleSession,
+    stream_fingerprint,
+)
+from pyaltium.pcb._models import (
+    DEFAULT_CHUNK_SIZE,
+    MODELS_STORAGE,
+    EmbeddedModel,
+    content_key,
+    iter_decompressed,
+    make_model,
+    parse_model_headers,
 )
-from pyaltium.base import AltiumLibItemMixin, AltiumLibMixin, Magic
+from pyaltium.pcb._record import PcbPrimitive, decode_primitives, iter_primitives
+from pyaltium.pcb._spatial import SpatialIndex
+from pyaltium.pcb._tables import primitive_tables
+
+# Parameters that get new values whenever a footprint is copied or saved
+_VOLATILE_PARAMETERS = frozenset(("ITEMGUID", "REVISIONGUID"))
+
+# Storages at the top of a PcbLib that aren't footprints
+_METADATA_STORAGES = frozenset(("FileVersionInfo", "Library"))
+
+# Parameters streams are short, so one sector nearly always has everything we use
+_PARAMETERS_FIRST_READ = 512
+_LISTED_PARAMETERS = ("PATTERN", "DESCRIPTION", "HEIGHT")
 
+_U32 = struct.Struct("<I")
+
+
+class PcbLibItem(AltiumLibItemMixin[PcbPrimitive]):
+    """A single footprint in a library.
+
+    If neither ``description`` nor ``height`` is given, they get read from the
+    footprint's ``Parameters`` the first time either one is used.
+    """
 
-class PcbLibItem(AltiumLibItemMixin):
     def __init__(
         self,
         footprintref: str,
-        description: str,
-        height: float,
-        file_name: str,
+        description: Optional[str] = None,
+        height: Optional[float] = None,
+        file_name: str = "",
+        session: OleSession = None,
+        storage: str = None,
     ) -> None:
-        super().__init__()
+        super().__init__(session=session)
         self.footprintref = footprintref
-        self.description = description
-        self.height = height
+        self._description = description
+        self._height = height
+        self._params_loaded = description is not None or height is not None
         self.file_name = file_name
+        # Storage names get truncated, so they don't always match the footprint
+        self.storage = storage if storage is not None else footprintref
+
+    @property
+    def description(self) -> str:
+        self._load_parameters_once()
+        return self._description
+
+    @description.setter
+    def description(self, value: str) -> None:
+        self._load_parameters_once()
+        self._description = value
+
+    @property
+    def height(self) -> Optional[float]:
+        """Height in mm, rounded to 0.01."""
+        self._load_parameters_once()
+        return self._height
+
+    @height.setter
+    def height(self, value: Optional[float]) -> None:
+        self._load_parameters_once()
+        self._height = value
+
+    def _load_parameters_once(self) -> None:
+        if not self._params_loaded:
+            self._load_parameters()
+
+    def _load_parameters(self) -> None:
+        params = self._read_parameters()
+        self._description = params.get("DESCRIPTION")
+        self._height = parse_height(params.get("HEIGHT"))
+        self._params_loaded = True
+
+    def _read_parameters(self) -> FileHeader:
+        """Parse ``Parameters``, only reading past the first sector if we need to."""
+        raw = self._read_decode_stream(
+            (self.storage, "Parameters"), _PARAMETERS_FIRST_READ, decode=False
+        )
+        params = parse_parameters(raw)
+
+        if len(raw) >= _PARAMETERS_FIRST_READ and not all(
+            key in params for key in _LISTED_PARAMETERS
+        ):
+            raw = self._read_decode_stream((self.storage, "Parameters"), decode=False)
+            params = parse_parameters(raw)
+
+        return params
+
+    def fingerprint(self) -> bytes:
+        # Parameters only hold what as_dict shows, reload already compares that
+        return stream_fingerprint(self._read_data())
+
+    def data_fingerprint(self) -> bytes:
+        # Data is the only stream we fingerprint, so a loaded one can be reused
+        return self._fingerprint or self.fingerprint()
 
-    def _run_load(self) -> None:
-        raise NotImplementedError
+    def canonical_fingerprint(self) -> bytes:
+        # Unique IDs are kept in their own storage, so Data doesn't have any. Its
+        # primitives do stay in file order.
+        raw = self._read_decode_stream((self.storage, "Parameters"), decode=False)
+        params = parse_parameters(raw)
+
+        h = hashlib.blake2b(self._read_data(), digest_size=16)
+        for key in sorted(params):
+            if key not in _VOLATILE_PARAMETERS:
+                h.update(f"|{key}={params[key]}".encode("utf8"))
+        return h.digest()
+
+    def _read_data(self):
+        """Read the raw ``Data`` stream, which has the footprint's primitives."""
+        return self._read_decode_stream((self.storage, "Data"), decode=False)
+
+    def _load_data(self) -> None:
+        """Decode the primitives in this footprint's ``Data`` stream."""
+        data = self._read_data()
+        self._fingerprint = stream_fingerprint(data)
+        self._records = decode_primitives(data)
+
+    def iter_primitives(self) -> Iterator[PcbPrimitive]:
+        """Decode primitives one at a time, without keeping them."""
+        return iter_primitives(self._read_data())
+
+    def spatial_index(self) -> SpatialIndex:
+        """Index of this footprint's pads, see ``SpatialIndex``. Results are
+        rows of ``index.data``, the footprint's pads table."""
+        return SpatialIndex.from_pads(primitive_tables([self._read_data()])["pads"])
 
     def as_dict(self) -> dict:
         """Create a parsable dict."""
@@ -33,6 +161,12 @@ class PcbLibItem(AltiumLibItemMixin):
             "height": self.height,
         }
 
+    def __repr__(self) -> str:
+        return f"<PcbLibItem> {self.footprintref}"
+
+    def __str__(self) -> str:
+        return self.footprintref
+
 
 class PcbLib(AltiumLibMixin[PcbLibItem]):
     """Main object to interact with PCBLib"""
@@ -43,62 +177,249 @@ class PcbLib(AltiumLibMixin[PcbLibItem]):
         return Magic.PCBLIB_HEADER in fh_str
 
     def _update_header_and_section_keys(self) -> None:
-        """Just update class's _header_keys_list object"""
+        """Just update class's header and section_keys objects"""
         fh_str = self._read_decode_stream("FileHeader")
         sk_str = self._read_decode_stream("SectionKeys")
 
-        self._header_keys_list = altium_string_split(fh_str)
-        self._section_keys_list = altium_string_split(sk_str)
-
-    def _update_item_list(self) -> None:
-        with olefile.OleFileIO(self.file_name) as ole:
-            # Just list storages. We will need to add something to integrate
-            # SectionKeys at some point, but the PCBLib flavor of that
-            # file makes 0 sense (yet)
-            storages_list = ole.listdir(streams=False, storages=True)
-
-            self.items_list = []
-
-            # Need to select only items in storages_list with len 1 (any more
-            # would be a subdir) then select 0th element (to get list of str
-            # rather than list of list of str)
-            for lib_item in (s for s in storages_list if len(s) == 1):
-                # Ignore this metadata stream
-                if ("fileversioninfo" in lib_item[0].lower()) or (
-                    "library" in lib_item[0].lower()
+        self.header = FileHeader(fh_str)
+        self.section_keys = FileHeader(sk_str)
+
+    def primitive_tables(self) -> Dict[str, np.ndarray]:
+        """Pads, vias, tracks, arcs and fills of every footprint, as NumPy
+        structured arrays keyed by ``pads``, ``vias`` and so on.
+
+        There is a row per primitive, and ``item`` is the index of its footprint
+        in ``items_list``. See ``PAD_DTYPE`` and friends for the other columns.
+        Finding every through hole pad with a hole under 0.3 mm is just:
+
+        .. code-block:: python
+
+            pads = lib.primitive_tables()["pads"]
+            small = pads[(pads["hole"] > 0) & (pads["hole"] < 0.3 * UNITS_PER_MM)]
+        """
+        with self._keep_open():
+            streams = [item._read_data() for item in self.items_list]
+
+        return primitive_tables(streams)
+
+    def spatial_index(self) -> SpatialIndex:
+        """Index of every pad in the library, grouped by footprint. Results are
+        rows of ``index.data``, the library's pads table.
+
+        .. code-block:: python
+
+            index = lib.spatial_index()
+            for a, b in index.pairs(clearance=0.1 * UNITS_PER_MM):
+                print(lib.items_list[index.data["item"][a]], index.data[[a, b]])
+        """
+        return SpatialIndex.from_pads(self.primitive_tables()["pads"])
+
+    def models(self) -> List[EmbeddedModel]:
+        """List the library's embedded 3D models.
+
+        This only reads their headers, models don't get decompressed (or even
+        read) until they are extracted.
+        """
+        headers = parse_model_headers(
+            self._read_decode_stream(MODELS_STORAGE + ("Data",), decode=False)
+        )
+
+        models = []
+        with self._ole_handle() as ole:
+            for idx, params in enumerate(headers):
+                stream = list(MODELS_STORAGE + (str(idx),))
+                size = ole.get_size(stream) if ole.exists(stream) else 0
+                models.append(make_model(idx, params, size))
+
+        return models
+
+    def iter_model_chunks(
+        self,
+        model: Union[EmbeddedModel, int, str],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Iterator[bytes]:
+        """Decompress a model a piece at a time, no more than ``chunk_size``
+        bytes in and out at once.
+
+        :param model: An ``EmbeddedModel``, its index, or its name
+        """
+        model = self._find_model(model)
+        return iter_decompressed(
+            self._iter_stream_chunks(model.stream, chunk_size), chunk_size
+        )
+
+    def extract_model(
+        self,
+        model: Union[EmbeddedModel, int, str],
+        dest: Union[str, os.PathLike, IO[bytes]],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        cache: Union[str, ModelCache] = None,
+    ) -> int:
+        """Decompress a model to a file, returning how many bytes were written.
+
+        .. code-block:: python
+
+            for model in lib.models():
+                lib.extract_model(model, model.name, cache="~/.cache/models")
+
+        :param model: An ``EmbeddedModel``, its index, or its name
+        :param dest: Path to write to, or a binary file object
+        :param chunk_size: Most bytes to hold at once while decompressing
+        :param cache: A ``ModelCache`` (or its directory). Models already in it
+            get copied from there, and the rest get added while they are
+            written out
+        """
+        model = self._find_model(model)
+        if isinstance(cache, str):
+            cache = ModelCache(cache)
+
+        with _open_dest(dest) as f:
+            if cache is None:
+                return _write_chunks(f, self.iter_model_chunks(model, chunk_size))
+
+            # Hashing the compressed stream is much quicker than decompressing it
+            key = content_key(self._iter_stream_chunks(model.stream, chunk_size))
+            if (path := cache.get(key)) is not None:
+                with open(path, "rb") as src:
+                    shutil.copyfileobj(src, f, chunk_size)
+                return os.path.getsize(path)
+
+            # Write to the destination and the cache in the same pass
+            written = 0
+
+            def tee() -> Iterator[bytes]:
+                nonlocal written
+                for chunk in self.iter_model_chunks(model, chunk_size):
+                    f.write(chunk)
+                    written += len(chunk)
+                    yield chunk
+
+            cache.store(key, tee())
+            return written
+
+    def _find_model(self, model: Union[EmbeddedModel, int, str]) -> EmbeddedModel:
+        if isinstance(model, EmbeddedModel):
+            return model
+
+        models = self.models()
+        if isinstance(model, int):
+            return models[model]
+
+        for candidate in models:
+            if candidate.name == model:
+                return candidate
+        raise KeyError(f"No embedded model named {model}")
+
+    def _iter_new_items(self) -> Iterator[PcbLibItem]:
+        """List footprints from the storage directory, without reading any streams.
+
+        Descriptions and heights get read later, when they are first used.
+        """
+        full_names = parse_section_keys(
+            self._read_decode_stream("SectionKeys", decode=False)
+        )
+
+        with self._ole_handle() as ole:
+            # Only the top level of the directory, each footprint is a storage
+            for entry in ole.root.kids:
+                if (
+                    entry.entry_type != olefile.STGTY_STORAGE
+                    or entry.name in _METADATA_STORAGES
                 ):
                     continue
 
-                # We want the paramaters stream within our storage
-                lib_item.append("Parameters")
+                yield PcbLibItem(
+                    footprintref=full_names.get(entry.name, entry.name),
+                    file_name=self.file_name,
+                    session=self._session,
+                    storage=entry.name,
+                )
 
-                param_bytestring = ole.openstream(lib_item).read(MAX_READ_SIZE_BYTES)
 
-                # First 4 bytes seem to be random noise
-                param_bytestring = param_bytestring[4:]
+def parse_parameters(raw: bytes) -> FileHeader:
+    """Parse a ``Parameters`` stream, or as much of the start of one as we have.
 
-                # Note: don't really want to ignore errors but
-                # '3LED ArrayVertical 2mm TH' has a mystery character
-                params_list = altium_string_split(
-                    param_bytestring.decode("utf8", errors="ignore")
-                )
+    It's a u32 length then ``|KEY=VALUE`` text. If ``raw`` stops short of that
+    length, the last (cut off) value gets dropped.
+    """
+    if len(raw) < _U32.size:
+        return FileHeader()
 
-                footprintref = altium_value_from_key(params_list, "PATTERN")
-                description = altium_value_from_key(params_list, "DESCRIPTION")
+    (length,) = _U32.unpack_from(raw)
+    # Note: don't really want to ignore errors but
+    # '3LED ArrayVertical 2mm TH' has a mystery character
+    text = bytes(raw[_U32.size :]).decode("utf8", errors="ignore")
 
-                height_tmp = altium_value_from_key(params_list, "HEIGHT").lower()
+    if length > len(raw) - _U32.size:
+        text = text[: text.rfind("|")]
 
-                if "mm" in height_tmp:
-                    height = round(float(height_tmp.replace("mm", "")), 2)
+    return FileHeader(text.rstrip("\x00"))
 
-                if "mil" in height_tmp:
-                    height = round(float(height_tmp.replace("mil", "")) * 0.0254, 2)
 
-                self.items_list.append(
-                    PcbLibItem(
-                        footprintref=footprintref,
-                        description=description,
-                        height=height,
-                        file_name=self.file_name,
-                    )
-                )
+def parse_height(value: Optional[str]) -> Optional[float]:
+    """Turn a ``HEIGHT`` like ``39.3701mil`` or ``1mm`` into mm."""
+    value = (value or "").lower()
+
+    try:
+        if value.endswith("mm"):
+            return round(float(value[:-2]), 2)
+        if value.endswith("mil"):
+            return round(float(value[:-3]) * 0.0254, 2)
+    except ValueError:
+        pass
+
+    return None
+
+
+def parse_section_keys(raw: bytes) -> Dict[str, str]:
+    """Map of storage name to full footprint name, for names that got truncated.
+
+    In a PcbLib this stream is binary: a u32 count, then for each footprint its
+    name (a u32 block length around a u8 length prefixed string) and its storage
+    name (a u32 length prefixed string).
+    """
+    raw = bytes(raw)
+    if raw.startswith(b"|"):
+        text = FileHeader(raw.decode("utf8", errors="ignore"))
+        return {key: name for name, key in text.section_keys().items()}
+
+    names: Dict[str, str] = {}
+
+    try:
+        (count,) = _U32.unpack_from(raw)
+        offset = _U32.size
+
+        for _ in range(count):
+            (block,) = _U32.unpack_from(raw, offset)
+            name = raw[offset + 5 : offset + 5 + raw[offset + 4]]
+            offset += _U32.size + block
+
+            (key_len,) = _U32.unpack_from(raw, offset)
+            key = raw[offset + _U32.size : offset + _U32.size + key_len]
+            offset += _U32.size + key_len
+
+            names[key.decode("utf8", "ignore")] = name.decode("utf8", "ignore")
+    except (struct.error, IndexError):
+        # Missing or not what we expected, storage names will have to do
+        pass
+
+    return names
+
+
+@contextmanager
+def _open_dest(dest: Union[str, os.PathLike, IO[bytes]]) -> Iterator[IO[bytes]]:
+    """Open a path for writing, or pass a file object through without closing it."""
+    if hasattr(dest, "write"):
+        yield dest
+        return
+
+    with open(dest, "wb") as f:
+        yield f
+
+
+def _write_chunks(f: IO[bytes], chunks: Iterator[bytes]) -> int:
+    written = 0
+    for chunk in chunks:
+        f.write(chunk)
+        written += len(chunk)
+    return written
@@ -0,0 +1,123 @@
+"""_models.py
+
+3D models embedded in a PcbLib, which live in the ``Library/Models`` storage.
+
+``Data`` there has a u32 length prefixed ``|KEY=VALUE`` header for each model,
+and stream ``n`` is model ``n``'s file (usually STEP) compressed with zlib. Those
+streams can be huge, so listing only reads ``Data`` and the storage directory,
+and extracting decompresses a piece at a time.
+"""
+from __future__ import annotations
+
+import hashlib
+import struct
+import zlib
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from pyaltium._header import FileHeader
+from pyaltium.exceptions import FileError
+
+MODELS_STORAGE = ("Library", "Models")
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+_U32 = struct.Struct("<I")
+
+
+@dataclass
+class EmbeddedModel:
+    """A model's details from its header, nothing here needs decompressing.
+
+    ``compressed_size`` is the size of its stream in the file.
+    """
+
+    index: int
+    name: str
+    id: str
+    checksum: Optional[int]
+    embedded: bool
+    rotation: Tuple[float, float, float]
+    dz: float
+    compressed_size: int
+    parameters: FileHeader = field(default_factory=FileHeader, repr=False)
+
+    @property
+    def stream(self) -> Tuple[str, ...]:
+        return MODELS_STORAGE + (str(self.index),)
+
+
+def parse_model_headers(raw: bytes) -> List[FileHeader]:
+    """Split the ``Data`` stream into each model's parameters."""
+    raw = bytes(raw)
+    headers = []
+    offset = 0
+
+    while offset + _U32.size <= len(raw):
+        (length,) = _U32.unpack_from(raw, offset)
+        offset += _U32.size
+        if offset + length > len(raw):
+            raise FileError("Model header runs past the end of Library/Models/Data")
+
+        text = str(raw[offset : offset + length], "utf8", "ignore").rstrip("\x00")
+        headers.append(FileHeader(text))
+        offset += length
+
+    return headers
+
+
+def make_model(index: int, params: FileHeader, compressed_size: int) -> EmbeddedModel:
+    """Build an ``EmbeddedModel`` from its header's parameters."""
+    return EmbeddedModel(
+        index=index,
+        name=params.get("NAME"),
+        id=params.get("ID"),
+        checksum=params.get_int("CHECKSUM", None),
+        embedded=params.get_bool("EMBED"),
+        rotation=tuple(_float(params.get(f"ROT{axis}")) for axis in "XYZ"),
+        dz=_float(params.get("DZ")),
+        compressed_size=compressed_size,
+        parameters=params,
+    )
+
+
+def iter_decompressed(
+    chunks: Iterable[bytes], chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[bytes]:
+    """Decompress a zlib stream given in pieces, yielding at most ``chunk_size``
+    bytes at a time. Memory use stays around ``chunk_size`` however well the
+    data compressed."""
+    decomp = zlib.decompressobj()
+
+    try:
+        for chunk in chunks:
+            data = chunk
+            while data:
+                out = decomp.decompress(data, chunk_size)
+                if out:
+                    yield out
+                data = decomp.unconsumed_tail
+                if decomp.eof:
+                    return
+
+        while not decomp.eof and (out := decomp.decompress(b"", chunk_size)):
+            yield out
+    except zlib.error as e:
+        raise FileError(f"Model data is corrupt: {e}") from e
+
+    if not decomp.eof:
+        raise FileError("Model data is truncated")
+
+
+def content_key(chunks: Iterable[bytes]) -> str:
+    """Hash of a model's compressed stream, to name it by in a cache."""
+    h = hashlib.blake2b(digest_size=16)
+    for chunk in chunks:
+        h.update(chunk)
+    return h.hexdigest()
+
+
+def _float(value: Optional[str]) -> float:
+    try:
+        return float(value or 0)
+    except ValueError:
+        return 0.0
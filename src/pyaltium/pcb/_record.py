@@ -0,0 +1,373 @@
+"""_record.py
+
+Decoding for the primitives in a footprint's ``Data`` stream.
+
+The stream starts with the footprint's name, as a u32 block length around a
+length prefixed string. Then each primitive is a one byte type, followed by a
+fixed number of blocks for that type: a u32 length and that many bytes. The first
+block of every primitive (the second for pads) starts with the layer, a u16 of
+flags and ten bytes we don't use.
+
+Coordinates and sizes are in Altium's internal units, 10000 per mil. Angles are
+in degrees.
+"""
+from __future__ import annotations
+
+import struct
+from dataclasses import dataclass, field
+from enum import IntEnum, unique
+from typing import Dict, Iterator, List, Tuple
+
+from pyaltium.exceptions import PrimitiveDecodeError
+
+UNITS_PER_MIL = 10000
+UNITS_PER_MM = UNITS_PER_MIL / 0.0254
+
+
+@unique
+class PcbPrimitiveType(IntEnum):
+    """Types of primitive in a footprint."""
+
+    ARC = 1
+    PAD = 2
+    VIA = 3
+    TRACK = 4
+    TEXT = 5
+    FILL = 6
+    REGION = 11
+    COMPONENT_BODY = 12
+
+
+@unique
+class PcbPadShape(IntEnum):
+    ROUND = 1
+    RECTANGLE = 2
+    OCTAGONAL = 3
+    ROUNDED_RECTANGLE = 9
+
+
+class PcbLayer(IntEnum):
+    """The layers footprints mostly use. Internal and mechanical layers sit in
+    between and after these, and just stay numbers."""
+
+    TOP = 1
+    BOTTOM = 32
+    TOP_OVERLAY = 33
+    BOTTOM_OVERLAY = 34
+    TOP_PASTE = 35
+    BOTTOM_PASTE = 36
+    TOP_SOLDER = 37
+    BOTTOM_SOLDER = 38
+    KEEP_OUT = 56
+    MECHANICAL_1 = 57
+    MULTI_LAYER = 74
+
+
+# Blocks that make up each type of primitive
+BLOCK_COUNTS = {
+    PcbPrimitiveType.ARC: 1,
+    PcbPrimitiveType.PAD: 6,
+    PcbPrimitiveType.VIA: 1,
+    PcbPrimitiveType.TRACK: 1,
+    PcbPrimitiveType.TEXT: 2,
+    PcbPrimitiveType.FILL: 1,
+    PcbPrimitiveType.REGION: 1,
+    PcbPrimitiveType.COMPONENT_BODY: 1,
+}
+
+# Pad blocks: designator, ?, "|&|0", ?, geometry, then the optional size and shape
+# of every layer
+PAD_GEOMETRY_BLOCK = 4
+PAD_LAYERS_BLOCK = 5
+
+# Every block layout starts with the layer and flags
+_COMMON = "<BH10x"
+_U32 = struct.Struct("<I")
+
+# Center x/y, radius, start and end angle, width
+ARC = struct.Struct(_COMMON + "iiiddi")
+# x/y, x/y size on the top, middle and bottom layers, hole size, shape on each of
+# those, rotation, plated
+PAD = struct.Struct(_COMMON + "ii6iiBBBd?")
+# x/y, diameter, hole size
+VIA = struct.Struct(_COMMON + "iiii")
+# Start x/y, end x/y, width
+TRACK = struct.Struct(_COMMON + "iiiii")
+# x/y, height, stroke font, rotation, mirrored, stroke width
+TEXT = struct.Struct(_COMMON + "iiihd?i")
+# Corner x/y, opposite corner x/y, rotation
+FILL = struct.Struct(_COMMON + "iiiid")
+# Then a u32 length of |KEY=VALUE parameters, a u32 vertex count, and f64 x/y
+# pairs for each vertex
+SHAPED = struct.Struct(_COMMON + "4xx")
+_VERTEX = struct.Struct("<dd")
+
+# In a pad's layer block, after sizes and shapes for 29 layers and hole details
+# come an alternate shape then a corner radius (percent) for each of 32 layers
+PAD_ALT_SHAPES = 532
+PAD_CORNER_RADII = 564
+
+
+@dataclass
+class PcbPrimitive:
+    layer: int
+    flags: int
+
+
+@dataclass
+class PcbArc(PcbPrimitive):
+    x: int
+    y: int
+    radius: int
+    start_angle: float
+    end_angle: float
+    width: int
+
+
+@dataclass
+class PcbPad(PcbPrimitive):
+    """A pad. Size and shape are the ones on its own layer (the top layer for
+    through hole pads), ``corner_radius`` is a percentage for rounded
+    rectangles."""
+
+    designator: str
+    x: int
+    y: int
+    size_x: int
+    size_y: int
+    shape: int
+    hole: int
+    rotation: float
+    plated: bool
+    corner_radius: int = 0
+
+
+@dataclass
+class PcbVia(PcbPrimitive):
+    x: int
+    y: int
+    diameter: int
+    hole: int
+
+
+@dataclass
+class PcbTrack(PcbPrimitive):
+    x1: int
+    y1: int
+    x2: int
+    y2: int
+    width: int
+
+
+@dataclass
+class PcbText(PcbPrimitive):
+    """Text, ``text`` is cut off at 255 characters."""
+
+    x: int
+    y: int
+    height: int
+    rotation: float
+    mirrored: bool
+    width: int
+    text: str
+
+
+@dataclass
+class PcbFill(PcbPrimitive):
+    x1: int
+    y1: int
+    x2: int
+    y2: int
+    rotation: float
+
+
+@dataclass
+class PcbRegion(PcbPrimitive):
+    parameters: Dict[str, str] = field(default_factory=dict)
+    vertices: List[Tuple[float, float]] = field(default_factory=list)
+
+
+@dataclass
+class PcbComponentBody(PcbRegion):
+    """The outline of a 3D body, its height and model are in ``parameters``."""
+
+
+Blocks = List[Tuple[int, int]]
+
+
+def iter_blocks(data: bytes) -> Iterator[Tuple[int, Blocks]]:
+    """Yield each primitive's type and the ``(start, stop)`` of each of its blocks."""
+    offset = _skip_block(data, 0)
+    end = len(data)
+
+    while offset < end:
+        ptype = data[offset]
+        count = BLOCK_COUNTS.get(ptype)
+        if count is None:
+            raise PrimitiveDecodeError(f"Unknown primitive type {ptype} at {offset}")
+
+        offset += 1
+        blocks = []
+        for _ in range(count):
+            start = offset + _U32.size
+            offset = _skip_block(data, offset)
+            blocks.append((start, offset))
+
+        yield ptype, blocks
+
+
+def iter_primitives(data: bytes) -> Iterator[PcbPrimitive]:
+    """Decode a footprint's ``Data`` stream one primitive at a time."""
+    data = bytes(data)
+
+    for ptype, blocks in iter_blocks(data):
+        try:
+            yield _DECODERS[ptype](data, blocks)
+        except struct.error as e:
+            raise PrimitiveDecodeError(
+                f"{PcbPrimitiveType(ptype).name.lower()} at {blocks[0][0]} is "
+                "truncated"
+            ) from e
+
+
+def decode_primitives(data: bytes) -> List[PcbPrimitive]:
+    return list(iter_primitives(data))
+
+
+def pad_shape(data: bytes, layers_block: Tuple[int, int], layer: int, shape: int):
+    """A pad's shape and corner radius, checking for an alternate shape."""
+    start, stop = layers_block
+    # Only the top and bottom layers' shapes get used
+    idx = 31 if layer == PcbLayer.BOTTOM else 0
+
+    if stop - start > PAD_CORNER_RADII + idx:
+        alt_shape = data[start + PAD_ALT_SHAPES + idx]
+        if alt_shape == PcbPadShape.ROUNDED_RECTANGLE:
+            return alt_shape, data[start + PAD_CORNER_RADII + idx]
+
+    return shape, 0
+
+
+def _skip_block(data: bytes, offset: int) -> int:
+    if offset + _U32.size > len(data):
+        raise PrimitiveDecodeError(f"Block at {offset} is truncated")
+
+    (length,) = _U32.unpack_from(data, offset)
+    stop = offset + _U32.size + length
+    if stop > len(data):
+        raise PrimitiveDecodeError(f"Block at {offset} runs past the end")
+    return stop
+
+
+def _pstr(data: bytes, start: int, stop: int) -> str:
+    """A u8 length prefixed string filling a block."""
+    if start >= stop:
+        return ""
+    return str(data[start + 1 : min(stop, start + 1 + data[start])], "utf8", "ignore")
+
+
+def _decode_arc(data: bytes, blocks: Blocks) -> PcbArc:
+    return PcbArc(*ARC.unpack_from(data, blocks[0][0]))
+
+
+def _decode_pad(data: bytes, blocks: Blocks) -> PcbPad:
+    (
+        layer,
+        flags,
+        x,
+        y,
+        *sizes,
+        hole,
+        shape_top,
+        _,
+        shape_bottom,
+        rotation,
+        plated,
+    ) = PAD.unpack_from(data, blocks[PAD_GEOMETRY_BLOCK][0])
+
+    if layer == PcbLayer.BOTTOM:
+        size_x, size_y, shape = sizes[4], sizes[5], shape_bottom
+    else:
+        size_x, size_y, shape = sizes[0], sizes[1], shape_top
+
+    shape, corner_radius = pad_shape(data, blocks[PAD_LAYERS_BLOCK], layer, shape)
+
+    return PcbPad(
+        layer=layer,
+        flags=flags,
+        designator=_pstr(data, *blocks[0]),
+        x=x,
+        y=y,
+        size_x=size_x,
+        size_y=size_y,
+        shape=shape,
+        hole=hole,
+        rotation=rotation,
+        plated=plated,
+        corner_radius=corner_radius,
+    )
+
+
+def _decode_via(data: bytes, blocks: Blocks) -> PcbVia:
+    return PcbVia(*VIA.unpack_from(data, blocks[0][0]))
+
+
+def _decode_track(data: bytes, blocks: Blocks) -> PcbTrack:
+    return PcbTrack(*TRACK.unpack_from(data, blocks[0][0]))
+
+
+def _decode_text(data: bytes, blocks: Blocks) -> PcbText:
+    layer, flags, x, y, height, _, rotation, mirrored, width = TEXT.unpack_from(
+        data, blocks[0][0]
+    )
+    return PcbText(
+        layer, flags, x, y, height, rotation, mirrored, width, _pstr(data, *blocks[1])
+    )
+
+
+def _decode_fill(data: bytes, blocks: Blocks) -> PcbFill:
+    return PcbFill(*FILL.unpack_from(data, blocks[0][0]))
+
+
+def _decode_shaped(data: bytes, blocks: Blocks, cls=PcbRegion) -> PcbRegion:
+    start, stop = blocks[0]
+    layer, flags = SHAPED.unpack_from(data, start)
+
+    offset = start + SHAPED.size
+    (length,) = _U32.unpack_from(data, offset)
+    offset += _U32.size
+    text = str(data[offset : offset + length], "utf8", "ignore").rstrip("\x00")
+    offset += length
+
+    parameters = {}
+    for item in text.split("|"):
+        key, sep, value = item.partition("=")
+        if sep and key not in parameters:
+            parameters[key] = value
+
+    (count,) = _U32.unpack_from(data, offset)
+    offset += _U32.size
+    if offset + count * _VERTEX.size > stop:
+        raise PrimitiveDecodeError(f"Too many vertices for the shape at {start}")
+
+    vertices = [
+        _VERTEX.unpack_from(data, offset + idx * _VERTEX.size) for idx in range(count)
+    ]
+
+    return cls(layer, flags, parameters, vertices)
+
+
+def _decode_body(data: bytes, blocks: Blocks) -> PcbComponentBody:
+    return _decode_shaped(data, blocks, PcbComponentBody)
+
+
+_DECODERS = {
+    PcbPrimitiveType.ARC: _decode_arc,
+    PcbPrimitiveType.PAD: _decode_pad,
+    PcbPrimitiveType.VIA: _decode_via,
+    PcbPrimitiveType.TRACK: _decode_track,
+    PcbPrimitiveType.TEXT: _decode_text,
+    PcbPrimitiveType.FILL: _decode_fill,
+    PcbPrimitiveType.REGION: _decode_shaped,
+    PcbPrimitiveType.COMPONENT_BODY: _decode_body,
+}
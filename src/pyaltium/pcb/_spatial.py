@@ -0,0 +1,331 @@
+"""_spatial.py
+
+A uniform grid over primitives' bounding boxes, so finding what is near a point,
+a segment or another primitive only looks at a few cells instead of everything.
+
+Boxes are ``(x0, y0, x1, y1)`` rows. The grid gets sized so there's about one box
+per cell, and each box is listed under every cell it touches. Cells are stored
+sorted, so a query reads one slice per row of cells and then does exact checks
+on just those candidates.
+
+Distances are between bounding boxes, which is exact for unrotated rectangular
+pads and a little conservative for everything else.
+"""
+from __future__ import annotations
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+Box = Tuple[float, float, float, float]
+
+
+def pad_boxes(pads: np.ndarray) -> np.ndarray:
+    """Bounding boxes for rows of a ``pads`` table, allowing for rotation."""
+    angle = np.radians(pads["rotation"])
+    cos, sin = np.abs(np.cos(angle)), np.abs(np.sin(angle))
+    size_x = pads["size_x"].astype(np.float64)
+    size_y = pads["size_y"].astype(np.float64)
+    half_x = (cos * size_x + sin * size_y) / 2
+    half_y = (sin * size_x + cos * size_y) / 2
+
+    x, y = pads["x"], pads["y"]
+    return np.stack([x - half_x, y - half_y, x + half_x, y + half_y], axis=1)
+
+
+class SpatialIndex:
+    """Find boxes by location.
+
+    Every query gives indices into the boxes it was built from, in ascending
+    order (nearest first for ``nearest``). ``groups`` optionally says which
+    footprint each box belongs to: queries can be limited to one group, and
+    ``pairs`` never pairs boxes from different groups.
+
+    .. code-block:: python
+
+        index = SpatialIndex.from_pads(lib.primitive_tables()["pads"])
+        close = index.pairs(clearance=0.2 * UNITS_PER_MM)
+    """
+
+    boxes: np.ndarray
+    groups: Optional[np.ndarray]
+    data: Optional[np.ndarray]
+    cell_size: float
+
+    def __init__(
+        self,
+        boxes: np.ndarray,
+        groups: Optional[np.ndarray] = None,
+        data: Optional[np.ndarray] = None,
+        cell_size: Optional[float] = None,
+    ) -> None:
+        """
+        :param boxes: ``(N, 4)`` array of ``x0, y0, x1, y1``
+        :param groups: Optional group (e.g. footprint index) for each box
+        :param data: Whatever the boxes came from, kept as ``data`` so results
+            can index straight into it
+        :param cell_size: Grid spacing, picked from the boxes if not given
+        """
+        self.boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+        self.groups = None if groups is None else np.asarray(groups)
+        self.data = data
+
+        if len(self.boxes):
+            self._origin = self.boxes[:, :2].min(axis=0)
+            extent = self.boxes[:, 2:].max(axis=0) - self._origin
+        else:
+            self._origin = np.zeros(2)
+            extent = np.zeros(2)
+
+        self.cell_size = cell_size or _pick_cell_size(self.boxes, extent)
+        self._shape = tuple(int(n) + 1 for n in extent // self.cell_size)
+
+        keys, ids = self._cell_entries(self.boxes)
+        self._ids = ids
+        self._starts = np.searchsorted(keys, np.arange(self._ncells + 1))
+
+    @classmethod
+    def from_pads(cls, pads: np.ndarray, **kwargs) -> "SpatialIndex":
+        """Index a ``pads`` table, grouped by its ``item`` column."""
+        return cls(pad_boxes(pads), groups=pads["item"], data=pads, **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.boxes)
+
+    def __repr__(self) -> str:
+        return f"<SpatialIndex {len(self)} boxes, {self._shape[0]}x{self._shape[1]}>"
+
+    @property
+    def _ncells(self) -> int:
+        return self._shape[0] * self._shape[1]
+
+    def query_box(self, box: Box, group: Optional[int] = None) -> np.ndarray:
+        """Boxes that overlap or touch ``box``."""
+        cand = self._candidates(box, group)
+        b = self.boxes[cand]
+        hit = (
+            (b[:, 0] <= box[2])
+            & (b[:, 2] >= box[0])
+            & (b[:, 1] <= box[3])
+            & (b[:, 3] >= box[1])
+        )
+        return cand[hit]
+
+    def within(
+        self, x: float, y: float, distance: float, group: Optional[int] = None
+    ) -> np.ndarray:
+        """Boxes no further than ``distance`` from a point."""
+        cand = self._candidates(
+            (x - distance, y - distance, x + distance, y + distance), group
+        )
+        return cand[_point_distance(self.boxes[cand], x, y) <= distance]
+
+    def near_segment(
+        self,
+        start: Tuple[float, float],
+        end: Tuple[float, float],
+        distance: float,
+        group: Optional[int] = None,
+    ) -> np.ndarray:
+        """Boxes no further than ``distance`` from a segment. For a track, add
+        half its width to ``distance``."""
+        (x1, y1), (x2, y2) = start, end
+        query = (
+            min(x1, x2) - distance,
+            min(y1, y2) - distance,
+            max(x1, x2) + distance,
+            max(y1, y2) + distance,
+        )
+        cand = self._candidates(query, group)
+        return cand[_segment_distance(self.boxes[cand], start, end) <= distance]
+
+    def nearest(
+        self, x: float, y: float, k: int = 1, group: Optional[int] = None
+    ) -> np.ndarray:
+        """The ``k`` boxes closest to a point, closest first."""
+        radius = self.cell_size
+        # Once the search square covers everything, there's nothing more to find
+        limit = max(
+            np.abs(self.boxes[:, [0, 2]] - x).max(initial=0),
+            np.abs(self.boxes[:, [1, 3]] - y).max(initial=0),
+        )
+
+        while True:
+            cand = self._candidates(
+                (x - radius, y - radius, x + radius, y + radius), group
+            )
+            dist = _point_distance(self.boxes[cand], x, y)
+            # Anything closer than ``radius`` is definitely a candidate
+            found = dist <= radius
+            if found.sum() >= k or radius >= limit:
+                break
+            radius *= 2
+
+        if radius < limit:
+            cand, dist = cand[found], dist[found]
+        order = np.lexsort((cand, dist))[:k]
+        return cand[order]
+
+    def pairs(self, clearance: float = 0.0) -> np.ndarray:
+        """``(M, 2)`` array of boxes closer together than ``clearance``, or that
+        overlap if ``clearance`` is 0. Each pair is listed once, lowest first."""
+        pad = clearance / 2
+        keys, ids = self._cell_entries(self.boxes + [-pad, -pad, pad, pad])
+        if self.groups is not None:
+            # Give each group its own copy of the grid, so footprints stacked on
+            # top of each other don't make candidates that just get thrown away
+            codes = np.unique(self.groups, return_inverse=True)[1].ravel()
+            keys = codes[ids].astype(np.int64) * self._ncells + keys
+            order = np.argsort(keys, kind="stable")
+            keys, ids = keys[order], ids[order]
+
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        counts = np.diff(np.r_[starts, len(keys)])
+
+        firsts, seconds = [], []
+        for count in np.unique(counts[counts > 1]):
+            # Every pair within each cell holding ``count`` boxes, all at once
+            cells = starts[counts == count]
+            i, j = np.triu_indices(count, 1)
+            firsts.append(ids[(cells[:, None] + i).ravel()])
+            seconds.append(ids[(cells[:, None] + j).ravel()])
+
+        if not firsts:
+            return np.empty((0, 2), dtype=np.intp)
+
+        a, b = np.concatenate(firsts), np.concatenate(seconds)
+        a, b = np.minimum(a, b), np.maximum(a, b)
+        # Boxes that share several cells come up more than once
+        unique = np.unique(a.astype(np.int64) * len(self) + b)
+        a, b = unique // len(self), unique % len(self)
+
+        gap_x = np.maximum(self.boxes[a, 0], self.boxes[b, 0]) - np.minimum(
+            self.boxes[a, 2], self.boxes[b, 2]
+        )
+        gap_y = np.maximum(self.boxes[a, 1], self.boxes[b, 1]) - np.minimum(
+            self.boxes[a, 3], self.boxes[b, 3]
+        )
+        close = (gap_x < 0) & (gap_y < 0)
+        if clearance > 0:
+            close |= np.hypot(np.maximum(gap_x, 0), np.maximum(gap_y, 0)) < clearance
+
+        return np.stack([a[close], b[close]], axis=1).astype(np.intp)
+
+    def _cell_range(self, boxes: np.ndarray) -> Tuple[np.ndarray, ...]:
+        """First and last cell in x and y for each box, clipped to the grid."""
+        cells = np.floor((boxes - np.tile(self._origin, 2)) / self.cell_size)
+        cells = cells.astype(np.int64)
+        nx, ny = self._shape
+        return (
+            np.clip(cells[:, 0], 0, nx - 1),
+            np.clip(cells[:, 1], 0, ny - 1),
+            np.clip(cells[:, 2], 0, nx - 1),
+            np.clip(cells[:, 3], 0, ny - 1),
+        )
+
+    def _cell_entries(self, boxes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Sorted cell keys and the box in each, one entry per cell a box touches."""
+        ix0, iy0, ix1, iy1 = self._cell_range(boxes)
+        span_y = iy1 - iy0 + 1
+        counts = (ix1 - ix0 + 1) * span_y
+
+        ids = np.repeat(np.arange(len(boxes)), counts)
+        # Position of each entry within its box's block of cells
+        local = np.arange(len(ids)) - np.repeat(np.cumsum(counts) - counts, counts)
+        keys = (ix0[ids] + local // span_y[ids]) * self._shape[1] + (
+            iy0[ids] + local % span_y[ids]
+        )
+
+        order = np.argsort(keys, kind="stable")
+        return keys[order], ids[order]
+
+    def _candidates(self, box: Box, group: Optional[int]) -> np.ndarray:
+        """Boxes listed in any cell ``box`` touches, without repeats."""
+        if not len(self):
+            return np.empty(0, dtype=np.intp)
+
+        # Plain floats, NumPy's overhead is most of the time for a single box
+        nx, ny = self._shape
+        ox, oy = self._origin.tolist()
+        size = self.cell_size
+        ix0 = min(max(int((box[0] - ox) // size), 0), nx - 1)
+        iy0 = min(max(int((box[1] - oy) // size), 0), ny - 1)
+        ix1 = min(max(int((box[2] - ox) // size), 0), nx - 1)
+        iy1 = min(max(int((box[3] - oy) // size), 0), ny - 1)
+
+        rows = [
+            self._ids[self._starts[ix * ny + iy0] : self._starts[ix * ny + iy1 + 1]]
+            for ix in range(ix0, ix1 + 1)
+        ]
+        if len(rows) == 1 and iy0 == iy1:
+            cand = rows[0]
+        else:
+            cand = np.unique(np.concatenate(rows))
+
+        if group is not None and self.groups is not None:
+            cand = cand[self.groups[cand] == group]
+        return cand
+
+
+def _pick_cell_size(boxes: np.ndarray, extent: np.ndarray) -> float:
+    """About one box per cell, but no smaller than a typical box."""
+    if not len(boxes):
+        return 1.0
+
+    typical = np.median(
+        np.maximum(boxes[:, 2] - boxes[:, 0], boxes[:, 3] - boxes[:, 1])
+    )
+    area = extent[0] * extent[1]
+    if area > 0:
+        spread = np.sqrt(area / len(boxes))
+    else:
+        spread = extent.max() / len(boxes)
+
+    return float(max(typical, spread, 1.0))
+
+
+def _point_distance(boxes: np.ndarray, x: float, y: float) -> np.ndarray:
+    dx = np.maximum(np.maximum(boxes[:, 0] - x, x - boxes[:, 2]), 0)
+    dy = np.maximum(np.maximum(boxes[:, 1] - y, y - boxes[:, 3]), 0)
+    return np.hypot(dx, dy)
+
+
+def _segment_distance(
+    boxes: np.ndarray, start: Tuple[float, float], end: Tuple[float, float]
+) -> np.ndarray:
+    (x1, y1), (x2, y2) = start, end
+    corners = [
+        (boxes[:, 0], boxes[:, 1]),
+        (boxes[:, 2], boxes[:, 1]),
+        (boxes[:, 2], boxes[:, 3]),
+        (boxes[:, 0], boxes[:, 3]),
+    ]
+
+    # A segment crosses a box if their bounds overlap and the box has corners
+    # on both sides of (or on) the segment's line
+    sides = np.stack(
+        [(x2 - x1) * (cy - y1) - (y2 - y1) * (cx - x1) for cx, cy in corners]
+    )
+    crosses = (
+        (boxes[:, 0] <= max(x1, x2))
+        & (boxes[:, 2] >= min(x1, x2))
+        & (boxes[:, 1] <= max(y1, y2))
+        & (boxes[:, 3] >= min(y1, y2))
+        & ~((sides > 0).all(axis=0) | (sides < 0).all(axis=0))
+    )
+
+    # Otherwise the closest points are a segment end or a box corner
+    length_sq = (x2 - x1) ** 2 + (y2 - y1) ** 2
+    dist = np.minimum(_point_distance(boxes, x1, y1), _point_distance(boxes, x2, y2))
+    for cx, cy in corners:
+        if length_sq:
+            t = np.clip(
+                ((cx - x1) * (x2 - x1) + (cy - y1) * (y2 - y1)) / length_sq, 0, 1
+            )
+        else:
+            t = 0
+        dist = np.minimum(
+            dist, np.hypot(cx - (x1 + t * (x2 - x1)), cy - (y1 + t * (y2 - y1)))
+        )
+
+    return np.where(crosses, 0.0, dist)
@@ -0,0 +1,236 @@
+"""_tables.py
+
+The pads, vias, tracks, arcs and fills of a whole library as NumPy structured
+arrays, one per type, without making an object per primitive.
+
+Each primitive's blocks still get found one at a time, but then every block of a
+type gets copied out together and read through a dtype that matches its layout.
+"""
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from pyaltium.exceptions import PrimitiveDecodeError
+from pyaltium.pcb._record import (
+    PAD_GEOMETRY_BLOCK,
+    PAD_LAYERS_BLOCK,
+    PcbLayer,
+    PcbPrimitiveType,
+    iter_blocks,
+    pad_shape,
+)
+from pyaltium.sch._tokenizer import Buffer
+
+# Every block starts with these, see _record.py
+_COMMON = [("layer", "u1"), ("flags", "<u2"), ("", "V10")]
+
+# Raw layouts, these match the structs in _record.py
+_RAW_DTYPES = {
+    PcbPrimitiveType.ARC: np.dtype(
+        _COMMON
+        + [
+            ("x", "<i4"),
+            ("y", "<i4"),
+            ("radius", "<i4"),
+            ("start_angle", "<f8"),
+            ("end_angle", "<f8"),
+            ("width", "<i4"),
+        ]
+    ),
+    PcbPrimitiveType.PAD: np.dtype(
+        _COMMON
+        + [
+            ("x", "<i4"),
+            ("y", "<i4"),
+            ("sizes", "<i4", (3, 2)),
+            ("hole", "<i4"),
+            ("shapes", "u1", 3),
+            ("rotation", "<f8"),
+            ("plated", "?"),
+        ]
+    ),
+    PcbPrimitiveType.VIA: np.dtype(
+        _COMMON + [("x", "<i4"), ("y", "<i4"), ("diameter", "<i4"), ("hole", "<i4")]
+    ),
+    PcbPrimitiveType.TRACK: np.dtype(
+        _COMMON
+        + [
+            ("x1", "<i4"),
+            ("y1", "<i4"),
+            ("x2", "<i4"),
+            ("y2", "<i4"),
+            ("width", "<i4"),
+        ]
+    ),
+    PcbPrimitiveType.FILL: np.dtype(
+        _COMMON
+        + [
+            ("x1", "<i4"),
+            ("y1", "<i4"),
+            ("x2", "<i4"),
+            ("y2", "<i4"),
+            ("rotation", "<f8"),
+        ]
+    ),
+}
+
+# ``item`` is the index of the stream a primitive came from
+PAD_DTYPE = np.dtype(
+    [
+        ("item", np.int32),
+        ("layer", np.uint8),
+        ("x", np.int32),
+        ("y", np.int32),
+        ("size_x", np.int32),
+        ("size_y", np.int32),
+        ("shape", np.uint8),
+        ("corner_radius", np.uint8),
+        ("hole", np.int32),
+        ("rotation", np.float64),
+        ("plated", np.bool_),
+        ("designator", object),
+    ]
+)
+VIA_DTYPE = np.dtype(
+    [
+        ("item", np.int32),
+        ("layer", np.uint8),
+        ("x", np.int32),
+        ("y", np.int32),
+        ("diameter", np.int32),
+        ("hole", np.int32),
+    ]
+)
+TRACK_DTYPE = np.dtype(
+    [
+        ("item", np.int32),
+        ("layer", np.uint8),
+        ("x1", np.int32),
+        ("y1", np.int32),
+        ("x2", np.int32),
+        ("y2", np.int32),
+        ("width", np.int32),
+    ]
+)
+ARC_DTYPE = np.dtype(
+    [
+        ("item", np.int32),
+        ("layer", np.uint8),
+        ("x", np.int32),
+        ("y", np.int32),
+        ("radius", np.int32),
+        ("start_angle", np.float64),
+        ("end_angle", np.float64),
+        ("width", np.int32),
+    ]
+)
+FILL_DTYPE = np.dtype(
+    [
+        ("item", np.int32),
+        ("layer", np.uint8),
+        ("x1", np.int32),
+        ("y1", np.int32),
+        ("x2", np.int32),
+        ("y2", np.int32),
+        ("rotation", np.float64),
+    ]
+)
+
+TABLE_DTYPES = {
+    "pads": (PcbPrimitiveType.PAD, PAD_DTYPE),
+    "vias": (PcbPrimitiveType.VIA, VIA_DTYPE),
+    "tracks": (PcbPrimitiveType.TRACK, TRACK_DTYPE),
+    "arcs": (PcbPrimitiveType.ARC, ARC_DTYPE),
+    "fills": (PcbPrimitiveType.FILL, FILL_DTYPE),
+}
+
+
+def primitive_tables(streams: Iterable[Buffer]) -> Dict[str, np.ndarray]:
+    """Build ``pads``, ``vias``, ``tracks``, ``arcs`` and ``fills`` tables for
+    the ``Data`` streams of a library's footprints.
+
+    Units are the same as the primitives', 10000 per mil. Pad sizes and shapes
+    are the ones on the pad's own layer (the top for through hole pads).
+    Designators are interned, so repeated ones are the same object.
+    """
+    chunks: Dict[int, List[bytes]] = {ptype: [] for ptype, _ in TABLE_DTYPES.values()}
+    items: Dict[int, List[int]] = {ptype: [] for ptype in chunks}
+    # Designator and layer block for each pad
+    pad_extras: List[Tuple[str, bytes]] = []
+    interned: Dict[bytes, str] = {}
+
+    for item_idx, data in enumerate(streams):
+        data = bytes(data)
+
+        for ptype, blocks in iter_blocks(data):
+            if ptype not in chunks:
+                continue
+
+            size = _RAW_DTYPES[ptype].itemsize
+            if ptype == PcbPrimitiveType.PAD:
+                start, stop = blocks[PAD_GEOMETRY_BLOCK]
+                pad_extras.append(
+                    (
+                        _designator(data, blocks[0], interned),
+                        data[slice(*blocks[PAD_LAYERS_BLOCK])],
+                    )
+                )
+            else:
+                start, stop = blocks[0]
+
+            if stop - start < size:
+                raise PrimitiveDecodeError(
+                    f"{PcbPrimitiveType(ptype).name.lower()} in item {item_idx} "
+                    "is truncated"
+                )
+
+            chunks[ptype].append(data[start : start + size])
+            items[ptype].append(item_idx)
+
+    tables = {}
+    for name, (ptype, dtype) in TABLE_DTYPES.items():
+        raw = np.frombuffer(b"".join(chunks[ptype]), dtype=_RAW_DTYPES[ptype])
+        table = np.empty(len(raw), dtype=dtype)
+        table["item"] = items[ptype]
+
+        for col in dtype.names:
+            if col in raw.dtype.names:
+                table[col] = raw[col]
+
+        if ptype == PcbPrimitiveType.PAD:
+            _fill_pads(table, raw, pad_extras)
+        tables[name] = table
+
+    return tables
+
+
+def _fill_pads(
+    table: np.ndarray, raw: np.ndarray, extras: List[Tuple[str, bytes]]
+) -> None:
+    """Pick each pad's size and shape, and add what isn't in its geometry."""
+    bottom = raw["layer"] == PcbLayer.BOTTOM
+    # Top layer size and shape, unless the pad is only on the bottom
+    table["size_x"] = np.where(bottom, raw["sizes"][:, 2, 0], raw["sizes"][:, 0, 0])
+    table["size_y"] = np.where(bottom, raw["sizes"][:, 2, 1], raw["sizes"][:, 0, 1])
+    table["shape"] = np.where(bottom, raw["shapes"][:, 2], raw["shapes"][:, 0])
+    table["corner_radius"] = 0
+
+    for idx, (designator, layers) in enumerate(extras):
+        table["designator"][idx] = designator
+        if layers:
+            shape, radius = pad_shape(
+                layers, (0, len(layers)), int(raw["layer"][idx]), table["shape"][idx]
+            )
+            table["shape"][idx] = shape
+            table["corner_radius"][idx] = radius
+
+
+def _designator(data: bytes, block: Tuple[int, int], interned: Dict[bytes, str]) -> str:
+    start, stop = block
+    raw = data[start + 1 : min(stop, start + 1 + data[start])] if start < stop else b""
+    s = interned.get(raw)
+    if s is None:
+        s = interned[raw] = str(raw, "utf8", "ignore")
+    return s
@@ -1,7 +1,8 @@
+import struct
 from enum import IntEnum, unique
 from typing import Dict, List, Tuple, Union
 
-from pyaltium._helpers import byte_arr_str
+from pyaltium.exceptions import PinDecodeError
 
 
 @unique
@@ -62,49 +63,97 @@ PinRecType = Dict[str, Union[bytes, int, SchLibItemRecordType]]
 
 _rotations = {0: 0, 1: 90, 2: 180, 3: 270}
 
+# Enum lookups by value are slow, so look pin types up here instead
+_pin_types = {t.value: t for t in SchPinType}
 
-def pinstr_worker(s_in: bytes) -> Tuple[PinRecType, str]:
+# Everything between the description and the name: formal type, electrical type,
+# rotation & hide flags, length, x, y, color
+_PIN_BODY = struct.Struct("<BBBHhhI")
 
-    record: PinRecType = {}
+# Preamble before the description when pins are cut out of a text record: a null,
+# the 4 byte frame header, then 12 bytes we don't use yet
+_PIN_PREFIX_LEN = 17
+
+# Nothing shorter than this can be a pin: a 12 byte preamble, an empty description,
+# the body, and four more empty strings
+MIN_PIN_LEN = 12 + 1 + _PIN_BODY.size + 4
+
+
+def _read_pstr(buf: bytes, offset: int) -> Tuple[str, int]:
+    """Read a string prefixed with a 1 byte length, returning it and the new offset."""
+    if offset >= len(buf):
+        raise PinDecodeError(f"Pin string starts past the end of the data ({offset})")
+
+    end = offset + 1 + buf[offset]
+    if end > len(buf):
+        raise PinDecodeError(f"Pin string at {offset} runs past the end of the data")
 
-    # Trim beginning of string
-    s = s_in[17:]
-    description, s = byte_arr_str(s)
+    return str(buf[offset + 1 : end], "utf8", "ignore"), end
+
+
+def decode_pin(buf: bytes, offset: int) -> Tuple[PinRecType, int]:
+    """Decode one pin, starting at its description length.
+
+    Returns the pin and the offset just past it. This either moves forward or
+    raises a ``PinDecodeError``, it never gives back the offset it was called with.
+    """
+    record: PinRecType = {}
 
+    description, offset = _read_pstr(buf, offset)
     if description:
         record["Description"] = description
 
-    record["PinType"] = SchPinType(int.from_bytes(s[1:2], "little"))
+    if offset + _PIN_BODY.size > len(buf):
+        raise PinDecodeError(f"Pin at {offset} is truncated")
+
+    _, pintype, rot_hide, length, loc_x, loc_y, _ = _PIN_BODY.unpack_from(buf, offset)
+    offset += _PIN_BODY.size
+
+    try:
+        record["PinType"] = _pin_types[pintype]
+    except KeyError as e:
+        raise PinDecodeError(f"Unknown pin type {pintype}") from e
 
-    rot_hide = int.from_bytes(s[2:3], "little")
     record["Rotation"] = _rotations[rot_hide & 0x03]
     record["Hide_Designator"] = bool(rot_hide & 0x08)
     record["Hide_Name"] = bool(rot_hide & 0x10)
+    record["PinLength"] = length * 10
+    record["Location.X"] = loc_x
+    record["Location.Y"] = loc_y
+
+    record["Name"], offset = _read_pstr(buf, offset)
+    record["Designator"], offset = _read_pstr(buf, offset)
+
+    # Two more strings we don't use, usually "" and "|&|"
+    _, offset = _read_pstr(buf, offset)
+    _, offset = _read_pstr(buf, offset)
 
-    record["PinLength"] = int.from_bytes(s[3:5], "little") * 10
-    record["Location.X"] = int.from_bytes(s[5:7], "little", signed=True)
-    record["Location.Y"] = int.from_bytes(s[7:9], "little", signed=True)
+    return record, offset
 
-    s = s[13:]
-    record["Name"], s = byte_arr_str(s)
-    record["Designator"], s = byte_arr_str(s)
-    s = s[5:]
-    return record, s
+
+def pinstr_worker(s_in: bytes, start: int = _PIN_PREFIX_LEN) -> Tuple[PinRecType, str]:
+    """Decode a single pin, returning it and whatever is left after it.
+
+    ``start`` is where the description length is. The default skips the null and
+    frame header that come first when the pin is cut out of a text record; a bare
+    binary record payload starts at 12.
+    """
+    record, offset = decode_pin(s_in, start)
+    return record, s_in[offset:]
 
 
 def pinstr_to_records(s: bytes) -> List[PinRecType]:
-    """Actually take a pin string and turn it into usable records."""
-    records: List[PinRecType] = []
+    """Actually take a pin string and turn it into usable records.
 
-    while True:
-        try:
-            if not len(s) > 10:
-                break
+    Every pin moves us forward by at least ``MIN_PIN_LEN`` bytes, so this is linear
+    in the length of ``s``. Anything malformed raises ``PinDecodeError``.
+    """
+    records: List[PinRecType] = []
+    offset = 0
 
-            record, s = pinstr_worker(s)
-            record["RECORD"] = SchLibItemRecordType.PIN
-            records.append(record)
-        except IndexError:
-            pass
+    while len(s) - offset > 10:
+        record, offset = decode_pin(s, offset + _PIN_PREFIX_LEN)
+        record["RECORD"] = SchLibItemRecordType.PIN
+        records.append(record)
 
     return records
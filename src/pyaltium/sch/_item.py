@@ -1,11 +1,70 @@
+import hashlib
+import re
+from typing import IO, List, Optional
+
 import matplotlib.pyplot as plt
 
-from pyaltium.base import AltiumLibItemMixin
+from pyaltium.base import AltiumLibItemMixin, OleSession, stream_fingerprint
+from pyaltium.sch._pintext import LazyPinText
 from pyaltium.sch._record import (
     SchLibItemRecord,
+    SLIRPin,
+    draw_records,
+    get_lazy_records,
     get_sch_lib_item_record,
     handle_pin_records,
 )
+from pyaltium.sch._svg import render_svg
+from pyaltium.sch._tokenizer import BINARY_RECORD, Buffer, frame_spans, split_records
+
+# Parameters that differ between copies of the same record: IDs given out when a
+# record gets made, and its position in the stream
+_VOLATILE_KEYS = frozenset((b"uniqueid", b"indexinsheet"))
+_VOLATILE_RE = re.compile(rb"\|(?:UniqueID|IndexInSheet)=[^|\x00]*", re.IGNORECASE)
+
+
+def decode_records(data: Buffer, lazy: bool = False) -> List[SchLibItemRecord]:
+    """Turn the contents of a ``Data`` stream into records.
+
+    This doesn't touch the file, so it can be handed off to an executor. With
+    ``lazy``, records only get parsed once they are used.
+    """
+    if lazy and (records := get_lazy_records(data)) is not None:
+        return records
+
+    record_params_list = split_records(data)
+    record_params_list = handle_pin_records(record_params_list)
+
+    return [get_sch_lib_item_record(rp) for rp in record_params_list]
+
+
+def canonical_fingerprint(data: Buffer) -> bytes:
+    """Hash a ``Data`` stream's records, ignoring their order and volatile keys."""
+    data = bytes(data)
+    spans = frame_spans(data)
+
+    if spans is not None:
+        strip = _VOLATILE_RE.sub
+        records = [
+            data[start:stop] if rtype == BINARY_RECORD else strip(b"", data[start:stop])
+            for rtype, start, stop in spans
+        ]
+    else:
+        records = [
+            b"|".join(
+                key + b"=" + bytes(val)
+                for key, val in rec.items()
+                if key.lower() not in _VOLATILE_KEYS
+            )
+            for rec in split_records(data)
+        ]
+
+    h = hashlib.blake2b(digest_size=16)
+    for rec in sorted(records):
+        # Length prefixed so records can't run together
+        h.update(len(rec).to_bytes(4, "little"))
+        h.update(rec)
+    return h.digest()
 
 
 class SchLibItem(AltiumLibItemMixin[SchLibItemRecord]):
@@ -20,7 +79,9 @@ class SchLibItem(AltiumLibItemMixin[SchLibItemRecord]):
     description: str
     partcount: int
     lazyload: bool
+    lazy_records: bool
     file_name: str
+    _pin_text: Optional[LazyPinText]
 
     def __init__(
         self,
@@ -30,53 +91,82 @@ class SchLibItem(AltiumLibItemMixin[SchLibItemRecord]):
         partcount: int,
         file_name: str,
         lazyload: bool = False,
+        session: OleSession = None,
+        lazy_records: bool = False,
     ) -> None:
-        super().__init__()
+        super().__init__(session=session)
         self.libref = libref
         self.sectionkey = sectionkey
         self.description = description
         self.partcount = partcount
         self.lazyload = lazyload
+        self.lazy_records = lazy_records
         self.file_name = file_name
+        self._pin_text = None
 
         if not self.lazyload:
             self._load_data()
 
     def _load_data(self) -> None:
         """Load this item's data to a list of SchLibItem records."""
-        # pin_text_data = self._read_decode_stream(
-        #     (self.sectionkey, "PinTextData"), decode=False
-        # )
-        data = self._read_decode_stream((self.sectionkey, "Data"), decode=False)
-
-        # Remove everything before the first "|RECORD"
-        while not data.startswith(b"|RECORD"):
-            data = data[1:]
-
-        # Split into records
-        records = [b"|RECORD" + d for d in data.split(b"|RECORD")[1:]]
-
-        # Split these into their parameters. We need to temporarily escape the
-        # |&| that is sometimes used.
-        record_params_list: list[dict] = [
-            dict(
-                split
-                for s in rec.replace(b"|&|", b"&&&&").split(b"|")[1:]
-                if len(split := s.replace(b"&&&&", b"|&|").split(b"=", 1)) == 2
-            )
-            for rec in records
-        ]
+        data = self._read_data()
+        self._fingerprint = stream_fingerprint(data)
+        self._set_records(decode_records(data, lazy=self.lazy_records))
+
+    def _set_records(self, records: List[SchLibItemRecord]) -> None:
+        """Keep decoded records, and let pins find their overridden text."""
+        self._pin_text = LazyPinText(self)
+        pins = (rec for rec in records if isinstance(rec, SLIRPin))
+
+        for idx, pin in enumerate(pins):
+            pin._pin_text = self._pin_text
+            pin._pin_index = idx
+
+        self._records = records
+
+    def fingerprint(self) -> bytes:
+        return stream_fingerprint(self._read_data())
 
-        record_params_list = handle_pin_records(record_params_list)
+    def data_fingerprint(self) -> bytes:
+        # Data is the only stream we fingerprint, so a loaded one can be reused
+        return self._fingerprint or self.fingerprint()
 
-        self._records = [get_sch_lib_item_record(rp) for rp in record_params_list]
-        pass
+    def canonical_fingerprint(self) -> bytes:
+        return canonical_fingerprint(self._read_data())
+
+    def _read_data(self) -> Buffer:
+        """Read the raw ``Data`` stream for this item."""
+        return self._read_decode_stream((self.sectionkey, "Data"), decode=False)
+
+    def _read_pin_text_data(self) -> Buffer:
+        """Read the raw ``PinTextData`` stream, which not every item has."""
+        return self._read_decode_stream((self.sectionkey, "PinTextData"), decode=False)
+
+    def _release(self) -> None:
+        super()._release()
+        self._pin_text = None
+
+    def _reloaded(self) -> None:
+        # Data didn't change, but pin text might have
+        if self._pin_text is not None:
+            self._pin_text.clear()
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        if self._pin_text is not None:
+            self._pin_text._item = self
 
     def draw(self, ax: plt.Axes) -> None:
         """Create the drawing on the axes"""
-        part_display_mode = 1
-        for record in self.records:
-            record.draw(ax=ax, part_display_mode=part_display_mode)
+        draw_records(ax, self.records, part_display_mode=1)
+
+    def get_svg(self, out: Optional[IO] = None) -> Optional[bytes]:
+        """Draw this symbol as an SVG, without going through matplotlib.
+
+        :param out: Stream to write to. If not given, the SVG gets returned as
+            bytes instead
+        """
+        return render_svg(self.records, out)
 
     def as_dict(self) -> dict:
         """Create a parsable dict."""
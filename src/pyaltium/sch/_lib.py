@@ -1,70 +1,195 @@
-from pyaltium._helpers import (
-    altium_string_split,
-    altium_value_from_key,
-    sch_sectionkeys_to_dict,
-)
-from pyaltium.base import AltiumLibMixin, Magic
-from pyaltium.sch._item import SchLibItem
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Iterator, List, Union
+
+import numpy as np
+
+from pyaltium._cache import SnapshotCache
+from pyaltium._header import FileHeader, HeaderFont
+from pyaltium.base import AltiumLibMixin, Magic, stream_fingerprint
+from pyaltium.sch._item import SchLibItem, decode_records
+from pyaltium.sch._pintable import pin_table
+from pyaltium.sch._render import DEFAULT_DPI, RenderResult, render_all
 
 
 class SchLib(AltiumLibMixin[SchLibItem]):
     """Main object to interact with schematic libraries."""
 
-    def __init__(self, file_name: str = None, lazyload: bool = False) -> None:
+    workers: int
+    lazy_records: bool
+
+    def __init__(
+        self,
+        file_name: str = None,
+        lazyload: bool = False,
+        use_mmap: bool = False,
+        workers: int = 0,
+        lazy_records: bool = False,
+        cache: Union[str, SnapshotCache] = None,
+    ) -> None:
         """A schematic library representation.
 
         :param file_name: [description], defaults to None
         :type file_name: str, optional
-        :param lazyload: [description], defaults to False
+        :param lazyload: Only list items when opening, and parse each item's
+            records the first time they are accessed, defaults to False
         :type lazyload: bool, optional
+        :param use_mmap: Memory map the file while it is open and parse streams
+            in place, defaults to False
+        :type use_mmap: bool, optional
+        :param workers: Decode items on a pool of this many threads, see
+            ``load_all``. Ignored with lazyload, defaults to 0 (no pool)
+        :type workers: int, optional
+        :param lazy_records: Only find where each record is when loading an item,
+            and parse a record the first time one of its fields is used, defaults
+            to False
+        :type lazy_records: bool, optional
+        :param cache: Snapshot cache (or a directory for one) to restore from
+            instead of parsing, and to save to after parsing, defaults to None
+        :type cache: Union[str, SnapshotCache], optional
         """
-        super().__init__(file_name=file_name, lazyload=lazyload)
+        self.workers = workers
+        self.lazy_records = lazy_records
+        super().__init__(
+            file_name=file_name, lazyload=lazyload, use_mmap=use_mmap, cache=cache
+        )
 
     def _verify_file_type(self, fname: str) -> bool:
         """Check if our magic string is in the header."""
         fh_str = self._read_decode_stream("FileHeader", 128)
         return Magic.SCHLIB_HEADER in fh_str
 
+    @property
+    def fonts(self) -> List[HeaderFont]:
+        """Fonts used in this library, from the file header."""
+        return self.header.fonts()
+
+    def pin_table(self) -> np.ndarray:
+        """Every pin in the library as one NumPy structured array.
+
+        There is a row per pin, and ``item`` is the index of its item in
+        ``items_list``. See ``PIN_DTYPE`` for the other columns. Pins get read
+        straight from the file, so this works the same whether or not items have
+        been loaded. Checking that every pin is on a 100 mil grid is just:
+
+        .. code-block:: python
+
+            pins = lib.pin_table()
+            off_grid = pins[(pins["x"] % 10 != 0) | (pins["y"] % 10 != 0)]
+        """
+        with self._keep_open():
+            streams = [item._read_data() for item in self.items_list]
+
+        return pin_table(streams)
+
+    def render_all(
+        self, out_dir: str, fmt: str = "png", jobs: int = None, dpi: int = DEFAULT_DPI
+    ) -> List[RenderResult]:
+        """Render every symbol to ``out_dir``, on a pool of worker processes.
+
+        Files are named by a hash of the symbol's contents (``RenderResult.key``),
+        so symbols that were already rendered to the same directory get skipped,
+        even if they came from another library. The results are a manifest of what
+        went where, in header order, with how long each symbol took.
+
+        :param out_dir: Directory to write to, made if it doesn't exist
+        :param fmt: Any format matplotlib can save, defaults to ``"png"``
+        :param jobs: Number of worker processes. ``1`` renders in this process,
+            defaults to the number of CPUs
+        :param dpi: Resolution for raster formats, defaults to 150
+        """
+        with self._keep_open():
+            streams = [bytes(item._read_data()) for item in self.items_list]
+
+        items = [(item.libref, data) for item, data in zip(self.items_list, streams)]
+        return render_all(items, out_dir, fmt=fmt, jobs=jobs, dpi=dpi)
+
     def _update_header_and_section_keys(self) -> None:
-        """Just update class's _header_keys_list object."""
+        """Just update class's header and section_keys objects."""
         fh_str = self._read_decode_stream("FileHeader")
         sk_str = self._read_decode_stream("SectionKeys")
 
-        self._header_keys_list = altium_string_split(fh_str)
-        self._section_keys_list = altium_string_split(sk_str)
+        self.header = FileHeader(fh_str)
+        self.section_keys = FileHeader(sk_str)
+
+    def _snapshot_options(self) -> tuple:
+        return super()._snapshot_options() + (self.lazy_records,)
 
     def _update_item_list(self) -> None:
-        """Override main class, just update the list of items in the library.
+        super()._update_item_list()
+
+        if self.workers > 0 and not self.lazyload:
+            self._load_pending()
+
+    def _iter_new_items(self) -> Iterator[SchLibItem]:
+        """Override main class, make the items in the library.
 
         Most of this information is kept in the file header. However, we need
         to get some information from sectionkeys if names got truncated in the header.
         """
-        d = self._header_keys_list
-
-        # Get the component count so we know what to look for
-        item_count = int(altium_value_from_key(d, "CompCount"))
-
-        self.items_list = []
-
-        sec_keys = sch_sectionkeys_to_dict(self._section_keys_list)
+        sec_keys = self.section_keys.section_keys()
 
         # Loop through each item listed in the fileheader
-        for i in range(item_count):
-            libref = altium_value_from_key(d, f"LibRef{i}")
-            description = altium_value_from_key(d, f"CompDescr{i}")
-            partcount = int(altium_value_from_key(d, f"PartCount{i}")) - 1
+        for comp in self.header.iter_components():
+            libref = comp.libref
 
             if libref in sec_keys:
                 sectionkey = sec_keys[libref]
             else:
                 sectionkey = libref
 
-            self.items_list.append(
-                SchLibItem(
-                    libref=libref,
-                    description=description,
-                    partcount=partcount,
-                    sectionkey=sectionkey,
-                    file_name=self.file_name,
-                )
+            yield SchLibItem(
+                libref=libref,
+                description=comp.description,
+                partcount=comp.partcount - 1,
+                sectionkey=sectionkey,
+                file_name=self.file_name,
+                lazyload=self.lazyload or self.workers > 0,
+                session=self._session,
+                lazy_records=self.lazy_records,
             )
+
+    def _load_pending(self) -> None:
+        if self.workers > 0:
+            with ThreadPoolExecutor(self.workers) as executor:
+                self.load_all(executor)
+            return
+
+        for item in self.items_list:
+            if item._records is None:
+                item._load_data()
+
+    def load_all(self, executor: Executor = None) -> List[SchLibItem]:
+        """Load every item that isn't loaded yet, decoding them on an executor.
+
+        Streams get read one after another from the shared file handle, only the
+        decoding happens on the executor. Threads overlap well with other I/O but
+        are still bound by the GIL, pass a ``ProcessPoolExecutor`` to spread
+        decoding over several cores. Items come back in header order.
+
+        :param executor: Where to run decoding, defaults to a temporary
+            ``ThreadPoolExecutor`` with ``workers`` threads
+        :type executor: Executor, optional
+        """
+        if executor is None:
+            with ThreadPoolExecutor(self.workers or None) as executor:
+                return self.load_all(executor)
+
+        pending = [item for item in self.items_list if item._records is None]
+        if not pending:
+            return self.items_list
+
+        with self._keep_open():
+            streams = [item._read_data() for item in pending]
+
+        if isinstance(executor, ProcessPoolExecutor):
+            # Views of the file can't be pickled
+            streams = [bytes(data) for data in streams]
+
+        decode = partial(decode_records, lazy=self.lazy_records)
+
+        for item, data, records in zip(pending, streams, executor.map(decode, streams)):
+            item._fingerprint = stream_fingerprint(data)
+            item._set_records(records)
+
+        return self.items_list
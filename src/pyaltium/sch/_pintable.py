@@ -0,0 +1,164 @@
+"""_pintable.py
+
+Every pin of a library in one NumPy structured array, read straight out of the
+binary pin records without making an object per pin.
+"""
+from __future__ import annotations
+
+from typing import Dict, Iterable
+
+import numpy as np
+
+from pyaltium.exceptions import PinDecodeError
+from pyaltium.sch._helpers import SchLibItemRecordType
+from pyaltium.sch._record import handle_pin_records
+from pyaltium.sch._tokenizer import BINARY_RECORD, Buffer, frame_spans, split_records
+
+# Positions and lengths are in the same units as the pins' Location.X/Y and
+# PinLength parameters
+PIN_DTYPE = np.dtype(
+    [
+        ("item", np.int32),
+        ("owner_part_id", np.int16),
+        ("display_mode", np.uint8),
+        ("x", np.int32),
+        ("y", np.int32),
+        ("length", np.int32),
+        ("rotation", np.int16),
+        ("pin_type", np.uint8),
+        ("formal_type", np.uint8),
+        ("hide_name", np.bool_),
+        ("hide_designator", np.bool_),
+        ("name", object),
+        ("designator", object),
+    ]
+)
+
+# Where things are in a binary pin record, relative to its payload
+_OWNER_PART_ID = 5
+_DISPLAY_MODE = 7
+_DESCRIPTION = 12
+# Relative to the end of the description: formal type, electrical type,
+# rotation & hide flags, length, x, y, color, then the name
+_FORMAL_TYPE = 0
+_PIN_TYPE = 1
+_ROT_HIDE = 2
+_LENGTH = 3
+_LOC_X = 5
+_LOC_Y = 7
+_NAME = 13
+
+
+def pin_table(streams: Iterable[Buffer]) -> np.ndarray:
+    """Build the pin table for the ``Data`` streams of a library's items.
+
+    ``item`` is the index of the stream a pin came from. Names and designators
+    are interned, so repeated ones are the same object.
+    """
+    interned: Dict[bytes, str] = {}
+    tables = [
+        _stream_pins(item_idx, bytes(data), interned)
+        for item_idx, data in enumerate(streams)
+    ]
+
+    if not tables:
+        return np.empty(0, dtype=PIN_DTYPE)
+    return np.concatenate(tables)
+
+
+def _stream_pins(item_idx: int, data: bytes, interned: Dict[bytes, str]) -> np.ndarray:
+    spans = frame_spans(data)
+    if spans is None:
+        return _record_pins(item_idx, data)
+
+    frames = np.array(spans, dtype=np.int64).reshape(-1, 3)
+    frames = frames[frames[:, 0] == BINARY_RECORD]
+    starts, stops = frames[:, 1], frames[:, 2]
+    buf = np.frombuffer(data, dtype=np.uint8)
+
+    _check(item_idx, starts + _DESCRIPTION + 1 <= stops)
+    body = starts + _DESCRIPTION + 1 + buf[starts + _DESCRIPTION]
+
+    name = body + _NAME
+    _check(item_idx, name + 1 <= stops)
+    name_len = buf[name].astype(np.int64)
+
+    designator = name + 1 + name_len
+    _check(item_idx, designator + 1 <= stops)
+    designator_len = buf[designator].astype(np.int64)
+    _check(item_idx, designator + 1 + designator_len <= stops)
+
+    rot_hide = buf[body + _ROT_HIDE]
+
+    table = np.empty(len(starts), dtype=PIN_DTYPE)
+    table["item"] = item_idx
+    table["owner_part_id"] = _u16(buf, starts + _OWNER_PART_ID).view(np.int16)
+    table["display_mode"] = buf[starts + _DISPLAY_MODE]
+    table["x"] = _u16(buf, body + _LOC_X).view(np.int16)
+    table["y"] = _u16(buf, body + _LOC_Y).view(np.int16)
+    table["length"] = _u16(buf, body + _LENGTH).astype(np.int32) * 10
+    table["rotation"] = (rot_hide & 0x03).astype(np.int16) * 90
+    table["pin_type"] = buf[body + _PIN_TYPE]
+    table["formal_type"] = buf[body + _FORMAL_TYPE]
+    table["hide_name"] = (rot_hide & 0x10) != 0
+    table["hide_designator"] = (rot_hide & 0x08) != 0
+    table["name"] = _strings(data, name + 1, name_len, interned)
+    table["designator"] = _strings(data, designator + 1, designator_len, interned)
+
+    return table
+
+
+def _record_pins(item_idx: int, data: bytes) -> np.ndarray:
+    """Slow path for streams that aren't framed, going through pin records."""
+    pins = [
+        rec
+        for rec in handle_pin_records(split_records(data))
+        if rec.get("RECORD") == SchLibItemRecordType.PIN
+    ]
+
+    # The part and display mode only come with framed pins
+    rows = [
+        (
+            item_idx,
+            0,
+            1,
+            pin["Location.X"],
+            pin["Location.Y"],
+            pin["PinLength"],
+            pin["Rotation"],
+            pin["PinType"],
+            0,
+            pin["Hide_Name"],
+            pin["Hide_Designator"],
+            pin["Name"],
+            pin["Designator"],
+        )
+        for pin in pins
+    ]
+
+    return np.array(rows, dtype=PIN_DTYPE)
+
+
+def _check(item_idx: int, ok: np.ndarray) -> None:
+    if not ok.all():
+        raise PinDecodeError(f"Truncated pin in item {item_idx}")
+
+
+def _u16(buf: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """Little endian u16 at each offset, which need not be aligned."""
+    return buf[offsets].astype(np.uint16) | (buf[offsets + 1].astype(np.uint16) << 8)
+
+
+def _strings(
+    data: bytes, starts: np.ndarray, lengths: np.ndarray, interned: Dict[bytes, str]
+) -> np.ndarray:
+    out = np.empty(len(starts), dtype=object)
+
+    for idx, (start, length) in enumerate(zip(starts.tolist(), lengths.tolist())):
+        raw = data[start : start + length]
+        s = interned.get(raw)
+        if s is None:
+            s = interned[raw] = str(raw, "utf8", "ignore")
+        out[idx] = s
+
+    return out
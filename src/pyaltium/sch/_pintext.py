@@ -0,0 +1,142 @@
+"""_pintext.py
+
+Decoding for ``PinTextData`` streams, which hold custom fonts and positions for
+pin names and designators.
+
+The stream starts with a ``|HEADER=PinTextData|Weight=n`` record, then has one
+binary frame per pin that has anything set. Each frame is a marker byte, the pin's
+index (as a length prefixed string), then a u32 length and that much zlib data.
+Decompressed, that's a section for the name followed by one for the designator,
+each starting with a flags byte:
+
+- ``0x01``: custom position, a u32 margin follows. ``0x02`` makes the orientation
+  relative to the part rather than the pin, and ``0x04`` turns it by 90 degrees
+- ``0x10``: custom font, a u16 font ID and u32 color follow
+"""
+from __future__ import annotations
+
+import struct
+import zlib
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from pyaltium.exceptions import PinDecodeError
+from pyaltium.sch._tokenizer import BINARY_RECORD, Buffer, frame_spans
+
+_POSITION = 0x01
+_TO_PART = 0x02
+_ROTATED = 0x04
+_FONT = 0x10
+
+_U32 = struct.Struct("<I")
+_FONT_COLOR = struct.Struct("<HI")
+
+PinTextPair = Tuple[Optional["PinText"], Optional["PinText"]]
+
+
+@dataclass
+class PinText:
+    """Overridden settings for a pin's name or designator.
+
+    ``margin`` is in Altium's internal units (10000 per mil). Anything that isn't
+    overridden is ``None``.
+    """
+
+    margin: Optional[int] = None
+    rotation: int = 0
+    relative_to_part: bool = False
+    font_id: Optional[int] = None
+    color: Optional[int] = None
+
+
+class LazyPinText:
+    """An item's pin text, read and decoded the first time any pin asks for it."""
+
+    __slots__ = ("_item", "_pins")
+
+    def __init__(self, item) -> None:
+        self._item = item
+        self._pins: Optional[Dict[int, PinTextPair]] = None
+
+    def get(self, pin_index: int) -> PinTextPair:
+        """Name and designator settings for a pin, by its order in ``Data``."""
+        if self._pins is None:
+            self._pins = decode_pin_text_data(self._item._read_pin_text_data())
+        return self._pins.get(pin_index, (None, None))
+
+    def clear(self) -> None:
+        """Forget what was decoded, so it gets read again next time."""
+        self._pins = None
+
+    def __getstate__(self) -> dict:
+        # Nothing gets read here. The item comes along, and can still read the
+        # stream by its file name if a pin asks
+        return {"_item": self._item, "_pins": self._pins}
+
+    def __setstate__(self, state: dict) -> None:
+        self._item = state["_item"]
+        self._pins = state["_pins"]
+
+
+def decode_pin_text_data(data: Buffer) -> Dict[int, PinTextPair]:
+    """Decode a whole stream to a map of pin index to (name, designator)."""
+    data = bytes(data)
+    spans = frame_spans(data) or []
+    pins: Dict[int, PinTextPair] = {}
+
+    for rtype, start, stop in spans:
+        if rtype != BINARY_RECORD:
+            # The header
+            continue
+
+        if start + 2 > stop:
+            raise PinDecodeError(f"PinTextData frame at {start} is truncated")
+
+        idx_end = start + 2 + data[start + 1]
+        if idx_end + _U32.size > stop:
+            raise PinDecodeError(f"PinTextData frame at {start} is truncated")
+
+        try:
+            pin_index = int(data[start + 2 : idx_end])
+        except ValueError as e:
+            raise PinDecodeError(f"Bad pin index in PinTextData at {start}") from e
+        (zlen,) = _U32.unpack_from(data, idx_end)
+        zstart = idx_end + _U32.size
+
+        try:
+            blob = zlib.decompress(data[zstart : zstart + zlen])
+        except zlib.error as e:
+            raise PinDecodeError(f"Bad PinTextData for pin {pin_index}") from e
+
+        name, offset = _decode_section(blob, 0)
+        designator, _ = _decode_section(blob, offset)
+        pins[pin_index] = (name, designator)
+
+    return pins
+
+
+def _decode_section(blob: bytes, offset: int) -> Tuple[Optional[PinText], int]:
+    if offset >= len(blob):
+        return None, offset
+
+    flags = blob[offset]
+    offset += 1
+    if not flags:
+        return None, offset
+
+    text = PinText()
+
+    try:
+        if flags & _POSITION:
+            (text.margin,) = _U32.unpack_from(blob, offset)
+            offset += _U32.size
+            text.rotation = 90 if flags & _ROTATED else 0
+            text.relative_to_part = bool(flags & _TO_PART)
+
+        if flags & _FONT:
+            text.font_id, text.color = _FONT_COLOR.unpack_from(blob, offset)
+            offset += _FONT_COLOR.size
+    except struct.error as e:
+        raise PinDecodeError("PinTextData section is truncated") from e
+
+    return text, offset
@@ -1,40 +1,80 @@
 from __future__ import annotations
 
 import math
-from typing import Dict, Iterable, List, TypeVar
+import re
+from typing import Dict, Iterable, List, Optional, Tuple, TypeVar
+from weakref import WeakValueDictionary
 
 import matplotlib.patches as patches
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
 
 from pyaltium._helpers import eval_bool, eval_color, normalize_dict
-from pyaltium.sch._helpers import SchLibItemRecordType, pinstr_to_records
+from pyaltium.sch._helpers import (
+    SchLibItemRecordType,
+    decode_pin,
+    pinstr_to_records,
+)
+from pyaltium.sch._pintext import PinText, PinTextPair
+from pyaltium.sch._tokenizer import (
+    BINARY_KEY,
+    BINARY_RECORD,
+    Buffer,
+    frame_spans,
+    parse_record,
+)
+
+# Offset of the description length within a binary pin record
+_PIN_PAYLOAD_START = 12
+
+# Every text record starts with its type
+_RECORD_TYPE_RE = re.compile(rb"\|RECORD=(-?\d+)")
+
+# How far pin names and designators sit from the end of the pin
+PIN_TEXT_OFFSET = 40
+
+# Alignment of a pin's name and designator, by the pin's rotation
+PIN_TEXT_ALIGN = {
+    0: ({"va": "center", "ha": "right"}, {"va": "bottom", "ha": "left"}),
+    90: ({"va": "top", "ha": "center"}, {"va": "bottom", "ha": "right"}),
+    180: ({"va": "center", "ha": "left"}, {"va": "bottom", "ha": "right"}),
+    270: ({"va": "bottom", "ha": "center"}, {"va": "top", "ha": "right"}),
+}
 
 
 def handle_pin_records(records: Iterable[Dict[bytes, bytes]]) -> list:
     """Run through a list of records for a schematic component and handle pins.
 
-    Pins are a bit weird. There is no record type for them so they are just binary
-    strings in the middle of other textual records.
+    Pins are a bit weird. They are binary records rather than text, so the
+    tokenizer hands them over as a single ``BINARY_KEY`` value that we decode here.
 
-    That means we need to go through all the records and explicitely split this off,
-    since they just tag along with whatever record preceeded them.
+    If the stream wasn't split on its frames, pins just tag along with whatever
+    record preceeded them, so we need to go through all the records and explicitely
+    split this off.
     """
 
     retlist: List[dict] = []
 
     for rec in records:
+        if BINARY_KEY in rec:
+            pin, _ = decode_pin(bytes(rec[BINARY_KEY]), _PIN_PAYLOAD_START)
+            pin["RECORD"] = SchLibItemRecordType.PIN
+            retlist.append(pin)
+            continue
+
         newrecords: List[dict] = []
-        workingrec: Dict[str, bytes] = {}
+        workingrec: Dict[str, bytes] = {
+            key.decode("utf8"): val for key, val in rec.items()
+        }
 
-        for key, val in rec.items():
+        for key, val in workingrec.items():
             # If there is nothing bytes in the string, we are set
             if b"\x00" not in val:
-                workingrec[key.decode("utf8")] = val
                 continue
 
             # Otherwise, do cleanup
             newval, pinstr = val.split(b"\x00", 1)
-            workingrec[key.decode("utf8")] = newval
+            workingrec[key] = newval
 
             # If it's too short to be a pin, it's probably just junk so ignore
             if len(pinstr) > 20:
@@ -47,33 +87,198 @@ def handle_pin_records(records: Iterable[Dict[bytes, bytes]]) -> list:
     return retlist
 
 
+class _Layout(dict):
+    """A key -> index map. Plain dicts can't be weakly referenced."""
+
+    __slots__ = ("__weakref__",)
+
+
+# Records that have the same keys share one key -> index map. Maps only stay
+# here while some record uses them, so a long running process doesn't keep
+# every layout it has ever seen
+_layouts: WeakValueDictionary[tuple, _Layout] = WeakValueDictionary()
+
+
+def _shared_layout(keys: Iterable) -> Dict[str, int]:
+    keys = tuple(keys)
+    layout = _layouts.get(keys)
+
+    if layout is None:
+        layout = _Layout(
+            ((k.decode() if isinstance(k, bytes) else k), idx)
+            for idx, k in enumerate(keys)
+        )
+        layout = _layouts.setdefault(keys, layout)
+
+    return layout
+
+
+class DrawBatch:
+    """Collects pins so they all get drawn as one ``LineCollection``, rather than
+    a line each. Styles match what ``ax.plot`` would give.
+
+    Text and rectangles still get one artist each, added as they come so that
+    overlapping ones stack in record order. A ``PatchCollection`` would move
+    rectangle edges that fall on half a pixel over by one.
+    """
+
+    def __init__(self, ax: plt.Axes) -> None:
+        self.ax = ax
+        self.pins: List[Tuple[Tuple[int, int], Tuple[int, int]]] = []
+
+    def finish(self) -> None:
+        """Add the collected artists to the axes."""
+        if self.pins:
+            lines = LineCollection(
+                self.pins,
+                colors="k",
+                linewidths=10,
+                capstyle=plt.rcParams["lines.solid_capstyle"],
+                joinstyle=plt.rcParams["lines.solid_joinstyle"],
+                zorder=2,
+            )
+            self.ax.add_collection(lines)
+            # Older matplotlib doesn't do this for collections, ax.plot did
+            self.ax.autoscale_view()
+
+        self.pins = []
+
+
+def draw_records(
+    ax: plt.Axes, records: Iterable[SchLibItemRecord], part_display_mode: int = 1
+) -> None:
+    """Draw records on matplotlib axes, batching what can be batched."""
+    batch = DrawBatch(ax)
+    for record in records:
+        if record.display_mode == part_display_mode:
+            record._batch(batch)
+    batch.finish()
+
+
 class SchLibItemRecord:
-    """An object record stored in a schematic."""
+    """An object record stored in a schematic.
+
+    Fields that every record uses are stored as attributes. Everything else stays
+    raw, and only gets normalized when it is asked for through ``param_dict``.
+
+    Records made with ``lazy`` go one step further, and just remember where they
+    are in the stream. Nothing gets parsed until one of their attributes is used.
+    """
+
+    __slots__ = (
+        "_source",
+        "_layout",
+        "_values",
+        "_params",
+        "loc_x",
+        "loc_y",
+        "rotation",
+        "linewidth",
+        "color",
+        "display_mode",
+        "part_id",
+    )
 
     rtype: SchLibItemRecordType
-    param_dict: dict
 
     def __init__(
         self,
         parameters: dict,
     ) -> None:
-        self.param_dict = normalize_dict(parameters)
+        self._source = None
+        self._set_parameters(parameters)
+
+    @classmethod
+    def lazy(cls, data: bytes, rtype: int, start: int, stop: int):
+        """Make a record that gets parsed from ``data[start:stop]`` on first use."""
+        rec = cls.__new__(cls)
+        rec._source = (data, rtype, start, stop)
+        rec._params = None
+        return rec
+
+    def __getattr__(self, name: str):
+        # Only gets called for slots that haven't been filled yet
+        if name == "_source":
+            raise AttributeError(name)
+
+        source = self._source
+        if source is None:
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{name}'"
+            )
+
+        self._source = None
+        self._set_parameters(_parse_source(*source))
+        return getattr(self, name)
+
+    def _set_parameters(self, parameters: dict) -> None:
+        self._layout = _shared_layout(parameters.keys())
+        self._values = tuple(parameters.values())
+        self._params = None
         self._load_basic_types()
         self._load()
 
+    def __getstate__(self) -> dict:
+        state = {}
+        for cls in type(self).__mro__:
+            for slot in getattr(cls, "__slots__", ()):
+                # Straight from the slot, so nothing gets parsed just to pickle it
+                try:
+                    state[slot] = getattr(cls, slot).__get__(self)
+                except AttributeError:
+                    pass
+
+        if state["_source"] is not None:
+            data, rtype, start, stop = state["_source"]
+            # Still unparsed, only this record's bytes need to come along
+            state["_source"] = (bytes(data[start:stop]), rtype, 0, stop - start)
+        else:
+            state["_layout"] = tuple(self._layout)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        # Share the key map again, rather than keeping a copy per record
+        if "_layout" in state:
+            state["_layout"] = _shared_layout(state["_layout"])
+        for slot, value in state.items():
+            setattr(self, slot, value)
+
+    @property
+    def param_dict(self) -> dict:
+        """All parameters of this record, normalized."""
+        if self._params is None:
+            self._params = normalize_dict(dict(zip(self._layout, self._values)))
+        return self._params
+
+    def _get(self, key: str, default=None):
+        """Normalize a single parameter, without building all of ``param_dict``."""
+        if self._params is not None:
+            return self._params.get(key, default)
+
+        idx = self._layout.get(key)
+        if idx is None:
+            return default
+        return normalize_dict({key: self._values[idx]})[key]
+
     def _load_basic_types(self) -> None:
-        self.loc_x = self.param_dict.get("Location.X", 0) * 10
-        self.loc_y = self.param_dict.get("Location.Y", 0) * 10
-        self.rotation = self.param_dict.get("Rotation", 0)
-        self.linewidth = self.param_dict.get("LineWidth", 0.4) * 10
-        self.color = eval_color(self.param_dict.get("Color", 0x000000))
-        self.display_mode = int(self.param_dict.get("OwnerPartDisplayMode", 1))
-        self.part_id = self.param_dict.get("OwnerPartID", 1)
+        self.loc_x = self._get("Location.X", 0) * 10
+        self.loc_y = self._get("Location.Y", 0) * 10
+        self.rotation = self._get("Rotation", 0)
+        self.linewidth = self._get("LineWidth", 0.4) * 10
+        self.color = eval_color(self._get("Color", 0x000000))
+        self.display_mode = int(self._get("OwnerPartDisplayMode", 1))
+        self.part_id = self._get("OwnerPartID", 1)
 
     def _load(self) -> None:
         raise NotImplementedError
 
     def _draw(self, ax: plt.Axes) -> None:
+        batch = DrawBatch(ax)
+        self._batch(batch)
+        batch.finish()
+
+    def _batch(self, batch: DrawBatch) -> None:
+        """Draw this record, or add it to the batch if it can share an artist."""
         raise NotImplementedError
 
     def draw(self, ax: plt.Axes, part_display_mode: int = 1) -> None:
@@ -88,31 +293,28 @@ class SchLibItemRecord:
 
 
 class SLIRUndefined(SchLibItemRecord):
+    __slots__ = ()
     rtype = SchLibItemRecordType.UNDEFINED
 
     def _load(self) -> None:
         pass
 
-    def _draw(self, ax: plt.Axes) -> None:
+    def _batch(self, batch: DrawBatch) -> None:
         pass
 
 
 class SLIRRectange(SchLibItemRecord):
+    __slots__ = ("tr_x", "tr_y", "is_solid", "fill_color")
     rtype = SchLibItemRecordType.RECTANGLE
 
     def _load(self) -> None:
-        self.tr_x = self.param_dict.get("Corner.X", 0)
-        self.tr_y = self.param_dict.get("Corner.Y", 0)
-        self.is_solid = eval_bool(self.param_dict.get("IsSolid", "1"))
-        self.fill_color = eval_color(self.param_dict.get("AreaColor"))
+        self.tr_x = self._get("Corner.X", 0)
+        self.tr_y = self._get("Corner.Y", 0)
+        self.is_solid = eval_bool(self._get("IsSolid", "1"))
+        self.fill_color = eval_color(self._get("AreaColor"))
 
-    def _draw(self, ax: plt.Axes) -> None:
-        st = f"({self.loc_x}, {self.loc_y})"
+    def _batch(self, batch: DrawBatch) -> None:
         fill_color = self.fill_color if self.is_solid else "none"
-        print(
-            f"RECT {(self.loc_x, self.loc_y)} "
-            f"{(self.tr_x - self.loc_x,self.tr_y - self.loc_y)}"
-        )
         rect = patches.Rectangle(
             (self.loc_x, self.loc_y),
             width=self.tr_x - self.loc_x,
@@ -121,48 +323,61 @@ class SLIRRectange(SchLibItemRecord):
             edgecolor=self.color,
             facecolor=fill_color,
         )
-        ax.add_patch(rect)
+        batch.ax.add_patch(rect)
 
 
 class SLIRPin(SchLibItemRecord):
+    __slots__ = (
+        "pinlength",
+        "name",
+        "designator",
+        "pintype",
+        "_pin_text",
+        "_pin_index",
+    )
     rtype = SchLibItemRecordType.PIN
 
+    @property
+    def name_text(self) -> Optional[PinText]:
+        """Custom font or position of the name, if it has one."""
+        return self._text_overrides()[0]
+
+    @property
+    def designator_text(self) -> Optional[PinText]:
+        """Custom font or position of the designator, if it has one."""
+        return self._text_overrides()[1]
+
+    def _text_overrides(self) -> PinTextPair:
+        pin_text = getattr(self, "_pin_text", None)
+        if pin_text is None:
+            return (None, None)
+        return pin_text.get(self._pin_index)
+
     def _load(self) -> None:
-        self.pinlength = self.param_dict.get("PinLength", 0)
-        self.name = self.param_dict.get("Name", 0)
-        self.designator = self.param_dict.get("Designator", 0)
-        self.pintype = self.param_dict.get("PinType", 0)
+        self.pinlength = self._get("PinLength", 0)
+        self.name = self._get("Name", 0)
+        self.designator = self._get("Designator", 0)
+        self.pintype = self._get("PinType", 0)
 
-    def _draw(self, ax: plt.Axes) -> None:
-        st = f"({self.loc_x}, {self.loc_y})"
+    def end(self) -> Tuple[int, int]:
+        """The other end of the pin from its location."""
         x1 = self.loc_x + int(math.cos(math.radians(self.rotation))) * self.pinlength
         y1 = self.loc_y + int(math.sin(math.radians(self.rotation))) * self.pinlength
-        print(
-            f"PIN {st: <20} ({self.loc_x},{x1}) ({self.loc_y},{y1}) "
-            f"{self.name: <8} {self.designator}"
-        )
-        ax.plot((self.loc_x, x1), (self.loc_y, y1), "k", linewidth=10)
-        # ax.plot((self.loc_x, x1), (self.loc_y, y1), "k", linewidth=self.linewidth)
-
-        name_x = self.loc_x - int(math.cos(math.radians(self.rotation)) * 40)
-        name_y = self.loc_y - int(math.sin(math.radians(self.rotation)) * 40)
-        des_x = self.loc_x + int(math.cos(math.radians(self.rotation)) * 40)
-        des_y = self.loc_y + int(math.sin(math.radians(self.rotation)) * 40)
-
-        if self.rotation == 90:
-            nameprops = {"va": "top", "ha": "center"}
-            desprops = {"va": "bottom", "ha": "right"}
-        elif self.rotation == 180:
-            nameprops = {"va": "center", "ha": "left"}
-            desprops = {"va": "bottom", "ha": "right"}
-        elif self.rotation == 270:
-            nameprops = {"va": "bottom", "ha": "center"}
-            desprops = {"va": "top", "ha": "right"}
-        else:  # self.rotation == 0
-            nameprops = {"va": "center", "ha": "right"}
-            desprops = {"va": "bottom", "ha": "left"}
-
-        ax.text(
+        return x1, y1
+
+    def text_anchors(self) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+        """Where the name and the designator get drawn, see ``PIN_TEXT_ALIGN``."""
+        dx = int(math.cos(math.radians(self.rotation)) * PIN_TEXT_OFFSET)
+        dy = int(math.sin(math.radians(self.rotation)) * PIN_TEXT_OFFSET)
+        return (self.loc_x - dx, self.loc_y - dy), (self.loc_x + dx, self.loc_y + dy)
+
+    def _batch(self, batch: DrawBatch) -> None:
+        batch.pins.append(((self.loc_x, self.loc_y), self.end()))
+
+        (name_x, name_y), (des_x, des_y) = self.text_anchors()
+        nameprops, desprops = PIN_TEXT_ALIGN.get(self.rotation, PIN_TEXT_ALIGN[0])
+
+        batch.ax.text(
             name_x,
             name_y,
             self.name,
@@ -172,7 +387,7 @@ class SLIRPin(SchLibItemRecord):
             fontsize=24,
         )
 
-        ax.text(
+        batch.ax.text(
             des_x,
             des_y,
             self.designator,
@@ -184,12 +399,13 @@ class SLIRPin(SchLibItemRecord):
 
 
 class SLIRLabel(SchLibItemRecord):
+    __slots__ = ("pinlength", "just", "text")
     rtype = SchLibItemRecordType.LABEL
 
     def _load(self) -> None:
-        self.pinlength = self.param_dict.get("PinLength", 0)
-        just = self.param_dict.get("Justification", 0)
-        self.text = self.param_dict.get("Text", "")
+        self.pinlength = self._get("PinLength", 0)
+        just = self._get("Justification", 0)
+        self.text = self._get("Text", "")
         justMap = {
             0: ("bottom", "left"),
             1: ("bottom", "center"),
@@ -203,9 +419,8 @@ class SLIRLabel(SchLibItemRecord):
         }
         self.just = justMap[just]
 
-    def _draw(self, ax: plt.Axes) -> None:
-        print(f"LABEL ({self.loc_x}, {self.loc_y}) {self.text: <8}")
-        ax.text(
+    def _batch(self, batch: DrawBatch) -> None:
+        batch.ax.text(
             self.loc_x,
             self.loc_y,
             self.text,
@@ -221,6 +436,50 @@ _record_type_list: List[SLIRType] = [SLIRUndefined, SLIRRectange, SLIRPin, SLIRL
 record_types: Dict[SchLibItemRecordType, SchLibItemRecord] = {
     rcls.rtype: rcls for rcls in _record_type_list
 }
+# Same thing, by the raw value
+_record_type_classes: Dict[int, SchLibItemRecord] = {
+    rtype.value: rcls for rtype, rcls in record_types.items()
+}
+
+
+def _parse_source(data: Buffer, rtype: int, start: int, stop: int) -> dict:
+    """Parse one record's parameters out of its frame."""
+    if rtype == BINARY_RECORD:
+        params, _ = decode_pin(data[start:stop], _PIN_PAYLOAD_START)
+        params["RECORD"] = SchLibItemRecordType.PIN
+        return params
+
+    return parse_record(data, start, stop)
+
+
+def get_lazy_records(data: Buffer) -> Optional[List[SchLibItemRecord]]:
+    """Make records that only get parsed when they are first used.
+
+    Only the frames and record types get looked at here. Gives ``None`` if the
+    stream isn't framed, since then there's no way to tell where records end
+    without parsing them.
+    """
+    # Records hold on to a view, which keeps a memory map alive after it's closed
+    data = memoryview(data)
+    spans = frame_spans(data)
+    if spans is None:
+        return None
+
+    undefined = record_types[SchLibItemRecordType.UNDEFINED]
+    match_type = _RECORD_TYPE_RE.match
+    records: List[SchLibItemRecord] = []
+
+    for rtype, start, stop in spans:
+        if rtype == BINARY_RECORD:
+            rcls = SLIRPin
+        elif m := match_type(data, start, stop):
+            rcls = _record_type_classes.get(int(m.group(1)), undefined)
+        else:
+            rcls = undefined
+
+        records.append(rcls.lazy(data, rtype, start, stop))
+
+    return records
 
 
 def get_sch_lib_item_record(record_params) -> SchLibItemRecord:
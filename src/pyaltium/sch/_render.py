@@ -0,0 +1,172 @@
+"""_render.py
+
+Render every symbol in a library to image files on a process pool.
+
+Outputs are named by a hash of the symbol's ``Data`` stream (plus the format and
+settings used), so anything already rendered gets skipped. Each worker keeps one
+figure around and clears it between symbols, since making a figure (or clearing
+one with ``ax.clear()``) costs about as much as drawing a small symbol.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from matplotlib.axes import Axes
+from matplotlib.figure import Figure
+
+from pyaltium.base import stream_fingerprint
+from pyaltium.sch._item import decode_records
+from pyaltium.sch._record import draw_records
+
+DEFAULT_DPI = 150
+
+
+@dataclass
+class RenderResult:
+    """What happened to one symbol. ``seconds`` is 0 if it was skipped."""
+
+    name: str
+    path: str
+    key: str
+    skipped: bool = False
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+# (Data stream, output path, format, dpi)
+_RenderJob = Tuple[bytes, str, str, int]
+
+# This process's figure, made the first time it's needed
+_figure: Optional[Tuple[Figure, Axes]] = None
+
+
+def render_key(fingerprint: bytes, fmt: str, dpi: int) -> str:
+    """Name of a rendered symbol. Changes if anything that affects it does."""
+    from pyaltium import __version__
+
+    h = hashlib.blake2b(fingerprint, digest_size=16)
+    h.update(f"|{fmt}|{dpi}|{__version__}".encode("utf8"))
+    return h.hexdigest()
+
+
+def render_all(
+    items: List[Tuple[str, bytes]],
+    out_dir: str,
+    fmt: str = "png",
+    jobs: int = None,
+    dpi: int = DEFAULT_DPI,
+) -> List[RenderResult]:
+    """Render ``(name, Data stream)`` pairs that don't have an output yet.
+
+    Results come back in the same order as ``items``. Errors get reported on
+    that item's result rather than raised.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    results = []
+    pending: List[Tuple[RenderResult, _RenderJob]] = []
+    # Copies of a symbol only get rendered once, they share the first one's result
+    first: Dict[str, RenderResult] = {}
+    copies: List[Tuple[RenderResult, RenderResult]] = []
+
+    for name, data in items:
+        key = render_key(stream_fingerprint(data), fmt, dpi)
+        path = os.path.join(out_dir, f"{key}.{fmt}")
+        result = RenderResult(name, path, key, skipped=os.path.exists(path))
+        results.append(result)
+
+        if key in first:
+            result.skipped = True
+            copies.append((result, first[key]))
+        elif not result.skipped:
+            first[key] = result
+            pending.append((result, (data, path, fmt, dpi)))
+
+    if jobs == 1 or len(pending) <= 1:
+        _collect(pending, map(_render, (job for _, job in pending)))
+    else:
+        jobs = min(jobs or os.cpu_count() or 1, len(pending))
+        with ProcessPoolExecutor(jobs) as executor:
+            done = executor.map(_render, (job for _, job in pending), chunksize=4)
+            _collect(pending, done)
+
+    for copy, original in copies:
+        copy.error = original.error
+
+    return results
+
+
+def _collect(pending, done) -> None:
+    for (result, _), (seconds, error) in zip(pending, done):
+        result.seconds = seconds
+        result.error = error
+
+
+def _render(job: _RenderJob) -> Tuple[float, Optional[str]]:
+    """Draw one symbol onto this process's figure and save it."""
+    data, path, fmt, dpi = job
+    start = time.perf_counter()
+    fig, ax = _get_figure()
+
+    try:
+        _clear(ax)
+        draw_records(ax, decode_records(data))
+        ax.autoscale(tight=True)
+        _save(fig, path, fmt, dpi)
+        error = None
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+
+    return time.perf_counter() - start, error
+
+
+def _get_figure() -> Tuple[Figure, Axes]:
+    global _figure
+
+    if _figure is None:
+        # Not through pyplot, so it never has to be closed
+        fig = Figure()
+        ax = fig.add_subplot()
+        ax.set_aspect("equal")
+        ax.axis("off")
+        _figure = (fig, ax)
+
+    return _figure
+
+
+def _clear(ax: Axes) -> None:
+    """Remove whatever the last symbol drew. ``ax.clear()`` builds the whole axes
+    again, which takes longer than drawing most symbols."""
+    for artist in (*ax.collections, *ax.patches, *ax.lines, *ax.texts):
+        artist.remove()
+
+    ax.relim()
+
+
+def _save(fig: Figure, path: str, fmt: str, dpi: int) -> None:
+    """Save to a temporary file then move it into place, so a half written file
+    never looks like it's already rendered."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            fig.savefig(
+                f,
+                format=fmt,
+                dpi=dpi,
+                transparent=True,
+                bbox_inches="tight",
+                pad_inches=0,
+            )
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
@@ -0,0 +1,188 @@
+"""_svg.py
+
+Draw schematic symbols straight to SVG markup, without going through matplotlib.
+
+Pins and labels get laid out the same way as on the matplotlib path (see
+``PIN_TEXT_ALIGN``), just written out as strings. SVG's y axis points down, so
+every y gets flipped. Text sizes are a fixed size in schematic units (mils), so
+drawings don't depend on a DPI.
+"""
+
+from __future__ import annotations
+
+from typing import IO, Callable, Dict, Iterable, List, Optional
+from xml.sax.saxutils import escape
+
+from pyaltium.sch._record import (
+    PIN_TEXT_ALIGN,
+    SchLibItemRecord,
+    SLIRLabel,
+    SLIRPin,
+    SLIRRectange,
+)
+
+FONT_SIZE = 60
+PIN_WIDTH = 10
+# Room around the drawing, in schematic units
+PADDING = 20
+
+# Rough width of a character, as a fraction of the font size, for the bounds
+_CHAR_WIDTH = 0.6
+
+_ANCHORS = {"left": "start", "center": "middle", "right": "end"}
+_BASELINES = {"top": "hanging", "center": "central", "bottom": "text-after-edge"}
+
+# Matplotlib aligns the box around rotated text on screen, and SVG aligns text in
+# its own frame before rotating it. Turned 90 degrees (reading upwards), the
+# text's top faces left and its start faces down.
+_ROTATED_ANCHORS = {"top": "end", "center": "middle", "bottom": "start"}
+_ROTATED_BASELINES = {
+    "left": "hanging",
+    "center": "central",
+    "right": "text-after-edge",
+}
+
+
+class _Canvas:
+    """SVG elements, plus the bounds of everything drawn so far."""
+
+    def __init__(self) -> None:
+        self.parts: List[str] = []
+        self.x0 = self.y0 = float("inf")
+        self.x1 = self.y1 = float("-inf")
+
+    def extend(self, x0: float, y0: float, x1: float, y1: float) -> None:
+        self.x0 = min(self.x0, x0, x1)
+        self.y0 = min(self.y0, y0, y1)
+        self.x1 = max(self.x1, x0, x1)
+        self.y1 = max(self.y1, y0, y1)
+
+    def text(
+        self,
+        x: float,
+        y: float,
+        text,
+        va: str,
+        ha: str,
+        rotation: int = 0,
+        color: str = "#000000",
+    ) -> None:
+        text = str(text)
+        y = -y
+        rotated = rotation % 180 != 0
+        if rotated:
+            anchor, baseline = _ROTATED_ANCHORS[va], _ROTATED_BASELINES[ha]
+        else:
+            anchor, baseline = _ANCHORS[ha], _BASELINES[va]
+
+        attrs = (
+            f'x="{x:g}" y="{y:g}" text-anchor="{anchor}" '
+            f'dominant-baseline="{baseline}"'
+        )
+        if rotation:
+            attrs += f' transform="rotate({-rotation} {x:g} {y:g})"'
+        if color != "#000000":
+            attrs += f' fill="{color}"'
+        self.parts.append(f"<text {attrs}>{escape(text)}</text>")
+
+        # Only needs to be close enough that nothing gets cut off. Like
+        # matplotlib, va and ha place the box the text takes up on screen
+        width = _CHAR_WIDTH * FONT_SIZE * len(text)
+        height = FONT_SIZE
+        if rotated:
+            width, height = height, width
+        left = {"left": 0, "center": -width / 2, "right": -width}[ha]
+        top = {"top": 0, "center": -height / 2, "bottom": -height}[va]
+        self.extend(x + left, y + top, x + left + width, y + top + height)
+
+
+def _rect(canvas: _Canvas, rec: SLIRRectange) -> None:
+    # The corner is in the file's own units, locations are already scaled by 10
+    x0, y0 = rec.loc_x, -rec.loc_y
+    x1, y1 = rec.tr_x * 10, -rec.tr_y * 10
+    fill = rec.fill_color if rec.is_solid and rec.fill_color else "none"
+
+    canvas.parts.append(
+        f'<rect x="{min(x0, x1):g}" y="{min(y0, y1):g}" '
+        f'width="{abs(x1 - x0):g}" height="{abs(y1 - y0):g}" '
+        f'fill="{fill}" stroke="{rec.color}" '
+        f'stroke-width="{max(rec.linewidth, 1):g}"/>'
+    )
+    canvas.extend(x0, y0, x1, y1)
+
+
+def _pin(canvas: _Canvas, rec: SLIRPin) -> None:
+    x0, y0 = rec.loc_x, rec.loc_y
+    x1, y1 = rec.end()
+    canvas.parts.append(
+        f'<line x1="{x0:g}" y1="{-y0:g}" x2="{x1:g}" y2="{-y1:g}" '
+        f'stroke="#000000" stroke-width="{PIN_WIDTH}"/>'
+    )
+    canvas.extend(x0, -y0, x1, -y1)
+
+    (name_x, name_y), (des_x, des_y) = rec.text_anchors()
+    nameprops, desprops = PIN_TEXT_ALIGN.get(rec.rotation, PIN_TEXT_ALIGN[0])
+    rotation = rec.rotation % 180
+    canvas.text(name_x, name_y, rec.name, rotation=rotation, **nameprops)
+    canvas.text(des_x, des_y, rec.designator, rotation=rotation, **desprops)
+
+
+def _label(canvas: _Canvas, rec: SLIRLabel) -> None:
+    va, ha = rec.just
+    canvas.text(rec.loc_x, rec.loc_y, rec.text, va, ha, color=rec.color or "#000000")
+
+
+_DRAWERS: Dict[type, Callable[[_Canvas, SchLibItemRecord], None]] = {
+    SLIRRectange: _rect,
+    SLIRPin: _pin,
+    SLIRLabel: _label,
+}
+
+
+def render_svg(
+    records: Iterable[SchLibItemRecord],
+    out: Optional[IO] = None,
+    part_display_mode: int = 1,
+) -> Optional[bytes]:
+    """Draw records as an SVG document.
+
+    :param records: Usually ``SchLibItem.records``
+    :param out: Binary or text stream to write to. If not given, the SVG gets
+        returned as bytes instead
+    :param part_display_mode: Only draw records for this display mode, like
+        ``draw`` does
+    """
+    canvas = _Canvas()
+
+    for rec in records:
+        drawer = _DRAWERS.get(type(rec))
+        if drawer is not None and rec.display_mode == part_display_mode:
+            drawer(canvas, rec)
+
+    if canvas.parts:
+        x0, y0 = canvas.x0 - PADDING, canvas.y0 - PADDING
+        width = canvas.x1 - canvas.x0 + 2 * PADDING
+        height = canvas.y1 - canvas.y0 + 2 * PADDING
+    else:
+        x0 = y0 = width = height = 0
+
+    svg = "".join(
+        (
+            '<svg xmlns="http://www.w3.org/2000/svg" '
+            f'viewBox="{x0:g} {y0:g} {width:g} {height:g}" '
+            f'width="{width:g}" height="{height:g}">',
+            f'<g font-family="sans-serif" font-size="{FONT_SIZE}">',
+            *canvas.parts,
+            "</g></svg>\n",
+        )
+    )
+
+    if out is None:
+        return svg.encode("utf8")
+
+    try:
+        out.write(svg.encode("utf8"))
+    except TypeError:
+        # A text stream
+        out.write(svg)
+    return None
@@ -0,0 +1,147 @@
+"""_tokenizer.py
+
+Single pass tokenizer for schematic ``Data`` streams.
+
+These streams are a series of frames. Each frame starts with a 3 byte little endian
+length and a 1 byte type, then that many bytes of payload:
+
+- Type 0 is a text record, ``|RECORD=1|Key=Value|...`` terminated by a null.
+- Type 1 is a binary record. In ``Data`` streams these are pins.
+
+``iter_tokens`` hands values out as ``memoryview`` slices of the stream, so nothing
+gets copied until somebody actually looks at it.
+"""
+from __future__ import annotations
+
+import re
+import struct
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+Buffer = Union[bytes, bytearray, memoryview]
+Token = Tuple[int, bytes, memoryview]
+# Record type, start and stop of a frame's payload
+Span = Tuple[int, int, int]
+
+TEXT_RECORD = 0
+BINARY_RECORD = 1
+
+# Key used for the payload of binary records. A real key can't contain "|"
+BINARY_KEY = b"|BINARY|"
+
+# Each parameter is a |Key=Value pair. Values may contain "|&|" (an escaped |) but
+# nothing else with a |. Anything without an = just gets skipped over.
+_PARAM_RE = re.compile(rb"\|([^|=]*)=([^|]*(?:\|&\|[^|]*)*)")
+_RECORD_RE = re.compile(rb"\|RECORD=")
+
+# Length in the low 3 bytes, record type in the high one
+_FRAME_HEADER = struct.Struct("<I")
+_FRAME_HEADER_LEN = _FRAME_HEADER.size
+
+
+def iter_tokens(data: Buffer) -> Iterator[Token]:
+    """Yield ``(record_index, key, value_slice)`` for every parameter in a stream.
+
+    Binary records give a single token with key ``BINARY_KEY`` and the whole
+    payload as the value. Streams that don't look framed fall back to splitting on
+    ``|RECORD``, in which case pins stay attached to the value before them, the
+    way ``handle_pin_records`` expects.
+    """
+    view = memoryview(data)
+
+    if _is_framed(view):
+        frames = _iter_frames(view)
+    else:
+        frames = _iter_unframed(view)
+
+    for idx, (rtype, start, stop) in enumerate(frames):
+        if rtype == BINARY_RECORD:
+            yield idx, BINARY_KEY, view[start:stop]
+            continue
+
+        for m in _PARAM_RE.finditer(view, start, stop):
+            yield idx, m.group(1), view[m.start(2) : m.end(2)]
+
+
+def split_records(data: Buffer) -> List[Dict[bytes, Buffer]]:
+    """Split a stream into one parameter dict per record.
+
+    This is the same scan as ``iter_tokens``, but text values come back as
+    ``bytes`` since that lets the regex do all the work for a whole record at once.
+    Binary payloads are still views.
+    """
+    view = memoryview(data)
+    records: List[Dict[bytes, Buffer]] = []
+    findall = _PARAM_RE.findall
+
+    if _is_framed(view):
+        frames = _iter_frames(view)
+    else:
+        frames = _iter_unframed(view)
+
+    for rtype, start, stop in frames:
+        if rtype == BINARY_RECORD:
+            records.append({BINARY_KEY: view[start:stop]})
+        else:
+            records.append(dict(findall(view, start, stop)))
+
+    return records
+
+
+def parse_record(data: Buffer, start: int, stop: int) -> Dict[bytes, bytes]:
+    """Parameters of a single text record in ``data[start:stop]``."""
+    return dict(_PARAM_RE.findall(data, start, stop))
+
+
+def frame_spans(data: Buffer) -> Optional[List[Span]]:
+    """Find where every record's payload is, without looking inside any of them.
+
+    Returns ``None`` if the stream doesn't look framed.
+    """
+    view = memoryview(data)
+    if not _is_framed(view):
+        return None
+    return list(_iter_frames(view))
+
+
+def _is_framed(view: memoryview) -> bool:
+    """Check that the first frame has a known type and fits in the stream."""
+    if len(view) < _FRAME_HEADER_LEN + 1:
+        return False
+
+    (header,) = _FRAME_HEADER.unpack_from(view)
+    rtype = header >> 24
+
+    if header & 0xFFFFFF > len(view) - _FRAME_HEADER_LEN:
+        return False
+    if rtype == TEXT_RECORD:
+        return view[_FRAME_HEADER_LEN] == ord("|")
+    return rtype == BINARY_RECORD
+
+
+def _iter_frames(view: memoryview) -> Iterator[Span]:
+    """Yield the type, start and end of each frame's payload.
+
+    Text payloads don't include their null terminator.
+    """
+    unpack = _FRAME_HEADER.unpack_from
+    pos = 0
+    end = len(view)
+
+    while pos + _FRAME_HEADER_LEN <= end:
+        (header,) = unpack(view, pos)
+        start = pos + _FRAME_HEADER_LEN
+        pos = start + (header & 0xFFFFFF)
+        stop = min(pos, end)
+        rtype = header >> 24
+
+        if rtype != BINARY_RECORD and stop > start and view[stop - 1] == 0:
+            stop -= 1
+
+        yield rtype, start, stop
+
+
+def _iter_unframed(view: memoryview) -> Iterator[Span]:
+    starts = [m.start() for m in _RECORD_RE.finditer(view)]
+
+    for start, stop in zip(starts, starts[1:] + [len(view)]):
+        yield TEXT_RECORD, start, stop
@@ -0,0 +1,128 @@
+import os
+import shutil
+
+import olefile
+import pytest
+
+from pyaltium import PcbLib, SchLib
+from pyaltium._cache import SnapshotCache
+
+
+@pytest.fixture
+def sch_file(tmp_path):
+    path = tmp_path / "lib.SchLib"
+    shutil.copy("tests/files/sch/SchLib1.SchLib", path)
+    return str(path)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return SnapshotCache(str(tmp_path / "cache"))
+
+
+def _snapshots(cache):
+    return sorted(os.listdir(cache.directory))
+
+
+def test_warm_start_skips_ole(sch_file, cache, monkeypatch):
+    cold = SchLib(sch_file, cache=cache)
+    assert len(_snapshots(cache)) == 1
+
+    # Nothing below should need to parse the file
+    real_ole = olefile.OleFileIO
+    monkeypatch.setattr(olefile, "OleFileIO", None)
+    warm = SchLib(sch_file, cache=cache)
+    monkeypatch.setattr(olefile, "OleFileIO", real_ole)
+
+    assert warm.header["Weight"] == cold.header["Weight"]
+    assert warm.list_items() == cold.list_items()
+    for cold_item, warm_item in zip(cold.items_list, warm.items_list):
+        assert [r.param_dict for r in warm_item.records] == [
+            r.param_dict for r in cold_item.records
+        ]
+        assert warm_item._session is warm._session
+        assert warm_item.file_name == sch_file
+
+    # Items can still read the file themselves
+    assert warm.items_list[0].fingerprint() == cold.items_list[0].fingerprint()
+
+
+def test_pcblib_and_directory_path(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    cold = PcbLib("tests/files/pcb/PcbLib1.PcbLib", cache=cache_dir)
+    warm = PcbLib("tests/files/pcb/PcbLib1.PcbLib", cache=cache_dir)
+    assert warm.list_items() == cold.list_items()
+    assert len(os.listdir(cache_dir)) == 1
+
+
+def test_invalidation(sch_file, cache):
+    SchLib(sch_file, cache=cache)
+    (eager,) = _snapshots(cache)
+
+    # Different options get their own snapshot, and both stay usable
+    lazy = SchLib(sch_file, lazyload=True, cache=cache)
+    assert lazy.items_list[0]._records is None
+    assert len(_snapshots(cache)) == 2
+    assert cache.load(SchLib(sch_file))
+    assert cache.load(SchLib(sch_file, lazyload=True))
+    assert len(_snapshots(cache)) == 2
+
+    # A changed file misses, and only the old snapshot with the same options
+    # gets dropped
+    (lazy_name,) = set(_snapshots(cache)) - {eager}
+    st = os.stat(sch_file)
+    os.utime(sch_file, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    SchLib(sch_file, lazyload=True, cache=cache)
+    snapshots = _snapshots(cache)
+    assert len(snapshots) == 2
+    assert eager in snapshots and lazy_name not in snapshots
+
+
+def test_corrupt_snapshot(sch_file, cache):
+    SchLib(sch_file, cache=cache)
+    (name,) = _snapshots(cache)
+    with open(os.path.join(cache.directory, name), "wb") as f:
+        f.write(b"garbage")
+
+    lib = SchLib(sch_file, cache=cache)
+    assert len(lib.items_list) == 9
+    assert cache.load(SchLib(sch_file))
+
+
+def test_unwritable_cache(sch_file, tmp_path):
+    # A file where the directory should be, so nothing can get stored
+    blocker = tmp_path / "blocked"
+    blocker.write_bytes(b"")
+    cache = SnapshotCache(str(blocker))
+
+    lib = SchLib(sch_file, cache=cache)
+    assert len(lib.items_list) == 9
+    assert not cache.load(lib)
+
+
+def test_eviction(tmp_path, cache):
+    paths = []
+    for name in ("a", "longer name", "an even longer name"):
+        path = tmp_path / f"{name}.SchLib"
+        shutil.copy("tests/files/sch/SchLib1.SchLib", path)
+        paths.append(str(path))
+
+    SchLib(paths[0], cache=cache)
+    one = cache.size()
+    cache.max_bytes = 2 * one
+
+    SchLib(paths[1], cache=cache)
+    # Snapshots don't depend on where their file is
+    assert cache.size() == 2 * one
+    # Make the second one the least recently used
+    os.utime(cache._snapshot_path(SchLib(paths[1])), ns=(0, 0))
+    assert cache.load(SchLib(paths[0]))
+    SchLib(paths[2], cache=cache)
+
+    assert len(_snapshots(cache)) == 2
+    assert cache.size() <= cache.max_bytes
+    assert cache.load(SchLib(paths[0]))
+    assert not cache.load(SchLib(paths[1]))
+
+    cache.clear()
+    assert cache.size() == 0
@@ -0,0 +1,64 @@
+import shutil
+
+from pyaltium import PcbLib, SchLib
+from pyaltium._duplicates import find_duplicates
+from pyaltium.sch._item import canonical_fingerprint
+
+
+def frame(payload: bytes, rtype: int = 0) -> bytes:
+    return len(payload).to_bytes(3, "little") + bytes([rtype]) + payload
+
+
+def test_canonical_fingerprint():
+    header = frame(b"|RECORD=1|LibReference=Part|UniqueID=AAAAAAAA\x00")
+    rect = frame(b"|RECORD=14|Location.X=10|IndexInSheet=1|UniqueID=BBBBBBBB\x00")
+    pin = frame(b"\x02\x00\x00\x00\x00\x01" + bytes(20), rtype=1)
+
+    base = canonical_fingerprint(header + rect + pin)
+
+    # Reordered, with new IDs
+    copy = (
+        frame(b"|RECORD=1|LibReference=Part|UniqueID=CCCCCCCC\x00")
+        + pin
+        + frame(b"|RECORD=14|IndexInSheet=7|Location.X=10|UniqueID=DDDDDDDD\x00")
+    )
+    assert canonical_fingerprint(copy) == base
+
+    moved = header + frame(b"|RECORD=14|Location.X=20\x00") + pin
+    assert canonical_fingerprint(moved) != base
+    assert canonical_fingerprint(header + rect) != base
+
+
+def test_item_fingerprints():
+    lib = SchLib("tests/files/sch/SchLib1.SchLib")
+    item = lib.items_list[0]
+    assert item.data_fingerprint() == item.fingerprint()
+    assert item.canonical_fingerprint() == canonical_fingerprint(item._read_data())
+
+    pcb = PcbLib("tests/files/pcb/PcbLib1.PcbLib")
+    fps = {p.canonical_fingerprint() for p in pcb.items_list}
+    assert len(fps) == len(pcb.items_list)
+    assert str(pcb.items_list[0]) == pcb.items_list[0].footprintref
+
+
+def test_find_duplicates(tmp_path):
+    for name in ("a.SchLib", "b.SchLib"):
+        shutil.copy("tests/files/sch/SchLib1.SchLib", tmp_path / name)
+    shutil.copy("tests/files/pcb/PcbLib1.PcbLib", tmp_path / "c.PcbLib")
+
+    sch_a, sch_b = str(tmp_path / "a.SchLib"), str(tmp_path / "b.SchLib")
+    pcb = str(tmp_path / "c.PcbLib")
+    sch_count = len(SchLib(sch_a).items_list)
+
+    for canonical in (True, False):
+        groups = find_duplicates([sch_a, SchLib(sch_b), pcb], canonical=canonical)
+
+        assert len(groups) == sch_count
+        for group in groups:
+            assert group.kind == "SchLib"
+            assert [e.path for e in group.items] == [sch_a, sch_b]
+            assert group.items[0].name == group.items[1].name
+
+    groups = find_duplicates([pcb, pcb])
+    assert {g.kind for g in groups} == {"PcbLib"}
+    assert all(g.items[0].index == g.items[1].index for g in groups)
@@ -0,0 +1,37 @@
+from pyaltium import SchLib
+from pyaltium._header import FileHeader
+
+
+def test_header_lookups():
+    h = FileHeader("|HEADER=Test|Weight=4|Bold1=T|CompCount=x|Weight=99|Empty=")
+    assert h["HEADER"] == "Test"
+    assert h.get_int("Weight") == 4  # first value wins
+    assert h.get_int("CompCount", 7) == 7
+    assert h.get_bool("Bold1")
+    assert not h.get_bool("Italic1")
+    assert h.get("Empty", "default") == ""
+    assert h.get("Missing") == ""
+    assert "Missing" not in h
+
+
+def test_header_tables():
+    h = FileHeader(
+        "|CompCount=2|LibRef0=A|CompDescr0=First|PartCount0=2"
+        "|LibRef1=B|PartCount1=1|FontIdCount=1|Size1=10|FontName1=Times|Bold1=T"
+    )
+    comps = h.components()
+    assert [(c.libref, c.description, c.partcount) for c in comps] == [
+        ("A", "First", 2),
+        ("B", "", 1),
+    ]
+    (font,) = h.fonts()
+    assert (font.font_id, font.name, font.size, font.bold) == (1, "Times", 10, True)
+
+    sk = FileHeader("|KeyCount=1|LibRef0=Long name|SectionKey0=Long nam")
+    assert sk.section_keys() == {"Long name": "Long nam"}
+
+
+def test_schlib_header():
+    sl = SchLib("tests/files/sch/SchLib1.SchLib")
+    assert sl.header.comp_count == len(sl.items_list)
+    assert sl.fonts[0].name
@@ -0,0 +1,83 @@
+import os
+import shutil
+
+import olefile
+import pytest
+
+from pyaltium import LibraryIndex
+
+
+@pytest.fixture
+def tree(tmp_path):
+    shutil.copy("tests/files/sch/SchLib1.SchLib", tmp_path / "a.SchLib")
+    shutil.copy("tests/files/pcb/PcbLib1.PcbLib", tmp_path / "b.PcbLib")
+    return tmp_path
+
+
+def test_refresh_and_lookup(tree, tmp_path, monkeypatch):
+    db = str(tmp_path / "index.db")
+
+    with LibraryIndex(db) as index:
+        stats = index.refresh(str(tree))
+        assert (stats.added, stats.updated, stats.removed) == (2, 0, 0)
+
+    # Lookups come straight from the database
+    monkeypatch.setattr(olefile, "OleFileIO", None)
+
+    with LibraryIndex(db) as index:
+        sch_items = index.items(str(tree / "a.SchLib"))
+        assert len(sch_items) == 9
+        assert all(i.kind == "SchLib" for i in sch_items)
+
+        found = index.find(sch_items[3].name)
+        assert found[0].data == sch_items[3].data
+        assert index.search(sch_items[3].name[1:].lower())
+
+        pcb_items = index.items(str(tree / "b.PcbLib"))
+        assert pcb_items[0].kind == "PcbLib"
+        assert pcb_items[0].name == pcb_items[0].data["footprintref"]
+
+        # Nothing changed, nothing to parse
+        assert index.refresh(str(tree)).unchanged == 2
+
+
+def test_refresh_changes(tree):
+    index = LibraryIndex()
+    index.refresh(str(tree))
+    sch = tree / "a.SchLib"
+
+    # Touched but identical only gets hashed
+    st = os.stat(sch)
+    os.utime(sch, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert index.refresh(str(tree)).unchanged == 2
+
+    shutil.copy("tests/files/sch/SchGraphic.SchLib", sch)
+    (tree / "b.PcbLib").unlink()
+    (tree / "c.SchLib").write_bytes(b"junk")
+
+    stats = index.refresh(str(tree))
+    assert (stats.added, stats.updated, stats.removed) == (1, 1, 1)
+    assert index.files() == [str(sch), str(tree / "c.SchLib")]
+    assert len(index.items(str(sch))) == 1
+
+
+def test_refresh_missing_file(tree):
+    index = LibraryIndex()
+    sch, missing = str(tree / "a.SchLib"), str(tree / "missing.SchLib")
+    index.refresh([sch])
+
+    (tree / "a.SchLib").unlink()
+    stats = index.refresh([sch, missing])
+    assert (stats.added, stats.updated, stats.removed) == (0, 0, 1)
+    assert index.files() == []
+
+
+def test_search_wildcards(tree):
+    index = LibraryIndex()
+    index.refresh(str(tree / "a.SchLib"))
+    names = [item.name for item in index.items(str(tree / "a.SchLib"))]
+
+    # Taken literally, not as LIKE wildcards
+    assert index.search("%") == []
+    assert index.search("\\") == []
+    assert [item.name for item in index.search("_")] == [n for n in names if "_" in n]
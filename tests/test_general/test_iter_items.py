@@ -0,0 +1,48 @@
+import pytest
+
+from pyaltium import PcbLib, SchLib
+
+SCHLIB_PATH = "tests/files/sch/SchLib1.SchLib"
+
+
+def test_iter_items_lazy():
+    sl = SchLib(SCHLIB_PATH, lazyload=True)
+    assert sl._items is None
+
+    seen = []
+    for item in sl.iter_items(load=True, release=True):
+        assert item._records is not None
+        seen.append(item)
+
+    # Nothing kept a list of items, and records were let go
+    assert sl._items is None
+    assert all(item._records is None for item in seen)
+    assert [i.as_dict() for i in seen] == sl.list_items()
+    assert sl._items is None
+
+    # Asking for the list builds it once
+    assert sl.items_list is sl.items_list
+    assert len(sl.items_list) == len(seen)
+
+
+def test_iter_items_existing_list():
+    sl = SchLib(SCHLIB_PATH)
+    assert list(sl.iter_items()) == sl.items_list
+    assert list(sl.iter_dicts()) == sl.list_items()
+
+
+@pytest.mark.parametrize("lazyload", [False, True])
+def test_pcblib_iter_dicts(lazyload):
+    pl = PcbLib("tests/files/pcb/PcbLib1.PcbLib", lazyload=lazyload)
+    expected = PcbLib("tests/files/pcb/PcbLib1.PcbLib").list_items()
+    assert list(pl.iter_dicts()) == expected
+    assert (pl._items is None) == lazyload
+
+
+@pytest.mark.parametrize("lib_type", [SchLib, PcbLib])
+@pytest.mark.parametrize("lazyload", [False, True])
+def test_no_file(lib_type, lazyload):
+    lib = lib_type(lazyload=lazyload)
+    assert lib.list_items() == []
+    assert list(lib.iter_items()) == []
+    assert lib.items_list == []
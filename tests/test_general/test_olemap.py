@@ -0,0 +1,71 @@
+import glob
+
+import olefile
+import pytest
+
+from pyaltium import SchLib
+from pyaltium._olemap import MappedOleReader, OleStreamRuns, _walk_chain
+from pyaltium.exceptions import FileError
+
+ALL_FILES = glob.glob("tests/files/sch/*.SchLib") + glob.glob(
+    "tests/files/pcb/*.PcbLib"
+)
+
+
+@pytest.mark.parametrize("file_name", ALL_FILES)
+def test_mapped_streams_match(file_name):
+    """Every stream read through the map matches what olefile reads."""
+    with olefile.OleFileIO(file_name) as ole:
+        reader = MappedOleReader(ole)
+        for stream in ole.listdir():
+            expected = ole.openstream(stream).read()
+            view = reader.read(stream)
+            assert isinstance(view, memoryview)
+            assert view == expected
+            assert reader.read(stream, 10) == expected[:10]
+            assert b"".join(reader.iter_chunks(stream)) == expected
+            assert all(len(c) <= 100 for c in reader.iter_chunks(stream, 100))
+            del view
+        reader.close()
+
+
+@pytest.mark.parametrize("file_name", ALL_FILES)
+def test_chunked_streams_match(file_name):
+    """Reading in pieces without a map gets the same data."""
+    with olefile.OleFileIO(file_name) as ole:
+        runs = OleStreamRuns(ole)
+        for stream in ole.listdir():
+            chunks = list(runs.iter_chunks(stream, 1000))
+            assert all(len(c) <= 1000 for c in chunks)
+            assert b"".join(chunks) == ole.openstream(stream).read()
+
+
+def test_walk_chain_malformed():
+    """A FAT that loops back on itself, or points outside, is an error."""
+    fat = [1, 0]
+    assert [s for s, _ in _walk_chain(fat, 0, 1024, 512)] == [0, 1]
+
+    with pytest.raises(FileError):
+        list(_walk_chain(fat, 0, 512 * 5, 512))
+
+    with pytest.raises(FileError):
+        list(_walk_chain([0], 0, 1024, 512))
+
+    with pytest.raises(FileError):
+        list(_walk_chain([7], 0, 1024, 512))
+
+
+def test_schlib_mmap_records():
+    """Records parsed from views are the same as from bytes."""
+    file_name = "tests/files/sch/SchLib1.SchLib"
+    expected = [
+        [r.param_dict for r in item.records] for item in SchLib(file_name).items_list
+    ]
+
+    with SchLib.open(file_name, use_mmap=True) as sl:
+        stream = (sl.items_list[0].sectionkey, "Data")
+        data = sl._read_decode_stream(stream, decode=False)
+        assert isinstance(data, memoryview)
+        del data
+
+        assert [[r.param_dict for r in i.records] for i in sl.items_list] == expected
@@ -0,0 +1,116 @@
+import shutil
+import struct
+
+import olefile
+
+from pyaltium import PcbLib, SchLib
+from pyaltium._olemap import MappedOleReader
+from pyaltium.pcb._record import PcbTrack
+from pyaltium.sch._item import SchLibItem
+
+
+def patch_stream(path, stream, old: bytes, new: bytes) -> None:
+    """Overwrite bytes of a stream in place, without changing its length."""
+    with olefile.OleFileIO(path) as ole:
+        reader = MappedOleReader(ole)
+        runs = list(reader._stream_runs(stream, -1))
+        reader.close()
+
+    with open(path, "r+b") as f:
+        for offset, length in runs:
+            f.seek(offset)
+            chunk = f.read(length)
+            if old in chunk:
+                f.seek(offset + chunk.index(old))
+                f.write(new)
+                return
+    raise AssertionError("pattern not found")
+
+
+def test_schlib_reload(tmp_path, monkeypatch):
+    path = str(tmp_path / "lib.SchLib")
+    shutil.copy("tests/files/sch/SchLib1.SchLib", path)
+
+    decoded = []
+    load_data = SchLibItem._load_data
+
+    def counting_load_data(self):
+        decoded.append(self.libref)
+        load_data(self)
+
+    monkeypatch.setattr(SchLibItem, "_load_data", counting_load_data)
+
+    with SchLib.open(path) as sl:
+        items = list(sl.items_list)
+        records = [item.records for item in items]
+
+        # Rewritten, but identical, so nothing gets decoded again
+        shutil.copy("tests/files/sch/SchLib1.SchLib", path)
+        decoded.clear()
+        sl.reload()
+        assert all(a is b for a, b in zip(sl.items_list, items))
+        assert decoded == []
+
+        target = items[1]
+        patch_stream(path, [target.sectionkey, "Data"], b"|Color=", b"|Colr0=")
+        sl.reload()
+
+        assert decoded == [target.libref]
+        assert sl.items_list[1] is not target
+        assert sl.items_list[1]._records is not None
+        assert len(sl.items_list[1].records) == len(records[1])
+        for idx, item in enumerate(sl.items_list):
+            if idx != 1:
+                assert item is items[idx]
+                assert item.records is records[idx]
+
+
+def test_lazy_items_kept(tmp_path):
+    path = str(tmp_path / "lib.SchLib")
+    shutil.copy("tests/files/sch/SchLib1.SchLib", path)
+
+    sl = SchLib(path, lazyload=True)
+    items = list(sl.items_list)
+    sl.reload()
+    assert sl.items_list == items
+    assert all(item._records is None for item in sl.items_list)
+
+
+def test_pcblib_reload(tmp_path):
+    path = str(tmp_path / "lib.PcbLib")
+    shutil.copy("tests/files/pcb/PcbLib1.PcbLib", path)
+
+    pl = PcbLib(path)
+    items = list(pl.items_list)
+    pl.reload()
+    assert all(a is b for a, b in zip(pl.items_list, items))
+
+
+def test_pcblib_reload_geometry(tmp_path):
+    path = str(tmp_path / "lib.PcbLib")
+    shutil.copy("tests/files/pcb/PcbLib1.PcbLib", path)
+
+    with PcbLib.open(path) as pl:
+        items = list(pl.items_list)
+        idx = next(
+            i for i, item in enumerate(items) if item.footprintref == "Lines shifted"
+        )
+        target = items[idx]
+        track = next(p for p in target.records if isinstance(p, PcbTrack))
+        assert track.x2 == 1968504
+
+        patch_stream(
+            path,
+            [target.storage, "Data"],
+            struct.pack("<i", 1968504),
+            struct.pack("<i", 1978504),
+        )
+        pl.reload()
+
+        assert pl.items_list[idx] is not target
+        tracks = [p for p in pl.items_list[idx].records if isinstance(p, PcbTrack)]
+        assert tracks[0].x2 == 1978504
+        # Everything else was kept
+        for other, item in zip(items, pl.items_list):
+            if other is not target:
+                assert item is other
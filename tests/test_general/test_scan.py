@@ -0,0 +1,82 @@
+import multiprocessing
+import os
+import shutil
+
+import pytest
+
+from pyaltium import _scan, scan
+
+FILES = {
+    "tests/files/sch/SchLib1.SchLib": "SchLib",
+    "tests/files/pcb/PcbLib1.PcbLib": "PcbLib",
+}
+
+
+@pytest.fixture
+def tree(tmp_path):
+    sub = tmp_path / "sub"
+    sub.mkdir()
+    for src in FILES:
+        shutil.copy(src, sub)
+
+    # Looks like a library but isn't
+    (tmp_path / "broken.SchLib").write_bytes(b"not an ole file")
+    # Valid OLE, but truncated
+    data = open("tests/files/sch/SchLib1.SchLib", "rb").read()
+    (tmp_path / "truncated.SchLib").write_bytes(data[:4096])
+    (tmp_path / "notes.txt").write_text("ignored")
+    return tmp_path
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_scan(tree, jobs):
+    results = {
+        r.path.rsplit("/", 1)[-1]: r for r in scan(str(tree), jobs=jobs, chunksize=1)
+    }
+
+    assert set(results) == {
+        "SchLib1.SchLib",
+        "PcbLib1.PcbLib",
+        "broken.SchLib",
+        "truncated.SchLib",
+    }
+    assert results["SchLib1.SchLib"].kind == "SchLib"
+    assert len(results["SchLib1.SchLib"].items) == 9
+    assert results["PcbLib1.PcbLib"].kind == "PcbLib"
+    assert results["PcbLib1.PcbLib"].items
+
+    assert results["broken.SchLib"].ok and results["broken.SchLib"].kind is None
+    assert not results["truncated.SchLib"].ok
+    assert all(r.seconds >= 0 for r in results.values())
+
+
+def crash_on_marked(path):
+    if path.endswith("crash.SchLib"):
+        os._exit(1)
+    return real_scan_file(path)
+
+
+real_scan_file = _scan.scan_file
+
+
+@pytest.mark.skipif(
+    multiprocessing.get_start_method() != "fork",
+    reason="workers only see the patched scan_file when forked",
+)
+def test_worker_dies(tree, monkeypatch):
+    shutil.copy("tests/files/sch/SchLib1.SchLib", tree / "crash.SchLib")
+    for idx in range(6):
+        shutil.copy("tests/files/sch/SchLib1.SchLib", tree / f"copy{idx}.SchLib")
+    monkeypatch.setattr(_scan, "scan_file", crash_on_marked)
+
+    results = {
+        r.path.rsplit("/", 1)[-1]: r for r in scan(str(tree), jobs=2, chunksize=2)
+    }
+
+    # Only the file that killed its worker is missing a listing
+    assert len(results) == 11
+    assert "BrokenProcessPool" in results["crash.SchLib"].error
+    for name, result in results.items():
+        if name.startswith("copy"):
+            assert result.ok and len(result.items) == 9
+    assert results["PcbLib1.PcbLib"].ok
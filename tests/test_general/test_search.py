@@ -0,0 +1,82 @@
+import pytest
+
+from pyaltium import PcbLib, SchLib
+from pyaltium._search import Component, Contains, Prefix, Range, SearchIndex
+
+SCH = "tests/files/sch/SchLib1.SchLib"
+PCB = "tests/files/pcb/PcbLib1.PcbLib"
+
+
+@pytest.fixture
+def index():
+    index = SearchIndex()
+    index.add_library(SCH)
+    index.add_library(PcbLib(PCB))
+    return index
+
+
+def test_text_queries(index):
+    assert [c.name for c in index.search(pin_name="ClkSym")] == ["Pin_Properties"]
+    assert [c.name for c in index.search(pin_designator="pindes")] == ["CombinedPins"]
+    assert [c.name for c in index.search(parameter="Multimodal part")] == [
+        "Multimode 1"
+    ]
+
+    assert {c.name for c in index.search(libref=Prefix("combined"))} == {
+        "CombinedPins",
+        "CombinedPinsRectGraphic",
+    }
+    assert [c.name for c in index.search(footprintref=Contains("QFP"))] == [
+        "SQFP50P800X800X300_HS-33N"
+    ]
+    # Shorter than a trigram
+    assert len(index.search(footprintref=Contains("0,"))) == 5
+
+    # Librefs and footprints are kept apart
+    assert index.search(libref=Prefix("Single Pad")) == []
+
+
+def test_numeric_queries(index):
+    assert [c.name for c in index.search(partcount=Range(min=2))] == ["Multipart 1"]
+    assert len(index.search(height=1.0)) == 8
+    assert [c.name for c in index.search(height=Range(2, 5))] == [
+        "SQFP50P800X800X300_HS-33N"
+    ]
+    assert {c.kind for c in index.search(height=Range(max=0))} == {"PcbLib"}
+
+
+def test_combined_criteria(index):
+    found = index.search(
+        description=Contains("pad at"), footprintref=Prefix("single pad (0,0) rot")
+    )
+    assert len(found) == 3
+    assert all(c.path == PCB for c in found)
+
+    with pytest.raises(ValueError):
+        index.search(pins="1")
+
+
+def test_incremental_updates(index):
+    total = len(index)
+    sch_count = len(SchLib(SCH).items_list)
+
+    # Adding the same library again replaces it
+    index.add_library(SchLib(SCH))
+    assert len(index) == total
+
+    index.remove_library(SCH)
+    assert len(index) == total - sch_count
+    assert index.paths == [PCB]
+    assert index.search(pin_name="ClkSym") == []
+    assert index.search(partcount=Range(min=1)) == []
+    assert "clksym" not in index._text["pin_name"].postings
+
+    index.add_components(
+        "made/up.SchLib",
+        [
+            Component(
+                "made/up.SchLib", "SchLib", 0, "USB_C", partcount=2, pin_names=("VBUS",)
+            )
+        ],
+    )
+    assert [c.name for c in index.search(pin_name="vbus", partcount=2)] == ["USB_C"]
@@ -0,0 +1,58 @@
+import olefile
+import pytest
+
+from pyaltium import PcbLib, SchLib
+
+SCHLIB_PATH = "tests/files/sch/SchLib1.SchLib"
+PCBLIB_PATH = "tests/files/pcb/PcbLib1.PcbLib"
+
+
+@pytest.fixture
+def open_count(monkeypatch):
+    """Count how many times an OLE file gets opened."""
+    counter = {"opens": 0}
+    original = olefile.OleFileIO
+
+    class CountingOleFileIO(original):
+        def __init__(self, *args, **kwargs):
+            counter["opens"] += 1
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(olefile, "OleFileIO", CountingOleFileIO)
+    return counter
+
+
+def test_schlib_opens_once(open_count):
+    """Loading a library and all its items only parses the OLE file once."""
+    with SchLib.open(SCHLIB_PATH) as sl:
+        assert len(sl.items_list) > 1
+        for item in sl.items_list:
+            assert item.records
+
+    assert open_count["opens"] == 1
+
+
+def test_schlib_constructor_opens_once(open_count):
+    SchLib(SCHLIB_PATH)
+    assert open_count["opens"] == 1
+
+
+def test_pcblib_opens_once(open_count):
+    with PcbLib.open(PCBLIB_PATH) as pl:
+        assert len(pl.list_items()) > 0
+
+    assert open_count["opens"] == 1
+
+
+def test_session_closes():
+    """The handle gets closed when the block exits, and items can still load."""
+    with SchLib.open(SCHLIB_PATH) as sl:
+        session = sl._session
+        assert session.is_open
+        assert all(item._session is session for item in sl.items_list)
+
+    assert not session.is_open
+    item = sl.items_list[0]
+    item._load_data()
+    assert item.records
+    assert not session.is_open
@@ -0,0 +1,81 @@
+import struct
+
+import pytest
+
+from pyaltium import PcbLib
+from pyaltium.base import OleSession
+from pyaltium.pcb._lib import parse_height, parse_parameters, parse_section_keys
+
+PCB = "tests/files/pcb/PcbLib1.PcbLib"
+
+
+@pytest.fixture
+def reads(monkeypatch):
+    calls = []
+    real_read = OleSession.read
+
+    def read(self, streamname, *args, **kwargs):
+        calls.append(
+            (tuple(streamname) if not isinstance(streamname, str) else streamname, args)
+        )
+        return real_read(self, streamname, *args, **kwargs)
+
+    monkeypatch.setattr(OleSession, "read", read)
+    return calls
+
+
+def test_listing_reads_no_parameters(reads):
+    with PcbLib.open(PCB) as lib:
+        items = lib.items_list
+        assert len(items) == 13
+        assert not [c for c in reads if c[0][-1] == "Parameters"]
+
+        item = next(i for i in items if i.footprintref == "Four pads")
+        assert item.description == "Four pads of different types"
+        assert item.height == 1.0
+
+    params = [c for c in reads if c[0][-1] == "Parameters"]
+    # One short read for both fields
+    assert params == [(("Four pads", "Parameters"), (512,))]
+
+
+def test_parse_parameters():
+    text = b"|PATTERN=Part|HEIGHT=1mm|DESCRIPTION=" + b"x" * 20 + b"\x00"
+    raw = struct.pack("<I", len(text)) + text
+
+    full = parse_parameters(raw)
+    assert full["DESCRIPTION"] == "x" * 20
+
+    # Cut off in the middle of the description
+    partial = parse_parameters(raw[:40])
+    assert partial["HEIGHT"] == "1mm"
+    assert "DESCRIPTION" not in partial
+
+    assert len(parse_parameters(b"")) == 0
+
+
+def test_parse_height():
+    assert parse_height("39.3701mil") == 1.0
+    assert parse_height("2.5MM") == 2.5
+    assert parse_height("") is None
+    assert parse_height("tall") is None
+
+
+def test_parse_section_keys():
+    def entry(name: bytes, key: bytes) -> bytes:
+        return (
+            struct.pack("<IB", len(name) + 1, len(name))
+            + name
+            + struct.pack("<I", len(key))
+            + key
+        )
+
+    name = b"A very long footprint name that got truncated"
+    raw = struct.pack("<I", 1) + entry(name, name[:31])
+    assert parse_section_keys(raw) == {name[:31].decode(): name.decode()}
+
+    assert parse_section_keys(b"") == {}
+    assert parse_section_keys(raw[:20]) == {}
+    assert parse_section_keys(b"|KeyCount=1|LibRef0=Long|SectionKey0=Lo") == {
+        "Lo": "Long"
+    }
@@ -0,0 +1,98 @@
+import io
+import zlib
+
+import pytest
+
+from pyaltium import PcbLib
+from pyaltium._cache import ModelCache
+from pyaltium.base import OleSession
+from pyaltium.exceptions import FileError
+from pyaltium.pcb import _lib
+from pyaltium.pcb._models import iter_decompressed, parse_model_headers
+
+PCB = "tests/files/pcb/PcbLib1.PcbLib"
+MODELS = "tests/files/pcb/extracted/PcbLib1/Library/Models"
+
+
+def expected(idx):
+    with open(f"{MODELS}/{idx}", "rb") as f:
+        return zlib.decompress(f.read())
+
+
+def test_list_models_reads_headers_only(monkeypatch):
+    reads = []
+    real_read = OleSession.read
+
+    def read(self, streamname, *args, **kwargs):
+        reads.append(tuple(streamname))
+        return real_read(self, streamname, *args, **kwargs)
+
+    with PcbLib.open(PCB) as lib:
+        monkeypatch.setattr(OleSession, "read", read)
+        models = lib.models()
+
+    assert reads == [("Library", "Models", "Data")]
+    assert [m.name for m in models] == [
+        "CAPC1608X09L.step",
+        "SQFP50P800X800X300_HS-33N.step",
+    ]
+    assert models[0].id == "{0B98D05C-546A-46AB-AB45-E921BFE962DC}"
+    assert models[0].checksum == 1687024371
+    assert models[0].embedded
+    assert models[1].compressed_size == 75207
+
+
+@pytest.mark.parametrize("use_mmap", [False, True])
+def test_extract(use_mmap):
+    with PcbLib.open(PCB, use_mmap=use_mmap) as lib:
+        out = io.BytesIO()
+        written = lib.extract_model(1, out, chunk_size=4096)
+        chunks = list(lib.iter_model_chunks("CAPC1608X09L.step", 1000))
+
+    assert out.getvalue() == expected(1)
+    assert written == len(expected(1))
+    assert b"".join(chunks) == expected(0)
+    assert max(len(c) for c in chunks) <= 1000
+
+
+def test_extract_to_path(tmp_path):
+    lib = PcbLib(PCB)
+    model = lib.models()[0]
+    lib.extract_model(model, tmp_path / model.name)
+    assert (tmp_path / model.name).read_bytes() == expected(0)
+
+
+def test_extract_cached(tmp_path, monkeypatch):
+    cache = ModelCache(str(tmp_path))
+    lib = PcbLib(PCB)
+
+    first = io.BytesIO()
+    lib.extract_model(0, first, cache=cache)
+    assert cache.size() == len(expected(0))
+
+    # Now it comes from the cache, nothing gets decompressed
+    monkeypatch.setattr(_lib, "iter_decompressed", None)
+    second = io.BytesIO()
+    assert lib.extract_model(0, second, cache=cache) == len(expected(0))
+    assert first.getvalue() == second.getvalue() == expected(0)
+
+
+def test_missing_model():
+    lib = PcbLib(PCB)
+    with pytest.raises(KeyError):
+        lib.extract_model("nope.step", io.BytesIO())
+    assert PcbLib("tests/files/pcb/PcbEmpty.PcbLib").models() == []
+
+
+def test_decompress_errors():
+    data = zlib.compress(b"x" * 100_000)
+    out = list(iter_decompressed([data[:10], data[10:]], 1000))
+    assert b"".join(out) == b"x" * 100_000
+    assert max(map(len, out)) == 1000
+
+    with pytest.raises(FileError, match="truncated"):
+        list(iter_decompressed([data[:-5]]))
+    with pytest.raises(FileError, match="corrupt"):
+        list(iter_decompressed([b"not zlib"]))
+    with pytest.raises(FileError):
+        parse_model_headers(b"\xff\x00\x00\x00|NAME=x")
@@ -0,0 +1,154 @@
+import struct
+
+import pytest
+
+from pyaltium import PcbLib
+from pyaltium.exceptions import PrimitiveDecodeError
+from pyaltium.pcb._record import (
+    UNITS_PER_MM,
+    PcbComponentBody,
+    PcbLayer,
+    PcbPad,
+    PcbPadShape,
+    PcbText,
+    PcbTrack,
+    decode_primitives,
+)
+from pyaltium.pcb._tables import primitive_tables
+
+PCB = "tests/files/pcb/PcbLib1.PcbLib"
+
+
+def mm(units):
+    return round(units / UNITS_PER_MM, 3)
+
+
+@pytest.fixture(scope="module")
+def lib():
+    with PcbLib.open(PCB) as lib:
+        for item in lib.items_list:
+            item.records
+        yield lib
+
+
+def footprint(lib, name):
+    return next(item for item in lib.items_list if item.footprintref == name)
+
+
+def test_decode_counts(lib):
+    counts = {}
+    for item in lib.items_list:
+        for prim in item.records:
+            counts[type(prim).__name__] = counts.get(type(prim).__name__, 0) + 1
+
+    assert counts == {
+        "PcbPad": 58,
+        "PcbTrack": 34,
+        "PcbText": 13,
+        "PcbVia": 9,
+        "PcbComponentBody": 2,
+        "PcbArc": 2,
+    }
+
+
+def test_pads(lib):
+    pads = {
+        p.designator: p
+        for p in footprint(lib, "Pads Combined").records
+        if isinstance(p, PcbPad)
+    }
+
+    # Designators describe the pad, see pads.txt
+    pad = pads["0.5x1.0 2,-2 R0"]
+    assert (mm(pad.x), mm(pad.y), mm(pad.size_x), mm(pad.size_y)) == (2, -2, 0.5, 1)
+    assert pad.shape == PcbPadShape.RECTANGLE
+    assert pad.layer == PcbLayer.TOP
+
+    assert pads["0.5x0.5 2,0 R45"].rotation == 45
+    assert pads["0.5x0.5 3,0 R0, Round"].shape == PcbPadShape.ROUND
+    assert pads["0.5x0.5 6,0 R0, Bot"].layer == PcbLayer.BOTTOM
+
+    rrect = pads["0.5x0.5 4,0 R0, Round Rect 50%"]
+    assert rrect.shape == PcbPadShape.ROUNDED_RECTANGLE
+    assert rrect.corner_radius == 50
+    assert pads["0.5x0.5 5,0 R0, Round Rect 10%"].corner_radius == 10
+
+
+def test_other_primitives(lib):
+    tracks = [
+        p for p in footprint(lib, "Lines shifted").records if isinstance(p, PcbTrack)
+    ]
+    assert len(tracks) == 6
+    # First line in pads.txt, 5 mm long and 0.5 mm wide
+    track = tracks[0]
+    assert [mm(v) for v in (track.x1, track.y1, track.x2, track.y2)] == [0, 0, 5, 0]
+    assert mm(track.width) == 0.5
+
+    # Each string says which layer it is on
+    texts = {
+        p.text: p
+        for p in footprint(lib, "Strings on Layers").records
+        if isinstance(p, PcbText)
+    }
+    assert texts["Top"].layer == PcbLayer.TOP
+    assert texts["Bot"].layer == PcbLayer.BOTTOM
+    assert texts["Top Overlay"].layer == PcbLayer.TOP_OVERLAY
+    assert texts["M1"].layer == PcbLayer.MECHANICAL_1
+    assert mm(texts["Top"].height) == 2
+
+    bodies = [
+        p
+        for item in lib.items_list
+        for p in item.records
+        if isinstance(p, PcbComponentBody)
+    ]
+    assert all(len(b.vertices) >= 3 for b in bodies)
+    assert all("BODYPROJECTION" in b.parameters for b in bodies)
+
+
+def test_tables_match_objects(lib):
+    tables = lib.primitive_tables()
+    assert {k: len(v) for k, v in tables.items()} == {
+        "pads": 58,
+        "vias": 9,
+        "tracks": 34,
+        "arcs": 2,
+        "fills": 0,
+    }
+
+    pads = [
+        (idx, p)
+        for idx, item in enumerate(lib.items_list)
+        for p in item.records
+        if isinstance(p, PcbPad)
+    ]
+    for (idx, pad), row in zip(pads, tables["pads"]):
+        assert row["item"] == idx
+        assert row["designator"] == pad.designator
+        for col in ("layer", "x", "y", "size_x", "size_y", "shape", "hole"):
+            assert row[col] == getattr(pad, col)
+        assert row["corner_radius"] == pad.corner_radius
+
+
+def test_truncated():
+    with PcbLib.open(PCB) as lib:
+        data = bytes(footprint(lib, "Four pads")._read_data())
+
+    with pytest.raises(PrimitiveDecodeError):
+        decode_primitives(data[:-10])
+    with pytest.raises(PrimitiveDecodeError):
+        primitive_tables([data[:-10]])
+
+
+def test_unknown_type():
+    name = b"\x03abc"
+    data = struct.pack("<I", len(name)) + name + b"\x63" + struct.pack("<I", 0)
+
+    with pytest.raises(PrimitiveDecodeError, match="Unknown primitive type 99"):
+        decode_primitives(data)
+
+
+def test_empty_footprint():
+    assert decode_primitives(struct.pack("<I", 1) + b"\x00") == []
+    assert len(primitive_tables([])["pads"]) == 0
+    assert len(PcbLib().primitive_tables()["pads"]) == 0
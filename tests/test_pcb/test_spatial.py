@@ -0,0 +1,112 @@
+import numpy as np
+import pytest
+
+from pyaltium import PcbLib
+from pyaltium.pcb._record import UNITS_PER_MM
+from pyaltium.pcb._spatial import SpatialIndex, pad_boxes
+
+PCB = "tests/files/pcb/PcbLib1.PcbLib"
+
+
+@pytest.fixture(scope="module")
+def boxes():
+    rng = np.random.default_rng(0)
+    xy = rng.uniform(0, 1000, (500, 2))
+    size = rng.uniform(1, 30, (500, 2))
+    return np.hstack([xy, xy + size])
+
+
+def gaps(boxes, box):
+    dx = np.maximum(np.maximum(boxes[:, 0] - box[2], box[0] - boxes[:, 2]), 0)
+    dy = np.maximum(np.maximum(boxes[:, 1] - box[3], box[1] - boxes[:, 3]), 0)
+    return np.hypot(dx, dy)
+
+
+def test_queries_match_brute_force(boxes):
+    index = SpatialIndex(boxes)
+
+    query = (200, 300, 260, 420)
+    assert list(index.query_box(query)) == list(np.flatnonzero(gaps(boxes, query) == 0))
+
+    point = (500.0, 500.0)
+    dist = gaps(boxes, point * 2)
+    assert list(index.within(*point, 40)) == list(np.flatnonzero(dist <= 40))
+    assert list(index.nearest(*point, k=5)) == list(np.argsort(dist, kind="stable")[:5])
+
+    # Nothing near the corner, so this has to widen the search a few times
+    far = gaps(boxes, (-500, -500, -500, -500))
+    assert index.nearest(-500, -500)[0] == np.argmin(far)
+
+
+def test_near_segment(boxes):
+    index = SpatialIndex(boxes)
+    start, end = (0, 0), (1000, 1000)
+
+    found = set(index.near_segment(start, end, 15))
+    assert found
+    for idx, box in enumerate(boxes):
+        assert (idx in found) == (sampled_distance(box, start, end) <= 15)
+
+
+def sampled_distance(box, start, end):
+    """Distance from a box to a segment, sampled finely enough to be exact here."""
+    t = np.linspace(0, 1, 20001)[:, None]
+    points = np.array(start) + t * (np.array(end) - np.array(start))
+    dx = np.maximum(np.maximum(box[0] - points[:, 0], points[:, 0] - box[2]), 0)
+    dy = np.maximum(np.maximum(box[1] - points[:, 1], points[:, 1] - box[3]), 0)
+    return np.hypot(dx, dy).min()
+
+
+@pytest.mark.parametrize("clearance", [0, 5])
+def test_pairs_match_brute_force(boxes, clearance):
+    groups = np.arange(len(boxes)) % 3
+    index = SpatialIndex(boxes, groups=groups)
+
+    expected = set()
+    for i in range(len(boxes)):
+        dist = gaps(boxes[i + 1 :], boxes[i])
+        overlap = (
+            np.maximum(boxes[i + 1 :, 0], boxes[i, 0])
+            < np.minimum(boxes[i + 1 :, 2], boxes[i, 2])
+        ) & (
+            np.maximum(boxes[i + 1 :, 1], boxes[i, 1])
+            < np.minimum(boxes[i + 1 :, 3], boxes[i, 3])
+        )
+        for j in np.flatnonzero(overlap | (dist < clearance)) + i + 1:
+            if groups[i] == groups[j]:
+                expected.add((i, int(j)))
+
+    assert expected
+    assert set(map(tuple, index.pairs(clearance).tolist())) == expected
+
+
+def test_empty():
+    index = SpatialIndex(np.empty((0, 4)))
+    assert len(index.query_box((0, 0, 1, 1))) == 0
+    assert len(index.nearest(0, 0)) == 0
+    assert index.pairs(1).shape == (0, 2)
+
+
+def test_footprint_pads():
+    with PcbLib.open(PCB) as lib:
+        item = next(i for i in lib.items_list if i.footprintref == "Pads Combined")
+        index = item.spatial_index()
+        lib_index = lib.spatial_index()
+        item_idx = lib.items_list.index(item)
+
+    pads = index.data
+    mm = UNITS_PER_MM
+
+    assert pads[index.nearest(0, 0)[0]]["designator"] == "0.5x0.5 0,0 R0"
+    near = {pads[i]["designator"] for i in index.within(0, 0, 1 * mm)}
+    assert near == {"0.5x0.5 0,0 R0", "0.5x0.5 0,1 R0", "0.5x0.5 1,0 R0"}
+
+    # The 45 degree pad's box is wider than the pad
+    rotated = pads[pads["designator"] == "0.5x0.5 2,0 R45"]
+    width = np.diff(pad_boxes(rotated)[0, ::2])[0]
+    assert width == pytest.approx(0.5 * np.sqrt(2) * mm, rel=1e-3)
+
+    # Same pads from the library wide index when limited to this footprint
+    lib_near = lib_index.within(0, 0, 1 * mm, group=item_idx)
+    assert set(lib_index.data[lib_near]["designator"]) == near
+    assert len(lib_index.within(0, 0, 1 * mm)) > len(lib_near)
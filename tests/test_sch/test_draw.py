@@ -0,0 +1,78 @@
+import io
+
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.collections import LineCollection
+
+from pyaltium import SchLib
+from pyaltium.sch._record import SLIRPin, draw_records
+
+
+def connector(count):
+    pins = []
+    for idx in range(count):
+        side, row = divmod(idx, count // 4)
+        rotation = (0, 90, 180, 270)[side]
+        pins.append(
+            SLIRPin(
+                {
+                    "RECORD": "2",
+                    "Location.X": str(row * 10 if side % 2 else side * 50),
+                    "Location.Y": str(side * 50 if side % 2 else row * 10),
+                    "Rotation": str(rotation),
+                    "PinLength": 300,
+                    "Name": f"IO{idx}",
+                    "Designator": str(idx + 1),
+                }
+            )
+        )
+    return pins
+
+
+def render(draw):
+    fig, ax = plt.subplots()
+    ax.set_aspect("equal")
+    draw(ax)
+    ax.axis("off")
+    ax.autoscale(tight=True)
+    buf = io.BytesIO()
+    fig.savefig(buf, format="rgba", dpi=100)
+    plt.close(fig)
+    return np.frombuffer(buf.getvalue(), np.uint8)
+
+
+def test_pins_match_plot():
+    pins = connector(200)
+
+    def batched(ax):
+        draw_records(ax, pins)
+        # Only the lines, for comparing against the old way
+        for text in ax.texts[:]:
+            text.remove()
+
+    def one_line_each(ax):
+        for pin in pins:
+            x1, y1 = pin.end()
+            ax.plot((pin.loc_x, x1), (pin.loc_y, y1), "k", linewidth=10)
+
+    assert np.array_equal(render(batched), render(one_line_each))
+
+
+def test_one_artist_for_pins(capsys):
+    item = next(
+        i
+        for i in SchLib("tests/files/sch/SchLib1.SchLib").items_list
+        if i.name == "CombinedPins"
+    )
+    pins = [r for r in item.records if isinstance(r, SLIRPin) and r.display_mode == 1]
+
+    fig, ax = plt.subplots()
+    item.draw(ax)
+    plt.close(fig)
+
+    (lines,) = ax.collections
+    assert isinstance(lines, LineCollection)
+    assert len(lines.get_segments()) == len(pins)
+    assert len(ax.texts) == 2 * len(pins)
+    assert len(ax.lines) == 0
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,64 @@
+import glob
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from pyaltium import SchLib
+from pyaltium.sch._record import SLIRPin
+
+FIELDS = ("loc_x", "loc_y", "rotation", "color", "display_mode", "part_id")
+
+
+@pytest.mark.parametrize("file_name", glob.glob("tests/files/sch/*.SchLib"))
+def test_lazy_matches_eager(file_name):
+    eager = SchLib(file_name)
+    lazy = SchLib(file_name, lazy_records=True)
+
+    for e_item, l_item in zip(eager.items_list, lazy.items_list):
+        assert len(e_item.records) == len(l_item.records)
+
+        for e_rec, l_rec in zip(e_item.records, l_item.records):
+            assert type(e_rec) is type(l_rec)
+            assert l_rec._source is not None
+            assert [getattr(l_rec, f) for f in FIELDS] == [
+                getattr(e_rec, f) for f in FIELDS
+            ]
+            assert l_rec._source is None
+            assert l_rec.param_dict == e_rec.param_dict
+
+
+def test_lazy_pin_fields():
+    sl = SchLib("tests/files/sch/SchLib1.SchLib", lazy_records=True, use_mmap=True)
+    pins = [r for item in sl.items_list for r in item.records if type(r) is SLIRPin]
+    assert pins
+
+    pin = pins[0]
+    assert pin.name and pin.designator
+    with pytest.raises(AttributeError):
+        pin.not_a_field
+
+    # Unparsed records pickle as just their own bytes, and stay unparsed
+    last = pins[-1]
+    data, _, start, stop = last._source
+    assert isinstance(data, memoryview)
+    copy = pickle.loads(pickle.dumps(last))
+    assert last._source is not None
+    assert copy._source[0] == data[start:stop]
+    assert copy.name == last.name
+    assert copy._source is None
+    assert copy.param_dict == last.param_dict
+
+
+def test_lazy_records_from_process_pool():
+    file_name = "tests/files/sch/SchLib1.SchLib"
+    with ProcessPoolExecutor(2) as executor:
+        lazy = SchLib(file_name, lazy_records=True, lazyload=True)
+        lazy.load_all(executor)
+
+    records = [r for item in lazy.items_list for r in item.records]
+    assert all(r._source is not None for r in records)
+    expected = [
+        r.param_dict for item in SchLib(file_name).items_list for r in item.records
+    ]
+    assert [r.param_dict for r in records] == expected
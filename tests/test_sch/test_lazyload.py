@@ -0,0 +1,57 @@
+from collections import Counter
+
+import pytest
+
+from pyaltium import SchLib
+from pyaltium.base import OleSession
+
+SCHLIB_PATH = "tests/files/sch/SchLib1.SchLib"
+
+
+@pytest.fixture
+def stream_reads(monkeypatch):
+    """Count reads of each stream, keyed by the stream's last path component."""
+    counter = Counter()
+    original = OleSession.read
+
+    def counting_read(self, streamname, *args, **kwargs):
+        name = streamname if isinstance(streamname, str) else streamname[-1]
+        counter[name] += 1
+        return original(self, streamname, *args, **kwargs)
+
+    monkeypatch.setattr(OleSession, "read", counting_read)
+    return counter
+
+
+def test_listing_reads_headers_only(stream_reads):
+    sl = SchLib(SCHLIB_PATH, lazyload=True)
+
+    assert len(sl.list_items()) == 9
+    assert set(stream_reads) <= {"FileHeader", "SectionKeys"}
+    assert all(item._records is None for item in sl.items_list)
+
+
+def test_records_load_on_access(stream_reads):
+    with SchLib.open(SCHLIB_PATH, lazyload=True) as sl:
+        item = sl.items_list[0]
+        stream_reads.clear()
+
+        records = item.records
+        assert len(records) > 0
+        assert stream_reads == {"Data": 1}
+
+        # Second access is cached, and nothing else got loaded
+        assert item.records is records
+        assert stream_reads == {"Data": 1}
+        assert all(i._records is None for i in sl.items_list[1:])
+
+
+def test_lazy_matches_eager():
+    eager = SchLib(SCHLIB_PATH)
+    lazy = SchLib(SCHLIB_PATH, lazyload=True)
+
+    for e_item, l_item in zip(eager.items_list, lazy.items_list):
+        assert e_item._records is not None
+        assert [r.param_dict for r in e_item.records] == [
+            r.param_dict for r in l_item.records
+        ]
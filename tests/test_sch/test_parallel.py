@@ -0,0 +1,39 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from pyaltium import SchLib
+
+SCHLIB_PATH = "tests/files/sch/SchLib1.SchLib"
+
+
+def summarize(lib: SchLib) -> list:
+    return [
+        (item.libref, [(type(r), r.param_dict) for r in item.records])
+        for item in lib.items_list
+    ]
+
+
+@pytest.fixture(scope="module")
+def expected():
+    return summarize(SchLib(SCHLIB_PATH))
+
+
+def test_workers(expected):
+    sl = SchLib(SCHLIB_PATH, workers=4)
+
+    assert all(item._records is not None for item in sl.items_list)
+    assert summarize(sl) == expected
+
+
+def test_load_all_process_pool(expected):
+    with SchLib.open(SCHLIB_PATH, lazyload=True, use_mmap=True) as sl:
+        # Already loaded items are left alone
+        first = sl.items_list[0].records
+
+        with ProcessPoolExecutor(2) as executor:
+            items = sl.load_all(executor)
+
+        assert items is sl.items_list
+        assert sl.items_list[0].records is first
+        assert summarize(sl) == expected
@@ -0,0 +1,117 @@
+"""Throw arbitrary bytes at the pin decoder and make sure it always finishes."""
+import random
+import struct
+import zlib
+
+import pytest
+
+from pyaltium.exceptions import PinDecodeError
+from pyaltium.sch import _helpers
+from pyaltium.sch._helpers import MIN_PIN_LEN, decode_pin, pinstr_to_records
+from pyaltium.sch._pintext import decode_pin_text_data
+
+# A pin the way it shows up cut out of a text record (see test_sch_unit)
+VALID_PIN = bytes.fromhex(
+    "0027000001020000000001000000000000"
+    "00"
+    "01073a0a000a00000000000000"
+    "0450696e31"
+    "0131"
+    "00037c267c"
+)
+
+
+@pytest.fixture
+def decode_calls(monkeypatch):
+    """Count calls to decode_pin made by pinstr_to_records."""
+    calls = {"n": 0}
+
+    def counting_decode(buf, offset):
+        calls["n"] += 1
+        return decode_pin(buf, offset)
+
+    monkeypatch.setattr(_helpers, "decode_pin", counting_decode)
+    return calls
+
+
+def check_terminates(data: bytes, decode_calls) -> None:
+    """Either decode or raise our error, with a bounded number of steps."""
+    decode_calls["n"] = 0
+    try:
+        records = pinstr_to_records(data)
+    except PinDecodeError:
+        records = None
+
+    assert decode_calls["n"] <= len(data) // MIN_PIN_LEN + 1
+    if records is not None:
+        assert len(records) == decode_calls["n"]
+
+
+def test_valid_pins(decode_calls):
+    records = pinstr_to_records(VALID_PIN * 50)
+    assert len(records) == 50
+    assert decode_calls["n"] == 50
+    assert all(r["Name"] == "Pin1" for r in records)
+
+
+@pytest.mark.parametrize("cut", range(len(VALID_PIN)))
+def test_truncated(cut, decode_calls):
+    """Cutting a pin short anywhere never hangs."""
+    check_terminates(VALID_PIN * 3 + VALID_PIN[:cut], decode_calls)
+
+
+def test_random_bytes(decode_calls):
+    rng = random.Random(1234)
+    for _ in range(2000):
+        data = rng.randbytes(rng.randrange(0, 400))
+        check_terminates(data, decode_calls)
+
+
+def test_mutated_pins(decode_calls):
+    """Valid pins with random bytes flipped."""
+    rng = random.Random(5678)
+    for _ in range(2000):
+        data = bytearray(VALID_PIN * 4)
+        for _ in range(rng.randrange(1, 8)):
+            data[rng.randrange(len(data))] = rng.randrange(256)
+        check_terminates(bytes(data), decode_calls)
+
+
+def test_decode_pin_errors():
+    """Anything that doesn't fit raises our error rather than IndexError."""
+    for offset in (len(VALID_PIN), len(VALID_PIN) + 10):
+        with pytest.raises(PinDecodeError):
+            decode_pin(VALID_PIN, offset)
+
+    bad_type = bytearray(VALID_PIN)
+    bad_type[19] = 0xFF
+    with pytest.raises(PinDecodeError):
+        decode_pin(bytes(bad_type), 17)
+
+
+def test_large_input_is_linear(decode_calls):
+    """A long run of junk still only takes a bounded number of steps."""
+    data = random.Random(42).randbytes(200_000)
+    check_terminates(data, decode_calls)
+    check_terminates(VALID_PIN * 5000, decode_calls)
+
+
+def pin_text_frame(payload: bytes) -> bytes:
+    return struct.pack("<I", 1 << 24 | len(payload)) + payload
+
+
+# Pin 12, with its name moved and turned
+_BLOB = zlib.compress(b"\x05" + struct.pack("<I", 30000) + b"\x00")
+PIN_TEXT = b"\x00\x0212" + struct.pack("<I", len(_BLOB)) + _BLOB
+
+
+@pytest.mark.parametrize("cut", range(len(PIN_TEXT) + 1))
+def test_pin_text_data_truncated(cut):
+    """PinTextData cut short anywhere, even down to a frame of 0 or 1 bytes, only
+    ever raises our error."""
+    data = pin_text_frame(PIN_TEXT) + pin_text_frame(PIN_TEXT[:cut])
+    try:
+        pins = decode_pin_text_data(data)
+    except PinDecodeError:
+        return
+    assert 12 in pins
@@ -0,0 +1,52 @@
+import glob
+
+import numpy as np
+import pytest
+
+from pyaltium import SchLib
+from pyaltium.sch._record import SLIRPin
+
+
+@pytest.mark.parametrize("file_name", glob.glob("tests/files/sch/*.SchLib"))
+def test_pin_table_matches_records(file_name):
+    sl = SchLib(file_name)
+    table = sl.pin_table()
+
+    expected = [
+        (idx, pin.param_dict)
+        for idx, item in enumerate(sl.items_list)
+        for pin in item.records
+        if isinstance(pin, SLIRPin)
+    ]
+    assert len(table) == len(expected)
+
+    for row, (idx, params) in zip(table, expected):
+        assert row["item"] == idx
+        assert row["x"] == params["Location.X"]
+        assert row["y"] == params["Location.Y"]
+        assert row["length"] == params["PinLength"]
+        assert row["rotation"] == params["Rotation"]
+        assert row["pin_type"] == params["PinType"]
+        assert row["hide_name"] == params["Hide_Name"]
+        assert row["hide_designator"] == params["Hide_Designator"]
+        assert row["name"] == str(params["Name"])
+        assert row["designator"] == str(params["Designator"])
+
+
+def test_pin_table_vectorized():
+    sl = SchLib("tests/files/sch/SchLib1.SchLib", lazyload=True)
+    pins = sl.pin_table()
+
+    assert all(item._records is None for item in sl.items_list)
+    assert pins.dtype["name"] == np.dtype(object)
+    # Interned, so equal names are the same object
+    names = {}
+    for name in pins["name"]:
+        assert names.setdefault(name, name) is name
+
+    counts = np.bincount(pins["item"], minlength=len(sl.items_list))
+    assert counts.sum() == len(pins)
+
+
+def test_pin_table_no_file():
+    assert SchLib().pin_table().shape == (0,)
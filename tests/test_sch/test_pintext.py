@@ -0,0 +1,91 @@
+import pickle
+import struct
+from collections import Counter
+
+import pytest
+
+from pyaltium import SchLib
+from pyaltium._cache import SnapshotCache
+from pyaltium.base import OleSession
+from pyaltium.exceptions import FileError
+from pyaltium.sch._pintext import PinText, decode_pin_text_data
+from pyaltium.sch._record import SLIRPin
+
+SCHLIB_PATH = "tests/files/sch/SchLib1.SchLib"
+
+
+@pytest.fixture
+def stream_reads(monkeypatch):
+    counter = Counter()
+    original = OleSession.read
+
+    def counting_read(self, streamname, *args, **kwargs):
+        counter[streamname[-1]] += 1
+        return original(self, streamname, *args, **kwargs)
+
+    monkeypatch.setattr(OleSession, "read", counting_read)
+    return counter
+
+
+def overrides_pins(sl):
+    item = next(i for i in sl.items_list if i.libref == "Pin_overrides")
+    return [r for r in item.records if isinstance(r, SLIRPin)]
+
+
+def test_read_on_demand(stream_reads):
+    with SchLib.open(SCHLIB_PATH) as sl:
+        pins = overrides_pins(sl)
+        assert stream_reads["PinTextData"] == 0
+
+        assert pins[0].name_text == PinText(font_id=3, color=0)
+        assert pins[0].designator_text is None
+        # Once per item, not per pin
+        for pin in pins:
+            pin.name_text
+        assert stream_reads["PinTextData"] == 1
+        assert stream_reads["Data"] == len(sl.items_list)
+
+
+@pytest.mark.parametrize("lazy_records", [False, True])
+def test_overrides(lazy_records):
+    # Pins are labelled with whichever of their texts was overridden
+    pins = overrides_pins(SchLib(SCHLIB_PATH, lazy_records=lazy_records))
+    assert [p.name for p in pins[:3]] == ["Calibri", "Arial", "500 gap"]
+    assert [p.designator for p in pins[3:5]] == ["Calibri", "Arial"]
+
+    assert pins[1].name_text.font_id == 4
+    assert pins[2].name_text.margin == 5_000_000
+    assert pins[2].name_text.font_id is None
+    assert pins[3].name_text is None
+    assert pins[3].designator_text.font_id == 3
+    assert pins[6].designator_text.rotation == 90
+    assert not pins[6].designator_text.relative_to_part
+
+    name90 = pins[9].name_text
+    assert (name90.rotation, name90.relative_to_part) == (90, True)
+
+
+def test_pickle_keeps_overrides(stream_reads):
+    pin = overrides_pins(SchLib(SCHLIB_PATH))[1]
+    copy = pickle.loads(pickle.dumps(pin))
+    # Pickling doesn't read anything, the copy reads it when asked
+    assert stream_reads["PinTextData"] == 0
+    assert copy.name_text == pin.name_text
+
+
+def test_snapshot_stays_lazy(stream_reads, tmp_path):
+    cache = SnapshotCache(str(tmp_path))
+    cold = SchLib(SCHLIB_PATH, cache=cache)
+    assert stream_reads["PinTextData"] == 0
+
+    warm = SchLib(SCHLIB_PATH, cache=cache)
+    assert overrides_pins(warm)[1].name_text == overrides_pins(cold)[1].name_text
+
+
+def test_bad_pin_index():
+    # A binary frame whose pin index isn't a number
+    payload = b"\x00\x01x" + struct.pack("<I", 0)
+    data = struct.pack("<I", 1 << 24 | len(payload)) + payload
+
+    with pytest.raises(FileError):
+        decode_pin_text_data(data)
@@ -0,0 +1,53 @@
+import gc
+import pickle
+
+from pyaltium._helpers import normalize_dict
+from pyaltium.sch._record import SLIRRectange, _layouts, get_sch_lib_item_record
+
+RECT = {
+    "RECORD": b"14",
+    "Location.X": b"-10",
+    "Location.Y": b"20",
+    "Corner.X": b"50",
+    "Corner.Y": b"60",
+    "AreaColor": b"11599871",
+    "IsSolid": b"T",
+    "UniqueID": b"ABCDEFGH",
+}
+
+
+def test_slotted_record():
+    rec = get_sch_lib_item_record(dict(RECT))
+    other = get_sch_lib_item_record(dict(RECT, UniqueID=b"IJKLMNOP"))
+
+    assert isinstance(rec, SLIRRectange)
+    assert not hasattr(rec, "__dict__")
+    assert (rec.loc_x, rec.loc_y, rec.tr_x, rec.tr_y) == (-100, 200, 50, 60)
+    # Same keys, same layout
+    assert rec._layout is other._layout
+
+    # Only built when asked for
+    assert rec._params is None
+    assert rec.param_dict == normalize_dict(RECT)
+    assert rec._get("UniqueID") == "ABCDEFGH"
+    assert rec._get("Missing", 5) == 5
+
+
+def test_pickle_shares_layout():
+    rec = get_sch_lib_item_record(dict(RECT))
+    copy = pickle.loads(pickle.dumps(rec))
+
+    assert copy._layout is rec._layout
+    assert (copy.loc_x, copy.fill_color) == (rec.loc_x, rec.fill_color)
+    assert copy.param_dict == rec.param_dict
+
+
+def test_layouts_are_released():
+    rec = get_sch_lib_item_record(dict(RECT, OnlyInThisTest=b"1"))
+    keys = (*RECT, "OnlyInThisTest")
+    assert keys in _layouts
+
+    # Nothing uses it anymore, so it doesn't stay around
+    del rec
+    gc.collect()
+    assert keys not in _layouts
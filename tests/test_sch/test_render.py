@@ -0,0 +1,63 @@
+import os
+
+import pytest
+
+from pyaltium import SchLib
+from pyaltium.sch import _render
+
+SCH = "tests/files/sch/SchLib1.SchLib"
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_render_all(tmp_path, jobs):
+    lib = SchLib(SCH)
+    results = lib.render_all(str(tmp_path), jobs=jobs)
+
+    assert [r.name for r in results] == [item.libref for item in lib.items_list]
+    for r in results:
+        assert r.ok and not r.skipped and r.seconds > 0
+        with open(r.path, "rb") as f:
+            assert f.read(8) == b"\x89PNG\r\n\x1a\n"
+    assert len(os.listdir(tmp_path)) == len(results)
+
+    # Nothing changed, so nothing gets rendered again
+    again = lib.render_all(str(tmp_path), jobs=jobs)
+    assert all(r.skipped and r.seconds == 0 for r in again)
+    assert [r.path for r in again] == [r.path for r in results]
+
+    # Different settings are different files
+    svgs = lib.render_all(str(tmp_path), fmt="svg", jobs=jobs)
+    assert not any(r.skipped for r in svgs)
+    assert all(r.path.endswith(".svg") for r in svgs)
+
+
+def test_render_all_no_file(tmp_path):
+    assert SchLib().render_all(str(tmp_path)) == []
+
+
+def test_reused_figure_matches_fresh(tmp_path, monkeypatch):
+    items = [(i.libref, bytes(i._read_data())) for i in SchLib(SCH).items_list]
+    reused = _render.render_all(items, str(tmp_path / "reused"), jobs=1)
+
+    for idx, item in enumerate(items):
+        monkeypatch.setattr(_render, "_figure", None)
+        (fresh,) = _render.render_all([item], str(tmp_path / str(idx)), jobs=1)
+
+        with open(reused[idx].path, "rb") as a, open(fresh.path, "rb") as b:
+            assert a.read() == b.read(), item[0]
+
+
+def test_copies_and_errors(tmp_path, monkeypatch):
+    data = bytes(SchLib(SCH).items_list[0]._read_data())
+
+    def broken(ax, records):
+        raise ValueError("no drawing today")
+
+    monkeypatch.setattr(_render, "draw_records", broken)
+    results = _render.render_all([("a", data), ("b", data)], str(tmp_path), jobs=1)
+
+    assert results[0].error == "ValueError: no drawing today"
+    # The copy only got tried once
+    assert results[1].skipped
+    assert results[1].error == results[0].error
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,127 @@
+import io
+import xml.etree.ElementTree as ET
+
+import matplotlib.pyplot as plt
+import pytest
+
+from pyaltium import SchLib
+from pyaltium.base import AltiumLibItemMixin
+from pyaltium.sch._record import PIN_TEXT_ALIGN, SLIRLabel, SLIRPin, SLIRRectange
+from pyaltium.sch._svg import render_svg
+
+SCH = "tests/files/sch/SchLib1.SchLib"
+NS = "{http://www.w3.org/2000/svg}"
+
+
+@pytest.fixture(scope="module")
+def items():
+    return {item.name: item for item in SchLib(SCH).items_list}
+
+
+def drawn(item, cls):
+    return [r for r in item.records if isinstance(r, cls) and r.display_mode == 1]
+
+
+@pytest.mark.parametrize(
+    "name", ["CombinedPinsRectGraphic", "Mixed with shape and text"]
+)
+def test_elements_match_records(items, name):
+    item = items[name]
+    root = ET.fromstring(item.get_svg())
+
+    assert root.tag == f"{NS}svg"
+    assert len(root.findall(f".//{NS}rect")) == len(drawn(item, SLIRRectange))
+    assert len(root.findall(f".//{NS}line")) == len(drawn(item, SLIRPin))
+    texts = [t.text for t in root.iter(f"{NS}text")]
+    assert len(texts) == 2 * len(drawn(item, SLIRPin)) + len(drawn(item, SLIRLabel))
+
+
+def test_geometry(items):
+    root = ET.fromstring(items["Graphic 1"].get_svg())
+    rect = root.find(f".//{NS}rect")
+
+    # Corners are scaled like locations, and y is flipped
+    assert {k: rect.get(k) for k in ("x", "y", "width", "height")} == {
+        "x": "0",
+        "y": "0",
+        "width": "600",
+        "height": "500",
+    }
+    assert rect.get("fill") == "#ffffb0"
+    assert root.get("viewBox") == "-20 -20 640 540"
+
+
+# Where SVG puts the middle of text from its anchor, in its own frame, as a
+# fraction of the text's length and height
+_ALONG = {"start": 0.5, "middle": 0, "end": -0.5}
+_ACROSS = {"hanging": 0.5, "central": 0, "text-after-edge": -0.5}
+
+
+def svg_offset(elem):
+    """Screen direction (y up) from the anchor to the middle of the text."""
+    along = _ALONG[elem.get("text-anchor")]
+    across = _ACROSS[elem.get("dominant-baseline")]
+    if "rotate(-90" in (elem.get("transform") or ""):
+        # Turned to read upwards, the text's start faces down and its top left
+        return across, along
+    return along, -across
+
+
+def mpl_offset(ax, props, rotation):
+    text = ax.text(0, 0, "ABCDEFGH", props, rotation=rotation, fontsize=24)
+    ax.figure.canvas.draw()
+    box = text.get_window_extent().transformed(ax.transData.inverted())
+    text.remove()
+    return (box.x0 + box.x1) / 2 / box.width, (box.y0 + box.y1) / 2 / box.height
+
+
+def sign(value):
+    return 0 if abs(value) < 0.1 else (1 if value > 0 else -1)
+
+
+@pytest.mark.parametrize("rotation", [0, 90, 180, 270])
+def test_pin_text_matches_matplotlib(rotation):
+    pin = SLIRPin(
+        {"RECORD": "2", "Rotation": str(rotation), "PinLength": 300, "Name": "ABCDEFGH"}
+    )
+    texts = ET.fromstring(render_svg([pin])).findall(f".//{NS}text")
+
+    for elem, (x, y) in zip(texts, pin.text_anchors()):
+        assert (elem.get("x"), elem.get("y")) == (str(x), str(-y))
+    assert [t.text for t in texts] == ["ABCDEFGH", "0"]
+
+    fig, ax = plt.subplots()
+    ax.set_xlim(-1000, 1000)
+    ax.set_ylim(-1000, 1000)
+    try:
+        for elem, props in zip(texts, PIN_TEXT_ALIGN[rotation]):
+            expected = tuple(map(sign, mpl_offset(ax, props, rotation % 180)))
+            assert tuple(map(sign, svg_offset(elem))) == expected, props
+    finally:
+        plt.close(fig)
+
+
+def test_escaping_and_display_mode():
+    label = SLIRLabel({"RECORD": "4", "Text": "<A & B>", "OwnerPartDisplayMode": "1"})
+    hidden = SLIRLabel({"RECORD": "4", "Text": "other mode"})
+    hidden.display_mode = 2
+
+    root = ET.fromstring(render_svg([label, hidden]))
+    assert [t.text for t in root.iter(f"{NS}text")] == ["<A & B>"]
+    assert ET.fromstring(render_svg([])).get("viewBox") == "0 0 0 0"
+
+
+def test_streams(items):
+    item = items["Pin_Properties"]
+    binary, text = io.BytesIO(), io.StringIO()
+
+    assert item.get_svg(binary) is None
+    render_svg(item.records, text)
+    assert binary.getvalue() == text.getvalue().encode() == item.get_svg()
+
+
+def test_matplotlib_svg(items):
+    svg = AltiumLibItemMixin.get_svg(items["Graphic 1"])
+    assert ET.fromstring(svg).tag == f"{NS}svg"
+    # The figure doesn't stay open
+    assert plt.get_fignums() == []
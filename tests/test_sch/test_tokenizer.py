@@ -0,0 +1,60 @@
+import glob
+
+import olefile
+import pytest
+
+from pyaltium.sch._tokenizer import BINARY_KEY, iter_tokens, split_records
+
+
+def frame(payload: bytes, rtype: int = 0) -> bytes:
+    return len(payload).to_bytes(3, "little") + bytes([rtype]) + payload
+
+
+def test_framed_tokens():
+    data = (
+        frame(b"|RECORD=1|LibReference=Part|Text=a|&|b\x00")
+        + frame(b"\x01\x02\x03", rtype=1)
+        + frame(b"|RECORD=41|NoValue|Name=x\x00")
+    )
+
+    tokens = [(idx, key, bytes(val)) for idx, key, val in iter_tokens(data)]
+
+    assert tokens == [
+        (0, b"RECORD", b"1"),
+        (0, b"LibReference", b"Part"),
+        (0, b"Text", b"a|&|b"),
+        (1, BINARY_KEY, b"\x01\x02\x03"),
+        (2, b"RECORD", b"41"),
+        (2, b"Name", b"x"),
+    ]
+
+
+def test_values_are_views():
+    data = frame(b"|RECORD=1|Name=x\x00")
+    for _, _, val in iter_tokens(data):
+        assert isinstance(val, memoryview)
+        assert val.obj is data
+
+
+def test_unframed_fallback():
+    """Without frames, we split on |RECORD and ignore anything before it."""
+    data = b"junk|RECORD=1|A=1|RECORD=2|B=2\x00pin|&|"
+
+    records = [{k: bytes(v) for k, v in rec.items()} for rec in split_records(data)]
+
+    assert records == [
+        {b"RECORD": b"1", b"A": b"1"},
+        {b"RECORD": b"2", b"B": b"2\x00pin|&|"},
+    ]
+
+
+@pytest.mark.parametrize("file_name", glob.glob("tests/files/sch/*.SchLib"))
+def test_fixture_frames(file_name):
+    """Every record in our fixtures is either a text record or a binary one."""
+    with olefile.OleFileIO(file_name) as ole:
+        for stream in ole.listdir():
+            if stream[-1] != "Data":
+                continue
+
+            for rec in split_records(ole.openstream(stream).read()):
+                assert (BINARY_KEY in rec) != (b"RECORD" in rec)